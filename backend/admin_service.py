@@ -5,6 +5,11 @@ from datetime import datetime, timezone, timedelta
 from models import *
 from database import db
 from audit_service import AuditService, log_league_settings_update, log_member_action, log_auction_action
+from budget_ledger import get_budget_ledger
+from snapshot_service import get_snapshot_cache
+from membership_cache import get_membership_cache
+from cache_generations import get_cache_generations, FIXTURES, STANDINGS
+from rescoring_service import RescoringService
 
 logger = logging.getLogger(__name__)
 
@@ -31,12 +36,7 @@ class AdminService:
             True if user is commissioner, False otherwise
         """
         try:
-            membership = await db.memberships.find_one({
-                "user_id": user_id,
-                "league_id": league_id,
-                "role": "commissioner"
-            })
-            return membership is not None
+            return await get_membership_cache().is_commissioner(league_id, user_id)
         except Exception as e:
             logger.error(f"Failed to validate commissioner access: {e}")
             return False
@@ -79,20 +79,56 @@ class AdminService:
             Tuple of (is_valid, error_message)
         """
         try:
-            # Get user's roster
-            roster = await db.rosters.find_one({"user_id": user_id, "league_id": league_id})
-            if not roster:
+            # Get user's ledger entry (in memory after first load)
+            ledger = await get_budget_ledger().get(league_id, user_id)
+            if not ledger:
                 return False, "User roster not found"
             
             # Check if user has sufficient budget
-            if roster["budget_remaining"] < bid_amount:
-                return False, f"Insufficient budget: {roster['budget_remaining']} < {bid_amount}"
+            if ledger.budget_remaining < bid_amount:
+                return False, f"Insufficient budget: {ledger.budget_remaining} < {bid_amount}"
             
             return True, ""
         except Exception as e:
             logger.error(f"Failed to validate budget constraint: {e}")
             return False, "Budget validation failed"
 
+    @staticmethod
+    async def validate_max_bid(user_id: str, league_id: str, bid_amount: int, min_increment: int) -> Tuple[bool, str]:
+        """
+        GUARDRAIL: Validate a bid against the manager's reserve-aware maximum
+        
+        Args:
+            user_id: User placing bid
+            league_id: League context
+            bid_amount: Amount being bid
+            min_increment: League minimum increment reserved per other empty slot
+            
+        Returns:
+            Tuple of (is_valid, error_message)
+        """
+        try:
+            ledger = await get_budget_ledger().get(league_id, user_id)
+            if not ledger:
+                return False, "User roster not found"
+            
+            if ledger.slots_remaining == 0:
+                return False, f"You already own {ledger.clubs_owned}/{ledger.max_slots} clubs"
+            
+            max_bid = ledger.max_bid(min_increment)
+            if bid_amount > max_bid:
+                if max_bid < ledger.budget_remaining:
+                    return False, (
+                        f"Maximum bid is {max_bid}: {ledger.slots_remaining - 1} empty slot(s) "
+                        f"need at least {min_increment} each"
+                    )
+                return False, f"Insufficient budget: {ledger.budget_remaining} < {bid_amount}"
+            
+            return True, ""
+        except Exception as e:
+            logger.error(f"Failed to validate max bid: {e}")
+            return False, "Budget validation failed"
+
     @staticmethod
     async def validate_roster_capacity(user_id: str, league_id: str) -> Tuple[bool, str]:
         """
@@ -106,18 +142,13 @@ class AdminService:
             Tuple of (is_valid, user_friendly_error_message)
         """
         try:
-            # Get league settings for club slots
-            league = await db.leagues.find_one({"_id": league_id})
-            if not league:
+            # Club slots and clubs owned come from the ledger
+            ledger = await get_budget_ledger().get(league_id, user_id)
+            if not ledger:
                 return False, "League not found"
             
-            max_slots = league["settings"]["club_slots_per_manager"]
-            
-            # Count current clubs owned by user
-            current_clubs_count = await db.roster_clubs.count_documents({
-                "user_id": user_id,
-                "league_id": league_id
-            })
+            max_slots = ledger.max_slots
+            current_clubs_count = ledger.clubs_owned
             
             # Check if user has available club slots
             if current_clubs_count >= max_slots:
@@ -128,6 +159,55 @@ class AdminService:
             logger.error(f"Failed to validate roster capacity: {e}")
             return False, "Roster capacity validation failed"
 
+    @staticmethod
+    async def validate_sale(
+        league_id: str,
+        club_id: str,
+        user_id: str,
+        price: int,
+        session
+    ) -> Tuple[bool, str]:
+        """
+        GUARDRAIL: Validate a sale against the database inside the lot close transaction
+
+        The budget ledger only pre-checks bids in this process; the sale is checked
+        against the rosters and roster_clubs the transaction commits against.
+        Database errors are raised so the close transaction can retry.
+
+        Args:
+            league_id: League context
+            club_id: Club being sold
+            user_id: Winning bidder
+            price: Final price
+            session: Close transaction session
+
+        Returns:
+            Tuple of (is_valid, error_message)
+        """
+        existing_ownership = await db.roster_clubs.find_one(
+            {"league_id": league_id, "club_id": club_id}, session=session
+        )
+        if existing_ownership:
+            return False, "duplicate ownership prevented"
+
+        roster = await db.rosters.find_one({"user_id": user_id, "league_id": league_id}, session=session)
+        if not roster:
+            return False, "budget check failed: User roster not found"
+        if roster["budget_remaining"] < price:
+            return False, f"budget check failed: Insufficient budget: {roster['budget_remaining']} < {price}"
+
+        league = await db.leagues.find_one({"_id": league_id}, session=session)
+        if not league:
+            return False, "roster capacity check failed: League not found"
+        max_slots = league["settings"]["club_slots_per_manager"]
+        current_clubs_count = await db.roster_clubs.count_documents(
+            {"user_id": user_id, "league_id": league_id}, session=session
+        )
+        if current_clubs_count >= max_slots:
+            return False, f"roster capacity check failed: You already own {current_clubs_count}/{max_slots} clubs"
+
+        return True, ""
+
     @staticmethod
     async def validate_timer_monotonicity(auction_id: str, new_end_time: datetime) -> Tuple[bool, str]:
         """
@@ -340,8 +420,12 @@ class AdminService:
                 # Update all rosters with new club slots
                 await db.rosters.update_many(
                     {"league_id": league_id},
-                    {"$set": {"club_slots": updates.club_slots_per_manager}}
+                    {
+                        "$set": {"club_slots": updates.club_slots_per_manager},
+                        "$inc": {"ledger_version": 1}
+                    }
                 )
+                get_budget_ledger().apply_settings(league_id, club_slots=updates.club_slots_per_manager)
             
             if updates.league_size is not None:
                 if updates.league_size.min is not None:
@@ -349,6 +433,17 @@ class AdminService:
                 if updates.league_size.max is not None:
                     update_dict["settings.league_size.max"] = updates.league_size.max
             
+            if updates.scoring_rules is not None:
+                update_dict["settings.scoring_rules"] = updates.scoring_rules.dict()
+                await db.scoring_rules.update_one(
+                    {"league_id": league_id},
+                    {
+                        "$set": {"rules": updates.scoring_rules.dict()},
+                        "$setOnInsert": {"_id": generate_uuid()}
+                    },
+                    upsert=True
+                )
+            
             # Update league settings
             if update_dict:
                 await db.leagues.update_one(
@@ -360,11 +455,17 @@ class AdminService:
                 if updates.budget_per_manager is not None:
                     await db.rosters.update_many(
                         {"league_id": league_id},
-                        {"$set": {
-                            "budget_start": updates.budget_per_manager,
-                            "budget_remaining": updates.budget_per_manager
-                        }}
+                        {
+                            "$set": {
+                                "budget_start": updates.budget_per_manager,
+                                "budget_remaining": updates.budget_per_manager
+                            },
+                            "$inc": {"ledger_version": 1}
+                        }
                     )
+                    get_budget_ledger().apply_settings(league_id, budget=updates.budget_per_manager)
+                get_snapshot_cache().invalidate_league(league_id)
+                await get_cache_generations().bump([league_id], STANDINGS)
                 
                 # Log the settings update
                 await log_league_settings_update(
@@ -374,6 +475,12 @@ class AdminService:
                     after=update_dict
                 )
             
+            # SCORING CHANGE: Re-score settled results under the new rules, off the request path
+            if updates.scoring_rules is not None:
+                RescoringService.start_rescore_job(league_id)
+                logger.info(f"Updated league {league_id} settings by user {user_id}, re-scoring started")
+                return True, "League settings updated successfully; re-scoring settled results in the background"
+            
             logger.info(f"Updated league {league_id} settings by user {user_id}")
             return True, "League settings updated successfully"
             
@@ -445,6 +552,10 @@ class AdminService:
                 "league_id": league_id,
                 "user_id": target_user_id
             })
+            get_budget_ledger().remove_manager(league_id, target_user_id)
+            get_snapshot_cache().invalidate_league(league_id)
+            await get_membership_cache().invalidate_league(league_id)
+            await get_cache_generations().bump([league_id], FIXTURES, STANDINGS)
             
             # Update league member count
             await db.leagues.update_one(
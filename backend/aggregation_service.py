@@ -1,12 +1,91 @@
+import asyncio
 import logging
-from typing import List, Dict, Optional
+import os
+from collections import OrderedDict
+from typing import Awaitable, Callable, List, Dict, Optional, Tuple
 from datetime import datetime, timezone, timedelta
 
+import numpy as np
+
 from models import *
 from database import db
+from scoring_service import ScoringService
+from matchday_calendar import MatchdayCalendar, get_matchday_calendars
+from cache_generations import get_cache_generations, FIXTURES, STANDINGS
+from utils.single_flight import single_flight
 
 logger = logging.getLogger(__name__)
 
+# Leagues whose leaderboard is kept in memory, least recently used evicted first
+LEADERBOARD_CACHE_SIZE = int(os.getenv("LEADERBOARD_CACHE_SIZE", "1000"))
+
+# Matchdays embedded in the leaderboard; older ones are paged through the history endpoint
+LEADERBOARD_MATCHDAY_WINDOW = int(os.getenv("LEADERBOARD_MATCHDAY_WINDOW", "5"))
+MATCHDAY_HISTORY_MAX_LIMIT = 20
+
+class LeaderboardCache:
+    """
+    Per-league leaderboard responses tagged with the standings generation they were built at
+
+    A request whose generation matches is served from memory. Once the
+    generation moves on (settlement, kicks, settings changes), the stale
+    response keeps being served while a single background refresh
+    recomputes it; requests with nothing cached all await that refresh.
+    """
+
+    def __init__(self, max_size: int = LEADERBOARD_CACHE_SIZE):
+        self.max_size = max_size
+        self.entries: "OrderedDict[str, Tuple[int, Dict]]" = OrderedDict()
+        self.refreshes: Dict[str, asyncio.Task] = {}
+
+    async def get(self, league_id: str, compute: Callable[[str], Awaitable[Dict]]) -> Dict:
+        generation = await get_cache_generations().get(league_id, STANDINGS)
+        entry = self.entries.get(league_id)
+        if entry is not None:
+            self.entries.move_to_end(league_id)
+            if entry[0] == generation:
+                return entry[1]
+
+        refresh = self.refreshes.get(league_id)
+        if refresh is None:
+            refresh = asyncio.create_task(self._refresh(league_id, generation, compute))
+            self.refreshes[league_id] = refresh
+        if entry is not None:
+            return entry[1]  # Stale while revalidating
+
+        value = await asyncio.shield(refresh)
+        if value is None:
+            raise RuntimeError(f"Leaderboard for league {league_id} could not be computed")
+        return value
+
+    async def _refresh(self, league_id: str, generation: int, compute) -> Optional[Dict]:
+        try:
+            value = await compute(league_id)
+            self.entries[league_id] = (generation, value)
+            self.entries.move_to_end(league_id)
+            while len(self.entries) > self.max_size:
+                self.entries.popitem(last=False)
+            return value
+        except Exception as e:
+            logger.error(f"Failed to refresh leaderboard for league {league_id}: {e}")
+            return None
+        finally:
+            self.refreshes.pop(league_id, None)
+
+    def invalidate(self, league_id: Optional[str] = None):
+        """Drop one league's entry (or all) from this process"""
+        if league_id is None:
+            self.entries.clear()
+        else:
+            self.entries.pop(league_id, None)
+
+# Global leaderboard cache
+leaderboard_cache = LeaderboardCache()
+
+def get_leaderboard_cache() -> LeaderboardCache:
+    """Get the leaderboard cache"""
+    return leaderboard_cache
+
 class AggregationService:
     """
     Advanced MongoDB aggregation service for UCL Auction analytics
@@ -14,80 +93,14 @@ class AggregationService:
     """
     
     @staticmethod
+    @single_flight
     async def get_league_leaderboard(league_id: str) -> Dict:
         """
         Get comprehensive league leaderboard with total points and weekly breakdown
-        Uses the provided MongoDB aggregation pipeline
+        Served from the leaderboard cache; recomputed once per standings generation
         """
         try:
-            # Main leaderboard aggregation
-            leaderboard_pipeline = [
-                {"$match": {"league_id": league_id}},
-                {"$group": {
-                    "_id": {"user_id": "$user_id"},
-                    "total": {"$sum": "$points_delta"},
-                    "matches_played": {"$sum": 1},
-                    "weekly_breakdown": {
-                        "$push": {
-                            "matchday": "$bucket.value",
-                            "points": "$points_delta",
-                            "match_id": "$match_id"
-                        }
-                    }
-                }},
-                {"$sort": {"total": -1}},
-                {"$lookup": {
-                    "from": "users",
-                    "localField": "_id.user_id",
-                    "foreignField": "_id",
-                    "as": "user"
-                }},
-                {"$unwind": "$user"},
-                {"$lookup": {
-                    "from": "rosters",
-                    "let": {"user_id": "$_id.user_id", "league_id": league_id},
-                    "pipeline": [
-                        {"$match": {
-                            "$expr": {
-                                "$and": [
-                                    {"$eq": ["$user_id", "$$user_id"]},
-                                    {"$eq": ["$league_id", "$$league_id"]}
-                                ]
-                            }
-                        }}
-                    ],
-                    "as": "roster"
-                }},
-                {"$unwind": "$roster"},
-                {"$project": {
-                    "user_id": "$_id.user_id",
-                    "display_name": "$user.display_name",
-                    "email": "$user.email",
-                    "total_points": "$total",
-                    "matches_played": "$matches_played",
-                    "budget_remaining": "$roster.budget_remaining",
-                    "budget_start": "$roster.budget_start",
-                    "weekly_breakdown": "$weekly_breakdown",
-                    "position": {"$literal": 0}  # Will be calculated after sorting
-                }}
-            ]
-            
-            leaderboard_results = await db.weekly_points.aggregate(leaderboard_pipeline).to_list(length=None)
-            
-            # Add position numbers
-            for i, result in enumerate(leaderboard_results):
-                result["position"] = i + 1
-            
-            # Get weekly/matchday breakdown aggregation
-            weekly_breakdown = await AggregationService._get_weekly_breakdown(league_id)
-            
-            return {
-                "league_id": league_id,
-                "leaderboard": leaderboard_results,
-                "weekly_breakdown": weekly_breakdown,
-                "total_managers": len(leaderboard_results)
-            }
-            
+            return await get_leaderboard_cache().get(league_id, AggregationService._compute_league_leaderboard)
         except Exception as e:
             logger.error(f"Failed to get league leaderboard: {e}")
             return {
@@ -98,54 +111,83 @@ class AggregationService:
             }
     
     @staticmethod
-    async def _get_weekly_breakdown(league_id: str) -> Dict:
+    async def _compute_league_leaderboard(league_id: str) -> Dict:
+        """
+        Build the leaderboard from the materialized league_standings maintained at settlement
+        Only the latest LEADERBOARD_MATCHDAY_WINDOW matchdays are included; older ones
+        are paged through get_league_matchday_history with `matchdays_cursor`
+        """
+        standings = await ScoringService.load_league_standings(league_id)
+        
+        leaderboard_results = [
+            {
+                "_id": {"user_id": row["user_id"]},
+                "user_id": row["user_id"],
+                "display_name": row["user"]["display_name"],
+                "email": row["user"]["email"],
+                "total_points": row["total_points"],
+                "matches_played": row["matches_played"],
+                "budget_remaining": row["roster"]["budget_remaining"],
+                "budget_start": row["roster"].get("budget_start"),
+                "position": position
+            }
+            for position, row in enumerate(standings, start=1)
+        ]
+        
+        # Latest matchdays from the pre-aggregated summaries
+        summaries, has_more = await ScoringService.load_matchday_summaries(
+            league_id, limit=LEADERBOARD_MATCHDAY_WINDOW
+        )
+        matchdays_total = len(summaries)
+        if has_more:
+            matchdays_total = await db.league_matchday_summaries.count_documents({"league_id": league_id})
+        
+        return {
+            "league_id": league_id,
+            "leaderboard": leaderboard_results,
+            "weekly_breakdown": AggregationService._get_weekly_breakdown(summaries),
+            "matchdays_total": matchdays_total,
+            "matchdays_cursor": summaries[-1]["matchday"] if has_more else None,
+            "total_managers": len(leaderboard_results)
+        }
+    
+    @staticmethod
+    @single_flight
+    async def get_league_matchday_history(league_id: str, before: int, limit: int = 5) -> Dict:
         """
-        Get weekly/matchday breakdown by $group on bucket.value
+        Older matchdays of the leaderboard breakdown, `limit` at a time before the cursor
+        Pass the returned `next_cursor` to continue; None means there are no older matchdays
+        """
+        try:
+            limit = max(1, min(limit, MATCHDAY_HISTORY_MAX_LIMIT))
+            summaries, has_more = await ScoringService.load_matchday_summaries(league_id, before, limit)
+            return {
+                "league_id": league_id,
+                "weekly_breakdown": AggregationService._get_weekly_breakdown(summaries),
+                "next_cursor": summaries[-1]["matchday"] if has_more else None
+            }
+        except Exception as e:
+            logger.error(f"Failed to get matchday history: {e}")
+            return {"league_id": league_id, "weekly_breakdown": {}, "next_cursor": None}
+    
+    @staticmethod
+    def _get_weekly_breakdown(summaries: List[Dict]) -> Dict:
+        """
+        Get weekly/matchday breakdown from matchday summaries (top 3 performers each)
         """
         try:
-            weekly_pipeline = [
-                {"$match": {"league_id": league_id}},
-                {"$group": {
-                    "_id": {
-                        "matchday": "$bucket.value",
-                        "user_id": "$user_id"
-                    },
-                    "matchday_points": {"$sum": "$points_delta"},
-                    "matches_in_matchday": {"$sum": 1}
-                }},
-                {"$group": {
-                    "_id": "$_id.matchday",
-                    "total_points_awarded": {"$sum": "$matchday_points"},
-                    "total_matches": {"$sum": "$matches_in_matchday"},
-                    "manager_performances": {
-                        "$push": {
-                            "user_id": "$_id.user_id",
-                            "points": "$matchday_points",
-                            "matches": "$matches_in_matchday"
-                        }
-                    }
-                }},
-                {"$sort": {"_id": 1}},  # Sort by matchday
-                {"$lookup": {
-                    "from": "users",
-                    "localField": "manager_performances.user_id",
-                    "foreignField": "_id",
-                    "as": "user_details"
-                }}
-            ]
-            
-            weekly_results = await db.weekly_points.aggregate(weekly_pipeline).to_list(length=None)
-            
-            # Transform results into a more usable format
             breakdown = {}
-            for week in weekly_results:
-                matchday = week["_id"]
-                breakdown[f"matchday_{matchday}"] = {
-                    "matchday": matchday,
-                    "total_points": week["total_points_awarded"],
-                    "total_matches": week["total_matches"],
+            for summary in sorted(summaries, key=lambda s: s["matchday"]):
+                performances = [
+                    {"user_id": user_id, "points": p["points"], "matches": p["matches"]}
+                    for user_id, p in summary.get("managers", {}).items()
+                ]
+                breakdown[f"matchday_{summary['matchday']}"] = {
+                    "matchday": summary["matchday"],
+                    "total_points": summary["total_points"],
+                    "total_matches": summary["total_matches"],
                     "top_performers": sorted(
-                        week["manager_performances"], 
+                        performances, 
                         key=lambda x: x["points"], 
                         reverse=True
                     )[:3]  # Top 3 performers for this matchday
@@ -158,6 +200,7 @@ class AggregationService:
             return {}
     
     @staticmethod
+    @single_flight
     async def get_user_clubs(league_id: str, user_id: str) -> Dict:
         """
         Get user's owned clubs with prices, budget info, and upcoming fixtures
@@ -344,118 +387,38 @@ class AggregationService:
             return []
     
     @staticmethod
-    async def get_league_fixtures(league_id: str, season: str = "2024-25") -> Dict:
+    @single_flight
+    async def get_league_fixtures(league_id: str, season: str = "2024-25", generation: Optional[int] = None) -> Dict:
         """
         Get all UCL fixtures for the season with ownership badges
+        Served from the league_fixtures read model, rebuilt only when the league's
+        fixtures generation has moved on since it was stored
         """
         try:
-            # Get all fixtures for the league/season
-            fixtures_pipeline = [
-                {"$match": {"league_id": league_id, "season": season}},
-                {"$lookup": {
-                    "from": "clubs",
-                    "localField": "home_ext",
-                    "foreignField": "ext_ref",
-                    "as": "home_club"
-                }},
-                {"$lookup": {
-                    "from": "clubs",
-                    "localField": "away_ext",
-                    "foreignField": "ext_ref",
-                    "as": "away_club"
-                }},
-                {"$project": {
-                    "match_id": 1,
-                    "date": 1,
-                    "status": 1,
-                    "home_ext": 1,
-                    "away_ext": 1,
-                    "home_club": {"$arrayElemAt": ["$home_club", 0]},
-                    "away_club": {"$arrayElemAt": ["$away_club", 0]}
-                }},
-                {"$sort": {"date": 1}}
-            ]
-            
-            fixtures = await db.fixtures.aggregate(fixtures_pipeline).to_list(length=None)
-            
-            # Get club ownership information for the league
-            ownership_pipeline = [
-                {"$match": {"league_id": league_id}},
-                {"$lookup": {
-                    "from": "clubs",
-                    "localField": "club_id",
-                    "foreignField": "_id",
-                    "as": "club"
-                }},
-                {"$unwind": "$club"},
-                {"$lookup": {
-                    "from": "users",
-                    "localField": "user_id",
-                    "foreignField": "_id",
-                    "as": "user"
-                }},
-                {"$unwind": "$user"},
-                {"$group": {
-                    "_id": "$club.ext_ref",
-                    "club_name": {"$first": "$club.name"},
-                    "club_short_name": {"$first": "$club.short_name"},
-                    "owners": {
-                        "$push": {
-                            "user_id": "$user_id",
-                            "display_name": "$user.display_name",
-                            "price": "$price"
-                        }
-                    }
-                }}
-            ]
-            
-            ownership_data = await db.roster_clubs.aggregate(ownership_pipeline).to_list(length=None)
-            ownership_map = {item["_id"]: item for item in ownership_data}
-            
-            # Get match results for completed fixtures
-            results_pipeline = [
-                {"$match": {"league_id": league_id}},
-                {"$project": {
-                    "match_id": 1,
-                    "home_ext": 1,
-                    "away_ext": 1,
-                    "home_goals": 1,
-                    "away_goals": 1,
-                    "status": 1
-                }}
-            ]
-            
-            results = await db.result_ingest.aggregate(results_pipeline).to_list(length=None)
-            results_map = {result["match_id"]: result for result in results}
-            
-            # Combine fixtures with ownership and results
-            enhanced_fixtures = []
-            for fixture in fixtures:
-                enhanced_fixture = fixture.copy()
-                
-                # Add ownership badges
-                enhanced_fixture["home_owners"] = ownership_map.get(fixture["home_ext"], {}).get("owners", [])
-                enhanced_fixture["away_owners"] = ownership_map.get(fixture["away_ext"], {}).get("owners", [])
-                
-                # Add results if available
-                if fixture["match_id"] in results_map:
-                    result = results_map[fixture["match_id"]]
-                    enhanced_fixture["home_goals"] = result["home_goals"]
-                    enhanced_fixture["away_goals"] = result["away_goals"]
-                    enhanced_fixture["result_status"] = result["status"]
-                
-                enhanced_fixtures.append(enhanced_fixture)
-            
-            # Group fixtures by matchday/competition stage
-            grouped_fixtures = AggregationService._group_fixtures_by_stage(enhanced_fixtures)
-            
-            return {
-                "league_id": league_id,
-                "season": season,
-                "fixtures": enhanced_fixtures,
-                "grouped_fixtures": grouped_fixtures,
-                "ownership_summary": ownership_map
-            }
+            if generation is None:
+                generation = await get_cache_generations().get(league_id, FIXTURES)
+            view_id = f"{league_id}:{season}"
+            view = await db.league_fixtures.find_one({"_id": view_id})
+            if view and view["generation"] == generation:
+                return view["content"]
+            
+            content = await AggregationService._build_league_fixtures(league_id, season)
+            try:
+                await db.league_fixtures.replace_one(
+                    {"_id": view_id},
+                    {
+                        "_id": view_id,
+                        "league_id": league_id,
+                        "season": season,
+                        "generation": generation,
+                        "content": content,
+                        "built_at": datetime.now(timezone.utc)
+                    },
+                    upsert=True
+                )
+            except Exception as e:
+                logger.error(f"Failed to store fixtures read model {view_id}: {e}")
+            return content
             
         except Exception as e:
             logger.error(f"Failed to get league fixtures: {e}")
@@ -468,39 +431,140 @@ class AggregationService:
             }
     
     @staticmethod
-    def _group_fixtures_by_stage(fixtures: List[Dict]) -> Dict:
+    async def _build_league_fixtures(league_id: str, season: str) -> Dict:
+        """
+        Build the fixtures page: fixtures, ownership badges and results, grouped by stage
+        """
+        # Get all fixtures for the league/season
+        fixtures_pipeline = [
+            {"$match": {"league_id": league_id, "season": season}},
+            {"$lookup": {
+                "from": "clubs",
+                "localField": "home_ext",
+                "foreignField": "ext_ref",
+                "as": "home_club"
+            }},
+            {"$lookup": {
+                "from": "clubs",
+                "localField": "away_ext",
+                "foreignField": "ext_ref",
+                "as": "away_club"
+            }},
+            {"$project": {
+                "match_id": 1,
+                "date": 1,
+                "status": 1,
+                "home_ext": 1,
+                "away_ext": 1,
+                "home_club": {"$arrayElemAt": ["$home_club", 0]},
+                "away_club": {"$arrayElemAt": ["$away_club", 0]}
+            }},
+            {"$sort": {"date": 1}}
+        ]
+        
+        fixtures = await db.fixtures.aggregate(fixtures_pipeline).to_list(length=None)
+        
+        # Get club ownership information for the league
+        ownership_pipeline = [
+            {"$match": {"league_id": league_id}},
+            {"$lookup": {
+                "from": "clubs",
+                "localField": "club_id",
+                "foreignField": "_id",
+                "as": "club"
+            }},
+            {"$unwind": "$club"},
+            {"$lookup": {
+                "from": "users",
+                "localField": "user_id",
+                "foreignField": "_id",
+                "as": "user"
+            }},
+            {"$unwind": "$user"},
+            {"$group": {
+                "_id": "$club.ext_ref",
+                "club_name": {"$first": "$club.name"},
+                "club_short_name": {"$first": "$club.short_name"},
+                "owners": {
+                    "$push": {
+                        "user_id": "$user_id",
+                        "display_name": "$user.display_name",
+                        "price": "$price"
+                    }
+                }
+            }}
+        ]
+        
+        ownership_data = await db.roster_clubs.aggregate(ownership_pipeline).to_list(length=None)
+        ownership_map = {item["_id"]: item for item in ownership_data}
+        
+        # Get match results for completed fixtures
+        results_pipeline = [
+            {"$match": {"league_id": league_id}},
+            {"$project": {
+                "match_id": 1,
+                "home_ext": 1,
+                "away_ext": 1,
+                "home_goals": 1,
+                "away_goals": 1,
+                "status": 1
+            }}
+        ]
+        
+        results = await db.result_ingest.aggregate(results_pipeline).to_list(length=None)
+        results_map = {result["match_id"]: result for result in results}
+        
+        # Combine fixtures with ownership and results
+        enhanced_fixtures = []
+        for fixture in fixtures:
+            enhanced_fixture = fixture.copy()
+            
+            # Add ownership badges
+            enhanced_fixture["home_owners"] = ownership_map.get(fixture["home_ext"], {}).get("owners", [])
+            enhanced_fixture["away_owners"] = ownership_map.get(fixture["away_ext"], {}).get("owners", [])
+            
+            # Add results if available
+            if fixture["match_id"] in results_map:
+                result = results_map[fixture["match_id"]]
+                enhanced_fixture["home_goals"] = result["home_goals"]
+                enhanced_fixture["away_goals"] = result["away_goals"]
+                enhanced_fixture["result_status"] = result["status"]
+            
+            enhanced_fixtures.append(enhanced_fixture)
+        
+        # Group fixtures by matchday/competition stage
+        calendars = get_matchday_calendars()
+        competition = (await calendars.league_competitions([league_id]))[league_id]
+        await calendars.load([(competition, season)])
+        grouped_fixtures = AggregationService._group_fixtures_by_stage(
+            enhanced_fixtures, calendars.get(competition, season)
+        )
+        
+        return {
+            "league_id": league_id,
+            "season": season,
+            "fixtures": enhanced_fixtures,
+            "grouped_fixtures": grouped_fixtures,
+            "ownership_summary": ownership_map
+        }
+    
+    @staticmethod
+    def _group_fixtures_by_stage(fixtures: List[Dict], calendar: MatchdayCalendar) -> Dict:
         """
         Group fixtures by competition stage (Group Stage, Knockout, etc.)
+        Uses the season's matchday calendar, so stages match scoring buckets
         """
         try:
-            grouped = {
-                "group_stage": [],
-                "round_of_16": [],
-                "quarter_finals": [],
-                "semi_finals": [],
-                "final": []
-            }
-            
-            now = datetime.now(timezone.utc)
-            season_start = datetime(2024, 9, 1, tzinfo=timezone.utc)
+            grouped = {"group_stage": []}
+            grouped.update({stage: [] for stage in calendar.knockout_stages})
             
             for fixture in fixtures:
                 fixture_date = fixture["date"]
                 if isinstance(fixture_date, str):
                     fixture_date = datetime.fromisoformat(fixture_date.replace('Z', '+00:00'))
                 
-                days_since_start = (fixture_date - season_start).days
-                
-                if days_since_start < 84:  # Group stage
-                    grouped["group_stage"].append(fixture)
-                elif days_since_start < 114:  # Round of 16
-                    grouped["round_of_16"].append(fixture)
-                elif days_since_start < 144:  # Quarter-finals
-                    grouped["quarter_finals"].append(fixture)
-                elif days_since_start < 174:  # Semi-finals
-                    grouped["semi_finals"].append(fixture)
-                else:  # Final
-                    grouped["final"].append(fixture)
+                fixture["matchday"] = calendar.matchday(fixture_date)
+                grouped.setdefault(calendar.stage(fixture["matchday"]), []).append(fixture)
             
             return grouped
             
@@ -509,52 +573,150 @@ class AggregationService:
             return {}
     
     @staticmethod
+    def _align_series(docs: List[Dict]) -> Tuple[List[int], List[str], np.ndarray, np.ndarray]:
+        """
+        Align manager series on a shared matchday axis
+        Returns (matchdays, user_ids, points, matches); the arrays are managers x matchdays,
+        zero where a manager had no settled match on that matchday
+        """
+        docs = sorted(docs, key=lambda doc: doc["user_id"])
+        matchdays = sorted({int(md) for doc in docs for md in doc.get("matchdays", {})})
+        column = {md: i for i, md in enumerate(matchdays)}
+        points = np.zeros((len(docs), len(matchdays)), dtype=np.int64)
+        matches = np.zeros_like(points)
+        for row, doc in enumerate(docs):
+            for md, entry in doc.get("matchdays", {}).items():
+                points[row, column[int(md)]] = entry["points"]
+                matches[row, column[int(md)]] = entry["matches"]
+        return matchdays, [doc["user_id"] for doc in docs], points, matches
+    
+    @staticmethod
+    async def _get_display_names(user_ids: List[str]) -> Dict[str, str]:
+        """Display names by user id, for users that still exist"""
+        users = await db.users.find({"_id": {"$in": user_ids}}, {"display_name": 1}).to_list(length=None)
+        return {user["_id"]: user["display_name"] for user in users}
+    
+    @staticmethod
+    @single_flight
     async def get_manager_head_to_head(league_id: str, user1_id: str, user2_id: str) -> Dict:
         """
-        Get head-to-head comparison between two managers
+        Get head-to-head comparison between two managers from their matchday series
         """
         try:
-            comparison_pipeline = [
-                {"$match": {
-                    "league_id": league_id,
-                    "user_id": {"$in": [user1_id, user2_id]}
-                }},
-                {"$group": {
-                    "_id": "$user_id",
-                    "total_points": {"$sum": "$points_delta"},
-                    "matches_played": {"$sum": 1},
-                    "best_matchday": {"$max": "$points_delta"},
-                    "worst_matchday": {"$min": "$points_delta"},
-                    "avg_points": {"$avg": "$points_delta"}
-                }},
-                {"$lookup": {
-                    "from": "users",
-                    "localField": "_id",
-                    "foreignField": "_id",
-                    "as": "user"
-                }},
-                {"$unwind": "$user"},
-                {"$project": {
-                    "user_id": "$_id",
-                    "display_name": "$user.display_name",
-                    "total_points": 1,
-                    "matches_played": 1,
-                    "best_matchday": 1,
-                    "worst_matchday": 1,
-                    "avg_points": {"$round": ["$avg_points", 2]}
-                }}
-            ]
-            
-            comparison_results = await db.weekly_points.aggregate(comparison_pipeline).to_list(length=None)
+            docs = await ScoringService.load_manager_series(league_id, [user1_id, user2_id])
+            matchdays, user_ids, points, matches = AggregationService._align_series(docs)
+            names = await AggregationService._get_display_names(user_ids)
+            rows = {user_id: i for i, user_id in enumerate(user_ids) if user_id in names}
+            
+            comparison = []
+            for user_id in dict.fromkeys([user1_id, user2_id]):
+                if user_id not in rows:
+                    continue
+                i = rows[user_id]
+                played = points[i][matches[i] > 0]
+                matches_played = int(matches[i].sum())
+                total_points = int(points[i].sum())
+                comparison.append({
+                    "user_id": user_id,
+                    "display_name": names[user_id],
+                    "total_points": total_points,
+                    "matches_played": matches_played,
+                    "best_matchday": int(played.max()) if played.size else 0,
+                    "worst_matchday": int(played.min()) if played.size else 0,
+                    "avg_points": round(total_points / matches_played, 2) if matches_played else 0,
+                    "points": points[i].tolist(),
+                    "cumulative": np.cumsum(points[i]).tolist()
+                })
+            
+            head_to_head = None
+            if user1_id != user2_id and user1_id in rows and user2_id in rows:
+                a, b = rows[user1_id], rows[user2_id]
+                both = (matches[a] > 0) & (matches[b] > 0)
+                head_to_head = {
+                    "user1_wins": int((both & (points[a] > points[b])).sum()),
+                    "user2_wins": int((both & (points[a] < points[b])).sum()),
+                    "draws": int((both & (points[a] == points[b])).sum()),
+                    "lead": (np.cumsum(points[a]) - np.cumsum(points[b])).tolist()  # user1 minus user2
+                }
             
             return {
                 "league_id": league_id,
-                "comparison": comparison_results
+                "matchdays": matchdays,
+                "comparison": comparison,
+                "head_to_head": head_to_head
             }
             
         except Exception as e:
             logger.error(f"Failed to get head-to-head comparison: {e}")
-            return {"league_id": league_id, "comparison": []}
+            return {"league_id": league_id, "matchdays": [], "comparison": [], "head_to_head": None}
+    
+    @staticmethod
+    @single_flight
+    async def get_league_head_to_head_matrix(league_id: str) -> Dict:
+        """
+        All-pairs head-to-head for a league
+        wins[i][j] is the number of matchdays manager i outscored manager j, counting
+        only matchdays where both had a settled match
+        """
+        try:
+            docs = await ScoringService.load_manager_series(league_id)
+            matchdays, user_ids, points, matches = AggregationService._align_series(docs)
+            names = await AggregationService._get_display_names(user_ids)
+            keep = [i for i, user_id in enumerate(user_ids) if user_id in names]
+            points, played = points[keep], matches[keep] > 0
+            
+            both = played[:, None, :] & played[None, :, :]
+            wins = ((points[:, None, :] > points[None, :, :]) & both).sum(axis=-1)
+            draws = ((points[:, None, :] == points[None, :, :]) & both).sum(axis=-1)
+            np.fill_diagonal(draws, 0)
+            
+            return {
+                "league_id": league_id,
+                "matchdays": matchdays,
+                "managers": [
+                    {"user_id": user_ids[i], "display_name": names[user_ids[i]]} for i in keep
+                ],
+                "wins": wins.tolist(),
+                "draws": draws.tolist()
+            }
+            
+        except Exception as e:
+            logger.error(f"Failed to get head-to-head matrix: {e}")
+            return {"league_id": league_id, "matchdays": [], "managers": [], "wins": [], "draws": []}
+    
+    @staticmethod
+    @single_flight
+    async def get_league_rank_history(league_id: str) -> Dict:
+        """
+        Cumulative points and league position of every manager after each matchday
+        Tied managers share a rank (1 + managers strictly ahead)
+        """
+        try:
+            docs = await ScoringService.load_manager_series(league_id)
+            matchdays, user_ids, points, _ = AggregationService._align_series(docs)
+            names = await AggregationService._get_display_names(user_ids)
+            keep = [i for i, user_id in enumerate(user_ids) if user_id in names]
+            
+            cumulative = np.cumsum(points[keep], axis=1)
+            ranks = 1 + (cumulative[None, :, :] > cumulative[:, None, :]).sum(axis=1)
+            
+            return {
+                "league_id": league_id,
+                "matchdays": matchdays,
+                "managers": [
+                    {
+                        "user_id": user_ids[i],
+                        "display_name": names[user_ids[i]],
+                        "cumulative": cumulative[row].tolist(),
+                        "ranks": ranks[row].tolist()
+                    }
+                    for row, i in enumerate(keep)
+                ]
+            }
+            
+        except Exception as e:
+            logger.error(f"Failed to get rank history: {e}")
+            return {"league_id": league_id, "matchdays": [], "managers": []}
 
 # Convenience functions for easy access
 async def get_leaderboard(league_id: str) -> Dict:
@@ -9,6 +9,13 @@ from pymongo.errors import DuplicateKeyError
 from models import *
 from database import db
 from time_provider import now, now_ms, is_test_mode
+from lot_state import (
+    BIDDABLE_STATUSES, LiveLotState, LotWriteBehind, WriteBehindError, build_bid_document, build_lot_document
+)
+from deadline_scheduler import get_deadline_scheduler, to_ms
+from budget_ledger import get_budget_ledger
+from snapshot_service import get_snapshot_cache
+from cache_generations import get_cache_generations, FIXTURES, STANDINGS
 import socketio
 
 # Auction timing configuration from environment
@@ -17,6 +24,22 @@ DEFAULT_ANTI_SNIPE = 3 if is_test_mode() else 30
 BID_TIMER_SECONDS = int(os.getenv("BID_TIMER_SECONDS", str(DEFAULT_BID_TIMER)))
 ANTI_SNIPE_SECONDS = int(os.getenv("ANTI_SNIPE_SECONDS", str(DEFAULT_ANTI_SNIPE)))
 
+# Time sync cadence: faster near the end of a lot, slower while paused
+TIME_SYNC_INTERVAL = float(os.getenv("TIME_SYNC_INTERVAL", "2.0"))
+TIME_SYNC_FINAL_INTERVAL = float(os.getenv("TIME_SYNC_FINAL_INTERVAL", "0.5"))
+TIME_SYNC_PAUSED_INTERVAL = float(os.getenv("TIME_SYNC_PAUSED_INTERVAL", "5.0"))
+TIME_SYNC_FINAL_SECONDS = float(os.getenv("TIME_SYNC_FINAL_SECONDS", "10"))
+
+# Lot materialization: batch size for inserts, and lazy creation one nomination window ahead
+LOT_BATCH_SIZE = int(os.getenv("LOT_BATCH_SIZE", "500"))
+LAZY_LOT_CREATION = os.getenv("LAZY_LOT_CREATION", "false").lower() == "true"
+
+# Pause between a lot closing and the next one opening
+NEXT_LOT_DELAY_SECONDS = float(os.getenv("NEXT_LOT_DELAY_SECONDS", "2"))
+
+# Attempts at settling a lot before the close is abandoned
+CLOSE_LOT_ATTEMPTS = int(os.getenv("CLOSE_LOT_ATTEMPTS", "3"))
+
 logger = logging.getLogger(__name__)
 
 class AuctionState:
@@ -37,56 +60,97 @@ class AuctionEngine:
     def __init__(self, sio: socketio.AsyncServer):
         self.sio = sio
         self.active_auctions: Dict[str, Dict] = {}  # auction_id -> auction_data
-        self.auction_timers: Dict[str, asyncio.Task] = {}  # lot_id -> timer_task
-        self.time_sync_tasks: Dict[str, asyncio.Task] = {}  # auction_id -> sync_task
+        self.lot_states: Dict[str, LiveLotState] = {}  # auction_id -> current lot state
+        self.write_behind = LotWriteBehind()
+        self.scheduler = get_deadline_scheduler()  # owns every lot deadline
+        self.club_cache: Dict[str, Dict] = {}  # club_id -> display block
+        self.user_cache: Dict[str, Dict] = {}  # user_id -> display block
+        self.time_sync_due: Dict[str, int] = {}  # auction_id -> next time_sync (epoch ms)
+        self.time_sync_task: Optional[asyncio.Task] = None  # one ticker for all auctions
+        self.time_sync_wakeup = asyncio.Event()
         
     async def start_time_sync(self, auction_id: str):
         """Start periodic time synchronization for an auction"""
-        if auction_id in self.time_sync_tasks:
+        if auction_id in self.time_sync_due:
             return  # Already running
         
-        self.time_sync_tasks[auction_id] = asyncio.create_task(
-            self._time_sync_loop(auction_id)
-        )
+        self.time_sync_due[auction_id] = now_ms()
+        if self.time_sync_task is None or self.time_sync_task.done():
+            self.time_sync_task = asyncio.create_task(self._time_sync_loop())
+        self.time_sync_wakeup.set()
         logger.info(f"Started time sync for auction {auction_id}")
     
     async def stop_time_sync(self, auction_id: str):
         """Stop time synchronization for an auction"""
-        if auction_id in self.time_sync_tasks:
-            self.time_sync_tasks[auction_id].cancel()
-            del self.time_sync_tasks[auction_id]
+        if self.time_sync_due.pop(auction_id, None) is not None:
+            self.time_sync_wakeup.set()
             logger.info(f"Stopped time sync for auction {auction_id}")
     
-    async def _time_sync_loop(self, auction_id: str):
-        """Send server time every 2 seconds for client synchronization"""
+    def _time_sync_interval(self, auction_id: str, current_ms: int) -> float:
+        """Seconds until this auction's next time_sync"""
+        auction_data = self.active_auctions.get(auction_id)
+        if auction_data and auction_data.get("paused"):
+            return TIME_SYNC_PAUSED_INTERVAL
+        
+        lot_state = self.lot_states.get(auction_id)
+        if not lot_state or not lot_state.timer_ends_at:
+            return TIME_SYNC_INTERVAL
+        
+        remaining = (to_ms(lot_state.timer_ends_at) - current_ms) / 1000
+        if remaining <= TIME_SYNC_FINAL_SECONDS:
+            return TIME_SYNC_FINAL_INTERVAL
+        # Don't sleep past the start of the final window
+        return max(TIME_SYNC_FINAL_INTERVAL, min(TIME_SYNC_INTERVAL, remaining - TIME_SYNC_FINAL_SECONDS))
+    
+    async def _time_sync_loop(self):
+        """Send server time and the in-memory lot deadline to every due auction room"""
         try:
-            while auction_id in self.active_auctions:
-                server_now = now()  # Use time provider
+            while self.time_sync_due:
+                current_ms = now_ms()
+                server_now = now().isoformat()  # Use time provider
                 
-                # Get current lot timer info if exists
-                current_lot = None
-                auction = await db.auctions.find_one({"_id": auction_id})
-                if auction and auction.get("current_lot_id"):
-                    lot = await db.lots.find_one({"_id": auction["current_lot_id"]})
-                    if lot and lot.get("timer_ends_at"):
+                for auction_id, due_ms in list(self.time_sync_due.items()):
+                    if due_ms > current_ms:
+                        continue
+                    if auction_id not in self.active_auctions:
+                        self.time_sync_due.pop(auction_id, None)
+                        continue
+                    
+                    current_lot = None
+                    lot_state = self.lot_states.get(auction_id)
+                    if lot_state and lot_state.timer_ends_at:
                         current_lot = {
-                            "lot_id": lot["_id"],
-                            "timer_ends_at": lot["timer_ends_at"].isoformat(),
-                            "status": lot["status"]
+                            "lot_id": lot_state.lot_id,
+                            "timer_ends_at": lot_state.timer_ends_at.isoformat(),
+                            "status": lot_state.status
                         }
+                    
+                    try:
+                        await self.sio.emit('time_sync', {
+                            'server_now': server_now,
+                            'current_lot': current_lot
+                        }, room=f"auction_{auction_id}")
+                    except Exception as e:
+                        logger.error(f"Time sync error for auction {auction_id}: {e}")
+                    
+                    if auction_id in self.time_sync_due:
+                        interval = self._time_sync_interval(auction_id, current_ms)
+                        self.time_sync_due[auction_id] = current_ms + int(interval * 1000)
                 
-                # Broadcast time sync
-                await self.sio.emit('time_sync', {
-                    'server_now': server_now.isoformat(),
-                    'current_lot': current_lot
-                }, room=f"auction_{auction_id}")
-                
-                await asyncio.sleep(2)  # Send every 2 seconds
+                if not self.time_sync_due:
+                    break
+                next_due = min(self.time_sync_due.values())
+                self.time_sync_wakeup.clear()
+                try:
+                    await asyncio.wait_for(
+                        self.time_sync_wakeup.wait(),
+                        timeout=max(0.05, (next_due - now_ms()) / 1000)
+                    )
+                except asyncio.TimeoutError:
+                    pass
                 
         except asyncio.CancelledError:
-            logger.info(f"Time sync cancelled for auction {auction_id}")
-        except Exception as e:
-            logger.error(f"Time sync error for auction {auction_id}: {e}")
+            logger.info("Time sync ticker cancelled")
         
     async def start_auction(self, auction_id: str, commissioner_id: str) -> bool:
         """Start an auction if league is ready"""
@@ -121,9 +185,10 @@ class AuctionEngine:
                 {"_id": auction_id},
                 {"$set": {"status": AuctionStatus.LIVE}}
             )
+            get_snapshot_cache().invalidate(auction_id)
             
-            # Create lots for all clubs in round-robin nomination order
-            await self._create_auction_lots(auction_id, auction["league_id"], auction["nomination_order"])
+            # Warm the budget ledger so bid guardrails are answered from memory
+            await get_budget_ledger().load_league(auction["league_id"], force=True)
             
             # Store active auction data
             self.active_auctions[auction_id] = {
@@ -131,6 +196,12 @@ class AuctionEngine:
                 "league_id": auction["league_id"],
                 "current_lot_index": 0,
                 "nomination_order": auction["nomination_order"],
+                "lot_cursor": {
+                    "competition": league.get("competition"),
+                    "last_club_id": None,
+                    "next_index": 0,
+                    "exhausted": False
+                },
                 "settings": {
                     "min_increment": auction["min_increment"],
                     "bid_timer_seconds": auction.get("bid_timer_seconds", BID_TIMER_SECONDS),
@@ -139,6 +210,12 @@ class AuctionEngine:
                 }
             }
             
+            # Create lots in round-robin nomination order: all now, or the first window if lazy
+            if LAZY_LOT_CREATION:
+                await self._materialize_lots(auction_id, limit=self._lot_window(auction_id))
+            else:
+                await self._materialize_lots(auction_id)
+            
             # Start time synchronization
             await self.start_time_sync(auction_id)
             
@@ -156,33 +233,71 @@ class AuctionEngine:
             logger.error(f"Failed to start auction {auction_id}: {e}")
             raise Exception(f"Auction start failed: {str(e)}")
     
-    async def _create_auction_lots(self, auction_id: str, league_id: str, nomination_order: List[str]):
-        """Create lots for all clubs in nomination order"""
+    @staticmethod
+    def _club_filter(competition: Optional[str], after_club_id: Optional[str]) -> Dict:
+        """Clubs eligible for a competition; untagged clubs are eligible everywhere"""
+        query: Dict = {}
+        if competition:
+            query["$or"] = [
+                {"competitions": competition},
+                {"competitions": {"$exists": False}},
+                {"competitions": {"$size": 0}}
+            ]
+        if after_club_id is not None:
+            query["_id"] = {"$gt": after_club_id}
+        return query
+    
+    def _lot_window(self, auction_id: str) -> int:
+        """Lots to keep materialized ahead of the current one: one nomination round"""
+        return max(1, len(self.active_auctions[auction_id]["nomination_order"]))
+    
+    async def _iter_lot_batches(self, auction_id: str, limit: Optional[int] = None):
+        """
+        Stream raw lot documents in batches, advancing the auction's lot cursor
+        Clubs are read in _id order with only their _id projected
+        """
+        auction_data = self.active_auctions[auction_id]
+        cursor_state = auction_data["lot_cursor"]
+        nomination_order = auction_data["nomination_order"]
+        created_at = now()
+        
+        cursor = db.clubs.find(
+            self._club_filter(cursor_state["competition"], cursor_state["last_club_id"]),
+            {"_id": 1}
+        ).sort("_id", 1)
+        if limit is not None:
+            cursor = cursor.limit(limit)
+        
+        batch: List[Dict] = []
+        produced = 0
+        async for club in cursor:
+            index = cursor_state["next_index"]
+            nominator_id = nomination_order[index % len(nomination_order)] if nomination_order else None
+            batch.append(build_lot_document(auction_id, club["_id"], nominator_id, index, created_at))
+            cursor_state["next_index"] = index + 1
+            cursor_state["last_club_id"] = club["_id"]
+            produced += 1
+            
+            if len(batch) >= LOT_BATCH_SIZE:
+                yield batch
+                batch = []
+        
+        if batch:
+            yield batch
+        if limit is None or produced < limit:
+            cursor_state["exhausted"] = True
+    
+    async def _materialize_lots(self, auction_id: str, limit: Optional[int] = None) -> int:
+        """Insert the next lots for an auction in batches; returns the number created"""
         try:
-            # Get all clubs
-            clubs = await db.clubs.find().to_list(length=None)
-            
-            # Create lots in round-robin order by nomination
-            lots = []
-            nominator_index = 0
-            
-            for i, club in enumerate(clubs):
-                nominator_id = nomination_order[nominator_index % len(nomination_order)]
-                
-                lot = Lot(
-                    auction_id=auction_id,
-                    club_id=club["_id"],
-                    nominated_by=nominator_id,
-                    order_index=i,
-                    status=LotStatus.PENDING
-                )
-                lots.append(lot.dict(by_alias=True))
-                nominator_index += 1
-            
-            # Insert all lots
-            if lots:
-                await db.lots.insert_many(lots)
-                logger.info(f"Created {len(lots)} lots for auction {auction_id}")
+            created = 0
+            async for batch in self._iter_lot_batches(auction_id, limit):
+                await db.lots.insert_many(batch, ordered=False)
+                created += len(batch)
+            
+            if created:
+                logger.info(f"Created {created} lots for auction {auction_id}")
+            return created
                 
         except Exception as e:
             logger.error(f"Failed to create auction lots: {e}")
@@ -195,6 +310,14 @@ class AuctionEngine:
             if not auction_data:
                 return
             
+            # Keep one nomination window of lots materialized ahead
+            cursor_state = auction_data["lot_cursor"]
+            if not cursor_state["exhausted"]:
+                window = self._lot_window(auction_id)
+                pending = cursor_state["next_index"] - auction_data["current_lot_index"]
+                if pending < window:
+                    await self._materialize_lots(auction_id, limit=window)
+            
             # Get next pending lot
             lot = await db.lots.find_one({
                 "auction_id": auction_id,
@@ -222,11 +345,20 @@ class AuctionEngine:
                 }
             )
             
-            # Start timer task
-            self.auction_timers[lot["_id"]] = asyncio.create_task(
-                self._lot_timer(auction_id, lot["_id"], timer_ends_at)
+            auction_data["current_lot_index"] = lot["order_index"] + 1
+            
+            # Hold the open lot in memory; bids are validated against this state
+            self.lot_states[auction_id] = LiveLotState(
+                lot_id=lot["_id"],
+                auction_id=auction_id,
+                club_id=lot["club_id"],
+                order_index=lot["order_index"],
+                timer_ends_at=timer_ends_at
             )
             
+            # Schedule the lot's going-once deadline
+            self._schedule_lot_timer(auction_id, lot["_id"], timer_ends_at)
+            
             # Broadcast lot start
             await self._broadcast_lot_update(auction_id, lot["_id"])
             
@@ -235,176 +367,274 @@ class AuctionEngine:
         except Exception as e:
             logger.error(f"Failed to start next lot: {e}")
     
-    async def _lot_timer(self, auction_id: str, lot_id: str, timer_ends_at: datetime):
-        """Timer for individual lot with going once/twice states"""
+    @staticmethod
+    def _lot_timer_key(lot_id: str) -> str:
+        return f"lot:{lot_id}"
+
+    def _schedule_lot_timer(self, auction_id: str, lot_id: str, timer_ends_at: datetime):
+        """Schedule going once 6 seconds before the lot ends; replaces any earlier deadline"""
+        self.scheduler.schedule(
+            self._lot_timer_key(lot_id),
+            to_ms(timer_ends_at) - 6000,
+            lambda: self._going_once(auction_id, lot_id, timer_ends_at)
+        )
+
+    def _resume_lot_timer(self, auction_id: str, lot_state: LiveLotState):
+        """Reschedule the deadline matching the lot's current status after a pause"""
+        lot_id, timer_ends_at = lot_state.lot_id, lot_state.timer_ends_at
+        if lot_state.status == "open" and timer_ends_at:
+            self._schedule_lot_timer(auction_id, lot_id, timer_ends_at)
+        elif lot_state.status == "going_once":
+            self.scheduler.schedule(
+                self._lot_timer_key(lot_id),
+                now_ms() + 3000,
+                lambda: self._going_twice(auction_id, lot_id, timer_ends_at)
+            )
+        elif lot_state.status == "going_twice":
+            self.scheduler.schedule(
+                self._lot_timer_key(lot_id),
+                now_ms() + 3000,
+                lambda: self._close_lot(auction_id, lot_id, timer_ends_at)
+            )
+        # "closing": a close is already running and moves the auction on itself
+
+    async def _going_once(self, auction_id: str, lot_id: str, timer_ends_at: Optional[datetime]):
+        """Going once (3 seconds)"""
+        # Check if lot is still open and was not extended since this deadline was set
+        if not await self._advance_lot_status(auction_id, lot_id, timer_ends_at, "open", "going_once"):
+            return
+        self.scheduler.schedule(
+            self._lot_timer_key(lot_id),
+            now_ms() + 3000,
+            lambda: self._going_twice(auction_id, lot_id, timer_ends_at)
+        )
+        await self._broadcast_lot_delta(auction_id, lot_id)
+
+    async def _going_twice(self, auction_id: str, lot_id: str, timer_ends_at: Optional[datetime]):
+        """Going twice (3 seconds), then close"""
+        if not await self._advance_lot_status(auction_id, lot_id, timer_ends_at, "going_once", "going_twice"):
+            return
+        self.scheduler.schedule(
+            self._lot_timer_key(lot_id),
+            now_ms() + 3000,
+            lambda: self._close_lot(auction_id, lot_id, timer_ends_at)
+        )
+        await self._broadcast_lot_delta(auction_id, lot_id)
+
+    async def _advance_lot_status(
+        self,
+        auction_id: str,
+        lot_id: str,
+        timer_ends_at: Optional[datetime],
+        expected: str,
+        new_status: str
+    ) -> bool:
+        """
+        Move the in-memory lot to a new status if it is still in the expected one
+        A deadline that fired before an anti-snipe extension sees a newer timer_ends_at and does nothing
+        """
+        lot_state = self.lot_states.get(auction_id)
+        if not lot_state or lot_state.lot_id != lot_id:
+            return False
+
+        async with lot_state.lock:
+            if lot_state.status != expected or lot_state.timer_ends_at != timer_ends_at:
+                return False
+            lot_state.status = new_status
+            self.write_behind.record_lot(lot_id, {"status": new_status})
+        return True
+
+    async def _close_lot(
+        self,
+        auction_id: str,
+        lot_id: str,
+        timer_ends_at: Optional[datetime] = None,
+        attempt: int = 1
+    ):
+        """Close lot and process sale atomically"""
+        # Stop accepting bids; the in-memory state holds the authoritative final bid
+        lot_state = self.lot_states.get(auction_id)
+        final_bid = None  # (current_bid, leading_bidder_id)
+        if lot_state and lot_state.lot_id == lot_id:
+            async with lot_state.lock:
+                # A late bid may have reopened the lot; only retries find it already closing
+                expected = "going_twice" if attempt == 1 else "closing"
+                if lot_state.status != expected or lot_state.timer_ends_at != timer_ends_at:
+                    return
+                lot_state.status = "closing"
+                final_bid = (lot_state.current_bid, lot_state.leading_bidder_id)
+            # The close writes the lot's final fields; drop queued ones so a later flush cannot overwrite them
+            await self.write_behind.take_lot(lot_id)
         try:
-            # Wait until 6 seconds before end
-            wait_time = (timer_ends_at - now()).total_seconds() - 6
-            if wait_time > 0:
-                await asyncio.sleep(wait_time)
-            
-            # Check if lot is still open (might have been extended)
-            lot = await db.lots.find_one({"_id": lot_id})
-            if not lot or lot["status"] != "open":
+            await self.write_behind.flush()
+        except WriteBehindError as e:
+            logger.warning(f"Closing lot {lot_id} with bids still queued: {e}")
+
+        final_fields = None
+        if final_bid:
+            final_fields = {"current_bid": final_bid[0], "top_bidder_id": final_bid[1], "leading_bidder_id": final_bid[1]}
+
+        sale = None  # (league_id, user_id, price) once the sale commits
+        try:
+            async with await db.client.start_session() as session:
+                async with session.start_transaction():
+                    # Get final lot state
+                    lot = await db.lots.find_one({"_id": lot_id}, session=session)
+                    if not lot:
+                        logger.warning(f"Lot {lot_id} not found at close")
+                    else:
+                        current_bid, leading_bidder_id = final_bid or (
+                            lot["current_bid"], lot.get("leading_bidder_id") or lot.get("top_bidder_id")
+                        )
+                        final_fields = {
+                            "current_bid": current_bid,
+                            "top_bidder_id": leading_bidder_id,
+                            "leading_bidder_id": leading_bidder_id
+                        }
+                        sale = await self._settle_lot(
+                            auction_id, lot, current_bid, leading_bidder_id, final_fields, session
+                        )
+        except Exception as e:
+            # The transaction aborted on leaving its block; nothing was settled
+            logger.error(f"Failed to close lot {lot_id} (attempt {attempt}/{CLOSE_LOT_ATTEMPTS}): {e}")
+            sale = None
+            if lot_state is None or self.lot_states.get(auction_id) is lot_state:
+                if attempt < CLOSE_LOT_ATTEMPTS:
+                    self.scheduler.schedule(
+                        self._lot_timer_key(lot_id),
+                        now_ms() + 3000,
+                        lambda: self._close_lot(auction_id, lot_id, timer_ends_at, attempt + 1)
+                    )
+                    return
+                # Out of attempts: leave the club unsold rather than stall the auction
+                try:
+                    await db.lots.update_one(
+                        {"_id": lot_id},
+                        {"$set": {**(final_fields or {}), "status": "unsold"}}
+                    )
+                    logger.error(f"Lot {lot_id} marked unsold after {attempt} failed close attempts")
+                except Exception as unsold_error:
+                    logger.error(f"Failed to mark lot {lot_id} unsold: {unsold_error}")
+            else:
                 return
-            
-            # Going once (3 seconds)
+
+        # Sale committed; keep the budget ledger and caches in step. Failures here never re-settle the lot.
+        if sale:
+            try:
+                get_budget_ledger().record_sale(*sale)
+                get_snapshot_cache().invalidate(auction_id)
+                await self._broadcast_manager_budget(auction_id, sale[0], sale[1])
+                await get_cache_generations().bump([sale[0]], FIXTURES, STANDINGS)
+            except Exception as e:
+                logger.error(f"Lot {lot_id} sold, but post-sale updates failed: {e}")
+        
+        # Lot is settled in the database; drop its in-memory state
+        if self.lot_states.get(auction_id) is lot_state:
+            del self.lot_states[auction_id]
+
+        # Broadcast final lot state
+        await self._broadcast_lot_update(auction_id, lot_id)
+        
+        # Start next lot after delay
+        await asyncio.sleep(NEXT_LOT_DELAY_SECONDS)
+        await self._start_next_lot(auction_id)
+    
+    async def _settle_lot(
+        self,
+        auction_id: str,
+        lot: Dict,
+        current_bid: int,
+        leading_bidder_id: Optional[str],
+        final_fields: Dict,
+        session: AsyncIOMotorClientSession
+    ) -> Optional[tuple]:
+        """
+        Mark a closing lot sold or unsold inside the close transaction
+        Returns (league_id, user_id, price) if it sold
+        """
+        lot_id = lot["_id"]
+        if not (current_bid > 0 and leading_bidder_id):
+            # UNSOLD - no bids
             await db.lots.update_one(
                 {"_id": lot_id},
-                {"$set": {"status": "going_once"}}
+                {"$set": {**final_fields, "status": "unsold"}},
+                session=session
             )
-            await self._broadcast_lot_update(auction_id, lot_id)
-            await asyncio.sleep(3)
+            logger.info(f"Lot {lot_id} UNSOLD - no bids")
+            return None
+        
+        # SOLD - process transaction atomically with guardrails
+        try:
+            # Import AdminService here to avoid circular imports
+            from admin_service import AdminService
             
-            # Check again
-            lot = await db.lots.find_one({"_id": lot_id})
-            if not lot or lot["status"] != "going_once":
-                return
+            league_id = self.active_auctions[auction_id]["league_id"]
+            
+            # GUARDRAILS: Ownership, budget and capacity re-read inside the transaction
+            sale_valid, unsold_reason = await AdminService.validate_sale(
+                league_id, lot["club_id"], leading_bidder_id, current_bid, session
+            )
             
-            # Going twice (3 seconds)
+            if not sale_valid:
+                await db.lots.update_one(
+                    {"_id": lot_id},
+                    {"$set": {**final_fields, "status": "unsold"}},
+                    session=session
+                )
+                logger.warning(f"Lot {lot_id} - {unsold_reason} - marked unsold")
+                return None
+            
+            # 1. Create roster club (with guardrails passed)
+            roster_club = RosterClub(
+                roster_id=f"roster_{leading_bidder_id}_{auction_id}",  # Will be resolved
+                league_id=league_id,
+                user_id=leading_bidder_id,
+                club_id=lot["club_id"],
+                price=current_bid
+            )
+            roster_club_dict = roster_club.dict(by_alias=True)
+            await db.roster_clubs.insert_one(roster_club_dict, session=session)
+            
+            # 2. Deduct budget from winner's roster
+            await db.rosters.update_one(
+                {
+                    "league_id": league_id,
+                    "user_id": leading_bidder_id
+                },
+                {"$inc": {"budget_remaining": -current_bid, "ledger_version": 1}},
+                session=session
+            )
+            
+            # 3. Mark lot as sold with winner info
             await db.lots.update_one(
                 {"_id": lot_id},
-                {"$set": {"status": "going_twice"}}
+                {"$set": {
+                    **final_fields,
+                    "status": "sold",
+                    "winner_id": leading_bidder_id,
+                    "final_price": current_bid
+                }},
+                session=session
             )
-            await self._broadcast_lot_update(auction_id, lot_id)
-            await asyncio.sleep(3)
             
-            # Final check and close lot
-            await self._close_lot(auction_id, lot_id)
+            logger.info(f"Lot {lot_id} SOLD to {leading_bidder_id} for {current_bid}")
+            return (league_id, leading_bidder_id, current_bid)
             
-        except asyncio.CancelledError:
-            logger.info(f"Timer cancelled for lot {lot_id}")
-        except Exception as e:
-            logger.error(f"Timer error for lot {lot_id}: {e}")
-    
-    async def _close_lot(self, auction_id: str, lot_id: str):
-        """Close lot and process sale atomically"""
-        async with await db.client.start_session() as session:
-            try:
-                async with session.start_transaction():
-                    # Get final lot state
-                    lot = await db.lots.find_one({"_id": lot_id}, session=session)
-                    if not lot:
-                        return
-                    
-                    if lot["current_bid"] > 0 and lot["leading_bidder_id"]:
-                        # SOLD - process transaction atomically with guardrails
-                        try:
-                            # Import AdminService here to avoid circular imports
-                            from admin_service import AdminService
-                            
-                            # GUARDRAIL: Check no duplicate ownership
-                            league_id = self.active_auctions[auction_id]["league_id"]
-                            no_duplicate = await AdminService.validate_no_duplicate_ownership(
-                                league_id, lot["club_id"]
-                            )
-                            
-                            if not no_duplicate:
-                                # Club already owned - mark as unsold
-                                await db.lots.update_one(
-                                    {"_id": lot_id},
-                                    {"$set": {"status": "unsold"}},
-                                    session=session
-                                )
-                                logger.warning(f"Lot {lot_id} - duplicate ownership prevented - marked unsold")
-                                return
-                            
-                            # GUARDRAIL: Final budget check at lot close
-                            budget_valid, budget_error = await AdminService.validate_budget_constraint(
-                                lot["leading_bidder_id"], league_id, lot["current_bid"]
-                            )
-                            
-                            if not budget_valid:
-                                # Insufficient budget - mark as unsold
-                                await db.lots.update_one(
-                                    {"_id": lot_id},
-                                    {"$set": {"status": "unsold"}},
-                                    session=session
-                                )
-                                logger.warning(f"Lot {lot_id} - budget check failed: {budget_error} - marked unsold")
-                                return
-                            
-                            # GUARDRAIL: Roster capacity check at lot close
-                            capacity_valid, capacity_error = await AdminService.validate_roster_capacity(
-                                lot["leading_bidder_id"], league_id
-                            )
-                            
-                            if not capacity_valid:
-                                # Roster full - mark as unsold
-                                await db.lots.update_one(
-                                    {"_id": lot_id},
-                                    {"$set": {"status": "unsold"}},
-                                    session=session
-                                )
-                                logger.warning(f"Lot {lot_id} - roster capacity check failed: {capacity_error} - marked unsold")
-                                return
-                            
-                            # 1. Create roster club (with guardrails passed)
-                            roster_club = RosterClub(
-                                roster_id=f"roster_{lot['leading_bidder_id']}_{auction_id}",  # Will be resolved
-                                league_id=league_id,
-                                user_id=lot["leading_bidder_id"],
-                                club_id=lot["club_id"],
-                                price=lot["current_bid"]
-                            )
-                            roster_club_dict = roster_club.dict(by_alias=True)
-                            await db.roster_clubs.insert_one(roster_club_dict, session=session)
-                            
-                            # 2. Deduct budget from winner's roster
-                            await db.rosters.update_one(
-                                {
-                                    "league_id": league_id,
-                                    "user_id": lot["leading_bidder_id"]
-                                },
-                                {"$inc": {"budget_remaining": -lot["current_bid"]}},
-                                session=session
-                            )
-                            
-                            # 3. Mark lot as sold with winner info
-                            await db.lots.update_one(
-                                {"_id": lot_id},
-                                {"$set": {
-                                    "status": "sold",
-                                    "winner_id": lot["leading_bidder_id"],
-                                    "final_price": lot["current_bid"]
-                                }},
-                                session=session
-                            )
-                            
-                            logger.info(f"Lot {lot_id} SOLD to {lot['leading_bidder_id']} for {lot['current_bid']}")
-                            
-                        except DuplicateKeyError:
-                            # Club already owned - mark as unsold
-                            await db.lots.update_one(
-                                {"_id": lot_id},
-                                {"$set": {"status": "unsold"}},
-                                session=session
-                            )
-                            logger.warning(f"Lot {lot_id} club already owned - marked unsold")
-                    
-                    else:
-                        # UNSOLD - no bids
-                        await db.lots.update_one(
-                            {"_id": lot_id},
-                            {"$set": {"status": "unsold"}},
-                            session=session
-                        )
-                        logger.info(f"Lot {lot_id} UNSOLD - no bids")
-                
-                # Broadcast final lot state
-                await self._broadcast_lot_update(auction_id, lot_id)
-                
-                # Start next lot after delay
-                await asyncio.sleep(2)
-                await self._start_next_lot(auction_id)
-                
-            except Exception as e:
-                logger.error(f"Failed to close lot {lot_id}: {e}")
-                await session.abort_transaction()
+        except DuplicateKeyError:
+            # Club already owned - mark as unsold
+            await db.lots.update_one(
+                {"_id": lot_id},
+                {"$set": {**final_fields, "status": "unsold"}},
+                session=session
+            )
+            logger.warning(f"Lot {lot_id} club already owned - marked unsold")
+            return None
     
     async def place_bid(self, auction_id: str, lot_id: str, bidder_id: str, amount: int) -> Dict:
         """
         Place bid with comprehensive validation guardrails and atomic operations
+        Bids are accepted against in-memory lot state under a per-lot lock and
+        persisted write-behind to db.lots/db.bids
         Returns bid result with success/failure status
         """
         # Import AdminService here to avoid circular imports
@@ -416,92 +646,83 @@ class AuctionEngine:
             if not auction_data:
                 return {"success": False, "error": "Auction not active"}
             
+            lot_state = self.lot_states.get(auction_id)
+            if not lot_state or lot_state.lot_id != lot_id:
+                return {"success": False, "error": "Lot is not open for bidding"}
+            
             league_id = auction_data["league_id"]
+            settings = auction_data["settings"]
             
-            # GUARDRAIL 1: Validate budget constraints
-            budget_valid, budget_error = await AdminService.validate_budget_constraint(
-                bidder_id, league_id, amount
+            # GUARDRAIL 1: Reserve-aware max bid (covers budget and roster capacity)
+            budget_valid, budget_error = await AdminService.validate_max_bid(
+                bidder_id, league_id, amount, settings["min_increment"]
             )
             if not budget_valid:
                 return {"success": False, "error": budget_error}
             
-            # GUARDRAIL 2: Validate roster capacity constraints  
-            capacity_valid, capacity_error = await AdminService.validate_roster_capacity(
-                bidder_id, league_id
-            )
-            if not capacity_valid:
-                return {"success": False, "error": capacity_error}
-            
-            # GUARDRAIL 3: Use atomic simultaneous bid handling
-            success, message, bid_id = await AdminService.handle_simultaneous_bids(
-                lot_id, bidder_id, amount
-            )
-            
-            if not success:
-                return {"success": False, "error": message}
-            
-            # Get updated lot state
-            lot = await db.lots.find_one({"_id": lot_id})
-            if not lot:
-                return {"success": False, "error": "Lot not found"}
-            
-            # Anti-snipe logic with server-authoritative timing (deterministic in test mode)
-            current_time = now()  # Use time provider for deterministic testing
-            if lot.get("timer_ends_at"):
-                end_time = lot["timer_ends_at"]
-                if isinstance(end_time, str):
-                    end_time = datetime.fromisoformat(end_time.replace('Z', '+00:00'))
+            # GUARDRAIL 2: Serialize bids on this lot through its in-memory lock
+            async with lot_state.lock:
+                bid_valid, bid_error = lot_state.validate_bid(amount, settings["min_increment"])
+                if not bid_valid:
+                    return {"success": False, "error": bid_error}
                 
-                seconds_remaining = (end_time - current_time).total_seconds()
-                # Use auction-specific anti-snipe seconds from settings
-                anti_snipe_threshold = auction_data["settings"]["anti_snipe_seconds"]
+                # Anti-snipe logic with server-authoritative timing (deterministic in test mode)
+                current_time = now()  # Use time provider for deterministic testing
+                lot_state.apply_bid(bidder_id, amount)
                 
-                if seconds_remaining < anti_snipe_threshold:
-                    # GUARDRAIL 3: Server-authoritative timer extension (deterministic)
-                    # Extend to now + (threshold * 2) for deterministic behavior
-                    extension_seconds = anti_snipe_threshold * 2
-                    new_end_time = current_time + timedelta(seconds=extension_seconds)
-                    
-                    # Log the extension event for deterministic testing
-                    logger.info(f"🕐 ANTI-SNIPE EXTEND: lot_id={lot_id}, threshold={anti_snipe_threshold}s, "
-                               f"remaining={seconds_remaining:.1f}s, extended_by={extension_seconds}s, "
-                               f"new_end={new_end_time.isoformat()}")
-                    timer_valid, timer_error = await AdminService.validate_timer_monotonicity(
-                        auction_id, new_end_time
-                    )
+                new_end_time = None
+                if lot_state.timer_ends_at:
+                    seconds_remaining = (lot_state.timer_ends_at - current_time).total_seconds()
+                    # Use auction-specific anti-snipe seconds from settings
+                    anti_snipe_threshold = settings["anti_snipe_seconds"]
                     
-                    if timer_valid:
-                        # Atomically update timer - only server can do this
-                        await db.lots.update_one(
-                            {"_id": lot_id},
-                            {"$set": {"timer_ends_at": new_end_time}}
-                        )
+                    if seconds_remaining < anti_snipe_threshold:
+                        # GUARDRAIL 3: Server-authoritative timer extension (deterministic)
+                        # Extend to now + (threshold * 2) for deterministic behavior
+                        extension_seconds = anti_snipe_threshold * 2
+                        new_end_time = current_time + timedelta(seconds=extension_seconds)
                         
-                        # Cancel and restart timer
-                        if lot_id in self.auction_timers:
-                            self.auction_timers[lot_id].cancel()
-                            self.auction_timers[lot_id] = asyncio.create_task(
-                                self._lot_timer(auction_id, lot_id, new_end_time)
-                            )
+                        # Log the extension event for deterministic testing
+                        logger.info(f"🕐 ANTI-SNIPE EXTEND: lot_id={lot_id}, threshold={anti_snipe_threshold}s, "
+                                   f"remaining={seconds_remaining:.1f}s, extended_by={extension_seconds}s, "
+                                   f"new_end={new_end_time.isoformat()}")
+                        timer_valid, timer_error = await AdminService.validate_timer_monotonicity(
+                            auction_id, new_end_time
+                        )
                         
-                        logger.info(f"Server-authoritative anti-snipe: Timer extended for lot {lot_id} to {new_end_time}")
-                    else:
-                        logger.warning(f"Timer extension failed: {timer_error}")
+                        if timer_valid:
+                            # Only the server moves the timer; an extended lot reopens
+                            lot_state.timer_ends_at = new_end_time
+                            lot_state.status = "open"
+                            logger.info(f"Server-authoritative anti-snipe: Timer extended for lot {lot_id} to {new_end_time}")
+                        else:
+                            new_end_time = None
+                            logger.warning(f"Timer extension failed: {timer_error}")
+                
+                bid = build_bid_document(lot_id, auction_id, league_id, bidder_id, amount, current_time)
+                self.write_behind.record_bid(bid)
+                self.write_behind.record_lot(lot_id, lot_state.persisted_fields())
+                
+                result = {
+                    "success": True,
+                    "lot_id": lot_id,
+                    "amount": amount,
+                    "bidder_id": bidder_id,
+                    "current_bid": lot_state.current_bid,
+                    "leading_bidder_id": lot_state.leading_bidder_id,
+                    "bid_id": bid["_id"]
+                }
+            
+            # Move the lot deadline back; no task churn on extension
+            if new_end_time:
+                self._schedule_lot_timer(auction_id, lot_id, new_end_time)
             
             # Broadcast real-time update with latest server state
-            await self._broadcast_lot_update(auction_id, lot_id)
+            await self._broadcast_lot_delta(auction_id, lot_id)
             
             logger.info(f"Bid placed: {bidder_id} bid {amount} on lot {lot_id}")
             
-            return {
-                "success": True,
-                "lot_id": lot_id,
-                "amount": amount,
-                "bidder_id": bidder_id,
-                "current_bid": lot["current_bid"],
-                "leading_bidder_id": lot["leading_bidder_id"],
-                "bid_id": bid_id
-            }
+            return result
                     
         except Exception as e:
             logger.error(f"Bid placement failed: {e}")
@@ -542,10 +763,15 @@ class AuctionEngine:
                 {"_id": auction_id},
                 {"$set": {"status": "paused"}}
             )
+            get_snapshot_cache().invalidate(auction_id)
+            
+            if auction_id in self.active_auctions:
+                self.active_auctions[auction_id]["paused"] = True
             
-            # Cancel all timers
-            for lot_id, timer_task in self.auction_timers.items():
-                timer_task.cancel()
+            # Cancel this auction's lot deadline
+            lot_state = self.lot_states.get(auction_id)
+            if lot_state:
+                self.scheduler.cancel(self._lot_timer_key(lot_state.lot_id))
             
             # Broadcast pause
             await self.sio.emit('auction_paused', {
@@ -576,17 +802,28 @@ class AuctionEngine:
                 {"_id": auction_id},
                 {"$set": {"status": "live"}}
             )
+            get_snapshot_cache().invalidate(auction_id)
             
-            # Restart current lot timer if exists
-            current_lot = await db.lots.find_one({
-                "auction_id": auction_id,
-                "status": "open"
-            })
-            
-            if current_lot and current_lot.get("timer_ends_at"):
-                self.auction_timers[current_lot["_id"]] = asyncio.create_task(
-                    self._lot_timer(auction_id, current_lot["_id"], current_lot["timer_ends_at"])
-                )
+            if auction_id in self.active_auctions:
+                self.active_auctions[auction_id]["paused"] = False
+                # Resync clients promptly
+                if auction_id in self.time_sync_due:
+                    self.time_sync_due[auction_id] = now_ms()
+                    self.time_sync_wakeup.set()
+            
+            # Restart current lot timer from in-memory state, falling back to the database
+            lot_state = self.lot_states.get(auction_id)
+            if lot_state is None:
+                current_lot = await db.lots.find_one({
+                    "auction_id": auction_id,
+                    "status": {"$in": list(BIDDABLE_STATUSES)}
+                })
+                if current_lot:
+                    lot_state = LiveLotState.from_document(current_lot)
+                    self.lot_states[auction_id] = lot_state
+            
+            if lot_state:
+                self._resume_lot_timer(auction_id, lot_state)
             
             # Broadcast resume
             await self.sio.emit('auction_resumed', {
@@ -609,6 +846,7 @@ class AuctionEngine:
                 {"_id": auction_id},
                 {"$set": {"status": "completed"}}
             )
+            get_snapshot_cache().invalidate(auction_id)
             
             # Update league status
             if auction_id in self.active_auctions:
@@ -617,16 +855,19 @@ class AuctionEngine:
                     {"_id": league_id},
                     {"$set": {"status": "completed"}}
                 )
+                await get_budget_ledger().verify_league(league_id)
             
-            # Cancel all timers
-            auction_timers_to_cancel = [
-                timer_task for lot_id, timer_task in self.auction_timers.items()
-                if lot_id.startswith(auction_id)
-            ]
-            for timer_task in auction_timers_to_cancel:
-                timer_task.cancel()
+            # Cancel the current lot deadline and persist any outstanding bids
+            lot_state = self.lot_states.pop(auction_id, None)
+            if lot_state:
+                self.scheduler.cancel(self._lot_timer_key(lot_state.lot_id))
+            try:
+                await self.write_behind.flush()
+            except WriteBehindError as e:
+                logger.warning(f"Ending auction {auction_id} with writes still queued: {e}")
             
             # Clean up
+            await self.stop_time_sync(auction_id)
             if auction_id in self.active_auctions:
                 del self.active_auctions[auction_id]
             
@@ -641,58 +882,136 @@ class AuctionEngine:
         except Exception as e:
             logger.error(f"Failed to end auction: {e}")
     
+    async def _get_club_display(self, club_id: str) -> Optional[Dict]:
+        """Club display block, cached for the life of the engine"""
+        club = self.club_cache.get(club_id)
+        if club is None:
+            doc = await db.clubs.find_one({"_id": club_id})
+            if not doc:
+                return None
+            club = {
+                "id": doc["_id"],
+                "name": doc["name"],
+                "short_name": doc["short_name"],
+                "country": doc["country"]
+            }
+            self.club_cache[club_id] = club
+        return club
+    
+    async def _get_user_display(self, user_id: Optional[str]) -> Optional[Dict]:
+        """Bidder display block, cached for the life of the engine"""
+        if not user_id:
+            return None
+        user = self.user_cache.get(user_id)
+        if user is None:
+            doc = await db.users.find_one({"_id": user_id}, {"display_name": 1})
+            if not doc:
+                return None
+            user = {"id": doc["_id"], "display_name": doc["display_name"]}
+            self.user_cache[user_id] = user
+        return user
+    
+    def invalidate_user_display(self, user_id: str):
+        """Drop a cached display name after a profile change"""
+        self.user_cache.pop(user_id, None)
+    
+    async def _build_lot_payload(self, auction_id: str, lot_id: str) -> Optional[Dict]:
+        """Full lot block, from in-memory state while live and the database otherwise"""
+        lot_state = self.lot_states.get(auction_id)
+        if lot_state and lot_state.lot_id == lot_id:
+            lot = lot_state.to_dict()
+            seq = lot_state.seq
+        else:
+            lot = await db.lots.find_one({"_id": lot_id})
+            if not lot:
+                return None
+            seq = None
+        
+        timer_ends_at = lot.get("timer_ends_at")
+        return {
+            "id": lot["_id"],
+            "club": await self._get_club_display(lot["club_id"]),
+            "status": lot["status"],
+            "current_bid": lot.get("current_bid", 0),
+            "top_bidder": await self._get_user_display(
+                lot.get("top_bidder_id") or lot.get("leading_bidder_id")
+            ),
+            "timer_ends_at": timer_ends_at.isoformat() if timer_ends_at else None,
+            "order_index": lot.get("order_index", 0),
+            "seq": seq
+        }
+    
     async def _broadcast_lot_update(self, auction_id: str, lot_id: str):
-        """Broadcast lot state to all connected clients"""
+        """Broadcast full lot state to all connected clients (lot open/close)"""
         try:
-            # Get current lot with club details
-            pipeline = [
-                {"$match": {"_id": lot_id}},
-                {"$lookup": {
-                    "from": "clubs",
-                    "localField": "club_id",
-                    "foreignField": "_id",
-                    "as": "club"
-                }},
-                {"$unwind": "$club"}
-            ]
+            lot = await self._build_lot_payload(auction_id, lot_id)
+            if not lot:
+                return
+            
+            await self.sio.emit('lot_update', {
+                "auction_id": auction_id,
+                "lot": lot
+            }, room=f"auction_{auction_id}")
             
-            lots = await db.lots.aggregate(pipeline).to_list(1)
-            if not lots:
+        except Exception as e:
+            logger.error(f"Failed to broadcast lot update: {e}")
+    
+    async def _broadcast_lot_delta(self, auction_id: str, lot_id: str):
+        """Broadcast only the fields that change while a lot is live"""
+        try:
+            lot_state = self.lot_states.get(auction_id)
+            if not lot_state or lot_state.lot_id != lot_id:
+                # Lot is no longer live; fall back to a full update
+                await self._broadcast_lot_update(auction_id, lot_id)
                 return
             
-            lot = lots[0]
+            leader = await self._get_user_display(lot_state.leading_bidder_id)
+            await self.sio.emit('lot_delta', {
+                "auction_id": auction_id,
+                "lot_id": lot_id,
+                "seq": lot_state.next_seq(),
+                "current_bid": lot_state.current_bid,
+                "leader_id": lot_state.leading_bidder_id,
+                "leader_name": leader["display_name"] if leader else None,
+                "timer_ends_at": lot_state.timer_ends_at.isoformat() if lot_state.timer_ends_at else None,
+                "status": lot_state.status
+            }, room=f"auction_{auction_id}")
             
-            # Get top bidder details if exists
-            top_bidder = None
-            if lot.get("top_bidder_id"):
-                bidder = await db.users.find_one({"_id": lot["top_bidder_id"]})
-                if bidder:
-                    top_bidder = {
-                        "id": bidder["_id"],
-                        "display_name": bidder["display_name"]
-                    }
+        except Exception as e:
+            logger.error(f"Failed to broadcast lot delta: {e}")
+    
+    async def _broadcast_manager_budget(self, auction_id: str, league_id: str, user_id: str):
+        """Publish a manager's new budget and max bid after a sale"""
+        try:
+            ledger = await get_budget_ledger().get(league_id, user_id)
+            if not ledger:
+                return
             
-            # Broadcast update
-            await self.sio.emit('lot_update', {
+            min_increment = self.active_auctions[auction_id]["settings"]["min_increment"]
+            await self.sio.emit('manager_budget', {
                 "auction_id": auction_id,
-                "lot": {
-                    "id": lot["_id"],
-                    "club": {
-                        "id": lot["club"]["_id"],
-                        "name": lot["club"]["name"],
-                        "short_name": lot["club"]["short_name"],
-                        "country": lot["club"]["country"]
-                    },
-                    "status": lot["status"],
-                    "current_bid": lot["current_bid"],
-                    "top_bidder": top_bidder,
-                    "timer_ends_at": lot.get("timer_ends_at").isoformat() if lot.get("timer_ends_at") else None,
-                    "order_index": lot["order_index"]
-                }
+                **ledger.to_dict(min_increment)
             }, room=f"auction_{auction_id}")
             
         except Exception as e:
-            logger.error(f"Failed to broadcast lot update: {e}")
+            logger.error(f"Failed to broadcast manager budget: {e}")
+    
+    async def send_lot_snapshot(self, auction_id: str, sid: str):
+        """Send the full current lot to one client on join or resync"""
+        try:
+            lot_state = self.lot_states.get(auction_id)
+            if not lot_state:
+                return
+            
+            lot = await self._build_lot_payload(auction_id, lot_state.lot_id)
+            if lot:
+                await self.sio.emit('lot_update', {
+                    "auction_id": auction_id,
+                    "lot": lot
+                }, to=sid)
+                
+        except Exception as e:
+            logger.error(f"Failed to send lot snapshot: {e}")
     
     async def get_auction_state(self, auction_id: str) -> Optional[Dict]:
         """Get current auction state for clients"""
@@ -701,10 +1020,14 @@ class AuctionEngine:
                 return None
             
             # Get current lot
-            current_lot = await db.lots.find_one({
-                "auction_id": auction_id,
-                "status": {"$in": ["open", "going_once", "going_twice"]}
-            })
+            lot_state = self.lot_states.get(auction_id)
+            if lot_state:
+                current_lot = lot_state.to_dict()
+            else:
+                current_lot = await db.lots.find_one({
+                    "auction_id": auction_id,
+                    "status": {"$in": list(BIDDABLE_STATUSES)}
+                })
             
             # Get league members with budgets
             league_id = self.active_auctions[auction_id]["league_id"]
@@ -726,6 +1049,13 @@ class AuctionEngine:
             ]
             rosters = await db.rosters.aggregate(pipeline).to_list(length=None)
             
+            # Reserve-aware max bid per manager, from the in-memory ledger
+            ledger = get_budget_ledger()
+            min_increment = self.active_auctions[auction_id]["settings"]["min_increment"]
+            for roster in rosters:
+                entry = await ledger.get(league_id, roster["user_id"])
+                roster["max_bid"] = entry.max_bid(min_increment) if entry else 0
+            
             return {
                 "auction_id": auction_id,
                 "league_id": league_id,
@@ -3,14 +3,17 @@ from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from jose import JWTError, jwt
 from passlib.context import CryptContext
 from datetime import datetime, timedelta, timezone
-from typing import Optional
+from typing import Dict, Optional, Set, Tuple
+from collections import OrderedDict
 import os
 import secrets
 import smtplib
 import logging
+import time
 
 from models import User, UserResponse
 from database import db
+from membership_cache import get_membership_cache
 
 logger = logging.getLogger(__name__)
 
@@ -20,6 +23,10 @@ ALGORITHM = "HS256"
 MAGIC_LINK_EXPIRE_MINUTES = 15
 ACCESS_TOKEN_EXPIRE_MINUTES = 24 * 60  # 24 hours
 
+# Resolved principals are cached per token to skip the users lookup on every request
+PRINCIPAL_CACHE_SIZE = int(os.environ.get('PRINCIPAL_CACHE_SIZE', '10000'))
+PRINCIPAL_CACHE_TTL_SECONDS = float(os.environ.get('PRINCIPAL_CACHE_TTL_SECONDS', '60'))
+
 # Email configuration (for development, we'll log the magic links)
 SMTP_SERVER = os.environ.get('SMTP_SERVER', '')
 SMTP_PORT = int(os.environ.get('SMTP_PORT', '587'))
@@ -79,6 +86,93 @@ async def send_magic_link_email(email: str, token: str):
     print(f"   {magic_link}\n")
     return
 
+class PrincipalCache:
+    """
+    Bounded LRU of access token -> UserResponse
+    Entries expire after PRINCIPAL_CACHE_TTL_SECONDS or at the token's own
+    expiry, whichever is sooner. Profile and verification changes must call
+    invalidate_principal() so stale principals are not served.
+    """
+    
+    def __init__(self, max_size: int = PRINCIPAL_CACHE_SIZE, ttl_seconds: float = PRINCIPAL_CACHE_TTL_SECONDS):
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[str, Tuple[UserResponse, float]]" = OrderedDict()
+        self._tokens_by_user: Dict[str, Set[str]] = {}
+    
+    def get(self, token: str) -> Optional[UserResponse]:
+        entry = self._entries.get(token)
+        if entry is None:
+            return None
+        user, expires_at = entry
+        if time.time() >= expires_at:
+            self._discard(token)
+            return None
+        self._entries.move_to_end(token)
+        return user
+    
+    def put(self, token: str, user: UserResponse, token_exp: Optional[float] = None):
+        expires_at = time.time() + self.ttl_seconds
+        if token_exp is not None:
+            expires_at = min(expires_at, token_exp)
+        self._entries[token] = (user, expires_at)
+        self._entries.move_to_end(token)
+        self._tokens_by_user.setdefault(user.id, set()).add(token)
+        while len(self._entries) > self.max_size:
+            self._discard(next(iter(self._entries)))
+    
+    def _discard(self, token: str):
+        entry = self._entries.pop(token, None)
+        if entry is None:
+            return
+        tokens = self._tokens_by_user.get(entry[0].id)
+        if tokens is not None:
+            tokens.discard(token)
+            if not tokens:
+                del self._tokens_by_user[entry[0].id]
+    
+    def invalidate_user(self, user_id: str):
+        for token in list(self._tokens_by_user.get(user_id, ())):
+            self._discard(token)
+    
+    def clear(self):
+        self._entries.clear()
+        self._tokens_by_user.clear()
+
+principal_cache = PrincipalCache()
+
+def invalidate_principal(user_id: str):
+    """Drop cached principals for a user after their profile or verification changes"""
+    principal_cache.invalidate_user(user_id)
+
+async def resolve_principal(token: str) -> Optional[UserResponse]:
+    """Resolve an access token to its user, or None if the token or user is invalid"""
+    user = principal_cache.get(token)
+    if user is not None:
+        return user
+    
+    try:
+        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+    except JWTError:
+        return None
+    user_id: str = payload.get("sub")
+    if user_id is None:
+        return None
+    
+    user = await db.users.find_one({"_id": user_id})
+    if user is None:
+        return None
+    
+    principal = UserResponse(
+        id=user["_id"],
+        email=user["email"],
+        display_name=user["display_name"],
+        verified=user["verified"],
+        created_at=user["created_at"]
+    )
+    principal_cache.put(token, principal, payload.get("exp"))
+    return principal
+
 async def get_current_user(request: Request, credentials: HTTPAuthorizationCredentials = Depends(security)) -> UserResponse:
     """Get current authenticated user from Bearer token or cookie"""
     credentials_exception = HTTPException(
@@ -98,25 +192,11 @@ async def get_current_user(request: Request, credentials: HTTPAuthorizationCrede
     if not token:
         raise credentials_exception
     
-    try:
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-        user_id: str = payload.get("sub")
-        if user_id is None:
-            raise credentials_exception
-    except JWTError:
-        raise credentials_exception
-    
-    user = await db.users.find_one({"_id": user_id})
+    user = await resolve_principal(token)
     if user is None:
         raise credentials_exception
     
-    return UserResponse(
-        id=user["_id"],
-        email=user["email"],
-        display_name=user["display_name"],
-        verified=user["verified"],
-        created_at=user["created_at"]
-    )
+    return user
 
 async def get_current_verified_user(current_user: UserResponse = Depends(get_current_user)) -> UserResponse:
     """Get current authenticated and verified user"""
@@ -130,11 +210,7 @@ async def get_current_verified_user(current_user: UserResponse = Depends(get_cur
 # Access control helpers
 async def check_league_access(user_id: str, league_id: str) -> Optional[str]:
     """Check if user has access to league and return their role"""
-    membership = await db.league_memberships.find_one({
-        "league_id": league_id,
-        "user_id": user_id
-    })
-    return membership["role"] if membership else None
+    return await get_membership_cache().get_role(league_id, user_id)
 
 async def require_league_access(user_id: str, league_id: str) -> str:
     """Require league access and return role"""
@@ -0,0 +1,573 @@
+#!/usr/bin/env python3
+"""
+Auction Engine Bid-Path Benchmark
+Replays synthetic bidding wars (N auctions x M bidders x K bids/s) against AuctionEngine
+and reports bid latency, throughput and database operations per bid
+
+Runs against an in-memory MongoDB stand-in by default, or a local mongod with --mongo-url.
+Time is driven through the deterministic time provider, so runs are reproducible.
+Latencies are wall-clock under the replayed concurrency, so they include event-loop queueing.
+
+Usage:
+    python bench_auction_engine.py --auctions 20 --bidders 8 --rate 10 --duration 30
+    python bench_auction_engine.py --mongo-url mongodb://localhost:27017 --json
+"""
+
+import os
+
+# Deterministic time must be enabled before the engine modules import the time provider
+os.environ.setdefault("TEST_MODE", "true")
+os.environ.setdefault("NEXT_LOT_DELAY_SECONDS", "0")
+
+import argparse
+import asyncio
+import json
+import random
+import sys
+import time
+import uuid
+from collections import Counter
+from contextlib import ExitStack
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+from unittest.mock import patch
+
+# Add backend to path
+sys.path.append(str(Path(__file__).parent))
+
+import database
+from time_provider import time_provider
+from auction_engine import AuctionEngine
+
+# Modules that bind `db` at import time and are on the bid or lot close path
+DB_MODULES = (
+    "auction_engine", "lot_state", "admin_service", "budget_ledger",
+    "snapshot_service", "cache_generations", "membership_cache", "audit_service",
+    # Imported through admin_service; off the hot path but must not touch a real server
+    "scoring_service", "scoring_leases", "rescoring_service", "matchday_calendar"
+)
+
+_MISSING = object()
+
+# ---------------------------------------------------------------------------
+# In-memory MongoDB stand-in
+# ---------------------------------------------------------------------------
+
+def _get_field(doc: Dict, path: str):
+    value: Any = doc
+    for part in path.split("."):
+        if not isinstance(value, dict) or part not in value:
+            return _MISSING
+        value = value[part]
+    return value
+
+def _match_value(value, condition) -> bool:
+    if isinstance(condition, dict) and condition and all(k.startswith("$") for k in condition):
+        for op, arg in condition.items():
+            if op == "$in":
+                candidates = value if isinstance(value, list) else [None if value is _MISSING else value]
+                if not any(c in arg for c in candidates):
+                    return False
+            elif op == "$nin":
+                if value is not _MISSING and value in arg:
+                    return False
+            elif op == "$ne":
+                if value is not _MISSING and value == arg:
+                    return False
+            elif op == "$exists":
+                if (value is not _MISSING) != bool(arg):
+                    return False
+            elif op == "$size":
+                if not isinstance(value, list) or len(value) != arg:
+                    return False
+            elif op in ("$gt", "$gte", "$lt", "$lte"):
+                if value is _MISSING or value is None:
+                    return False
+                if op == "$gt" and not value > arg:
+                    return False
+                if op == "$gte" and not value >= arg:
+                    return False
+                if op == "$lt" and not value < arg:
+                    return False
+                if op == "$lte" and not value <= arg:
+                    return False
+            else:
+                raise NotImplementedError(f"Query operator {op} not supported by the benchmark store")
+        return True
+
+    if value is _MISSING:
+        return condition is None
+    if isinstance(value, list) and not isinstance(condition, list):
+        return condition in value
+    return value == condition
+
+def matches(doc: Dict, query: Optional[Dict]) -> bool:
+    """Evaluate the subset of MongoDB query syntax used on the bid path"""
+    for key, condition in (query or {}).items():
+        if key == "$or":
+            if not any(matches(doc, sub) for sub in condition):
+                return False
+        elif key == "$and":
+            if not all(matches(doc, sub) for sub in condition):
+                return False
+        elif not _match_value(_get_field(doc, key), condition):
+            return False
+    return True
+
+def apply_update(doc: Dict, update: Dict):
+    for op, fields in update.items():
+        if op in ("$set", "$setOnInsert"):
+            doc.update(fields)
+        elif op == "$inc":
+            for key, amount in fields.items():
+                doc[key] = doc.get(key, 0) + amount
+        elif op == "$unset":
+            for key in fields:
+                doc.pop(key, None)
+        else:
+            raise NotImplementedError(f"Update operator {op} not supported by the benchmark store")
+
+class FakeCursor:
+    def __init__(self, docs: List[Dict]):
+        self._docs = docs
+
+    def sort(self, key, direction=1):
+        keys = key if isinstance(key, list) else [(key, direction)]
+        for field, order in reversed(keys):
+            self._docs.sort(key=lambda d: d.get(field), reverse=order < 0)
+        return self
+
+    def limit(self, n: int):
+        if n:
+            self._docs = self._docs[:n]
+        return self
+
+    def batch_size(self, n: int):
+        return self
+
+    async def to_list(self, length=None):
+        return list(self._docs if length is None else self._docs[:length])
+
+    def __aiter__(self):
+        self._iter = iter(self._docs)
+        return self
+
+    async def __anext__(self):
+        try:
+            return next(self._iter)
+        except StopIteration:
+            raise StopAsyncIteration
+
+class FakeCollection:
+    def __init__(self, name: str, ops: Counter):
+        self.name = name
+        self.ops = ops
+        self.docs: Dict[Any, Dict] = {}
+
+    async def _count(self, op: str):
+        self.ops[f"{self.name}.{op}"] += 1
+        # Yield like a real driver round-trip so concurrent bids interleave
+        await asyncio.sleep(0)
+
+    def _find(self, query: Optional[Dict]) -> List[Dict]:
+        if query and set(query) == {"_id"} and not isinstance(query["_id"], dict):
+            doc = self.docs.get(query["_id"])
+            return [doc] if doc else []
+        return [doc for doc in self.docs.values() if matches(doc, query)]
+
+    @staticmethod
+    def _project(doc: Dict, projection: Optional[Dict]) -> Dict:
+        if not projection:
+            return dict(doc)
+        # Dotted paths project their whole top-level field
+        roots = {k.split(".")[0] for k, v in projection.items() if v}
+        projected = {k: doc[k] for k in roots if k in doc}
+        projected["_id"] = doc["_id"]
+        return projected
+
+    async def find_one(self, query=None, projection=None, sort=None, session=None):
+        await self._count("find_one")
+        docs = self._find(query)
+        if sort:
+            docs = FakeCursor(docs).sort(sort)._docs
+        return self._project(docs[0], projection) if docs else None
+
+    def find(self, query=None, projection=None, session=None):
+        self.ops[f"{self.name}.find"] += 1
+        return FakeCursor([self._project(d, projection) for d in self._find(query)])
+
+    async def count_documents(self, query, session=None):
+        await self._count("count_documents")
+        return len(self._find(query))
+
+    async def insert_one(self, doc, session=None):
+        await self._count("insert_one")
+        doc.setdefault("_id", str(uuid.uuid4()))
+        self.docs[doc["_id"]] = dict(doc)
+
+    async def insert_many(self, docs, ordered=True, session=None):
+        await self._count("insert_many")
+        for doc in docs:
+            doc.setdefault("_id", str(uuid.uuid4()))
+            self.docs[doc["_id"]] = dict(doc)
+
+    async def update_one(self, query, update, upsert=False, session=None):
+        await self._count("update_one")
+        self._update(query, update, upsert, many=False)
+
+    async def update_many(self, query, update, upsert=False, session=None):
+        await self._count("update_many")
+        self._update(query, update, upsert, many=True)
+
+    def _update(self, query, update, upsert, many):
+        docs = self._find(query)
+        if not docs and upsert:
+            doc = {k: v for k, v in query.items() if not k.startswith("$") and not isinstance(v, dict)}
+            doc.setdefault("_id", str(uuid.uuid4()))
+            self.docs[doc["_id"]] = doc
+            docs = [doc]
+        for doc in docs if many else docs[:1]:
+            apply_update(doc, update)
+
+    def aggregate(self, pipeline, session=None):
+        """$match and single-key $group with $sum accumulators only"""
+        self.ops[f"{self.name}.aggregate"] += 1
+        docs = list(self.docs.values())
+        for stage in pipeline:
+            if "$match" in stage:
+                docs = [d for d in docs if matches(d, stage["$match"])]
+            elif "$group" in stage:
+                spec = stage["$group"]
+                groups: Dict[Any, Dict] = {}
+                for doc in docs:
+                    key = _get_field(doc, spec["_id"][1:]) if isinstance(spec["_id"], str) else spec["_id"]
+                    group = groups.setdefault(key, {"_id": key})
+                    for name, acc in spec.items():
+                        if name == "_id":
+                            continue
+                        value = acc["$sum"]
+                        if isinstance(value, str):
+                            value = _get_field(doc, value[1:])
+                        group[name] = group.get(name, 0) + value
+                docs = list(groups.values())
+            else:
+                raise NotImplementedError(f"Aggregation stage {list(stage)} not supported by the benchmark store")
+        return FakeCursor(docs)
+
+    async def bulk_write(self, operations, ordered=True, session=None):
+        await self._count("bulk_write")
+        for op in operations:
+            self._update(op._filter, op._doc, getattr(op, "_upsert", False), many=False)
+
+class FakeSession:
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    def start_transaction(self):
+        return self
+
+    async def abort_transaction(self):
+        pass
+
+class FakeClient:
+    async def start_session(self):
+        return FakeSession()
+
+class FakeDatabase:
+    """Dict-backed stand-in for the motor database, counting every operation"""
+
+    def __init__(self):
+        self.ops: Counter = Counter()
+        self.client = FakeClient()
+        self._collections: Dict[str, FakeCollection] = {}
+
+    def __getattr__(self, name: str) -> FakeCollection:
+        if name.startswith("_"):
+            raise AttributeError(name)
+        if name not in self._collections:
+            self._collections[name] = FakeCollection(name, self.ops)
+        return self._collections[name]
+
+    def __getitem__(self, name: str) -> FakeCollection:
+        return getattr(self, name)
+
+# ---------------------------------------------------------------------------
+# Socket.IO stand-in
+# ---------------------------------------------------------------------------
+
+class CountingSocketServer:
+    """Records emitted events and their JSON payload size"""
+
+    def __init__(self):
+        self.events: Counter = Counter()
+        self.bytes: Counter = Counter()
+
+    async def emit(self, event, data=None, room=None, to=None, **kwargs):
+        self.events[event] += 1
+        self.bytes[event] += len(json.dumps(data, default=str))
+
+# ---------------------------------------------------------------------------
+# Benchmark
+# ---------------------------------------------------------------------------
+
+def percentile(samples: List[float], pct: float) -> float:
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, max(0, int(round(pct / 100 * (len(ordered) - 1)))))
+    return ordered[index]
+
+def timed(samples: List[float], func):
+    """Wrap an engine coroutine method to record its wall-clock latency in ms"""
+    async def wrapper(*args, **kwargs):
+        start = time.perf_counter()
+        try:
+            return await func(*args, **kwargs)
+        finally:
+            samples.append((time.perf_counter() - start) * 1000)
+    return wrapper
+
+async def seed(db, auctions: int, bidders: int, clubs: int) -> List[Dict]:
+    """Create clubs, leagues, rosters and auctions ready to start"""
+    created_at = datetime.now(timezone.utc)
+    await db.clubs.insert_many([
+        {"_id": f"club_{i:05d}", "name": f"Club {i}", "short_name": f"C{i}", "country": "Benchland", "ext_ref": f"BENCH-{i}"}
+        for i in range(clubs)
+    ])
+
+    setups = []
+    for a in range(auctions):
+        league_id = f"league_{a}"
+        auction_id = f"auction_{a}"
+        user_ids = [f"user_{a}_{b}" for b in range(bidders)]
+        await db.users.insert_many([
+            {"_id": user_id, "email": f"{user_id}@bench.local", "display_name": user_id.upper(), "verified": True}
+            for user_id in user_ids
+        ])
+        await db.leagues.insert_one({
+            "_id": league_id,
+            "name": f"Bench League {a}",
+            "competition": "UCL",
+            "commissioner_id": user_ids[0],
+            "status": "ready",
+            "member_count": bidders,
+            "settings": {
+                "club_slots_per_manager": clubs,
+                "league_size": {"min": min(2, bidders), "max": max(2, bidders)}
+            },
+            "created_at": created_at
+        })
+        await db.rosters.insert_many([
+            {"_id": f"roster_{user_id}", "league_id": league_id, "user_id": user_id, "budget_remaining": 10 ** 9, "club_slots": clubs}
+            for user_id in user_ids
+        ])
+        await db.auctions.insert_one({
+            "_id": auction_id,
+            "league_id": league_id,
+            "status": "scheduled",
+            "nomination_order": user_ids,
+            "min_increment": 1,
+            "budget_per_manager": 10 ** 9,
+            "created_at": created_at
+        })
+        setups.append({"auction_id": auction_id, "commissioner_id": user_ids[0], "bidders": user_ids})
+    return setups
+
+async def run_benchmark(args) -> Dict:
+    rng = random.Random(args.seed)
+    sio = CountingSocketServer()
+
+    if args.mongo_url:
+        from motor.motor_asyncio import AsyncIOMotorClient
+        from pymongo import monitoring
+
+        ops: Counter = Counter()
+
+        class OpCounter(monitoring.CommandListener):
+            def started(self, event):
+                collection = event.command.get(event.command_name)
+                ops[f"{collection}.{event.command_name}"] += 1
+
+            def succeeded(self, event):
+                pass
+
+            def failed(self, event):
+                pass
+
+        client = AsyncIOMotorClient(args.mongo_url, event_listeners=[OpCounter()])
+        db_name = f"bench_{uuid.uuid4().hex[:8]}"
+        db = client[db_name]
+    else:
+        db = FakeDatabase()
+        ops = db.ops
+
+    bid_latencies: List[float] = []
+    close_latencies: List[float] = []
+    broadcast_latencies: List[float] = []
+    accepted = rejected = 0
+
+    with ExitStack() as stack:
+        for module in DB_MODULES:
+            stack.enter_context(patch(f"{module}.db", db))
+        # A module left on the real database would block on a connection and stall lot closes
+        unpatched = sorted(
+            name for name, module in list(sys.modules.items())
+            if name != "database" and getattr(module, "db", None) is database.db
+        )
+        if unpatched:
+            raise SystemExit(f"Add to DB_MODULES, still bound to the real database: {', '.join(unpatched)}")
+
+        lots_per_auction = int(args.duration * args.rate / args.bids_per_lot) + 2
+        setups = await seed(db, args.auctions, args.bidders, max(lots_per_auction * 2, 16))
+
+        engine = AuctionEngine(sio)
+        engine._close_lot = timed(close_latencies, engine._close_lot)
+        engine._broadcast_lot_update = timed(broadcast_latencies, engine._broadcast_lot_update)
+        engine._broadcast_lot_delta = timed(broadcast_latencies, engine._broadcast_lot_delta)
+
+        for setup in setups:
+            await engine.start_auction(setup["auction_id"], setup["commissioner_id"])
+
+        # Only the bid phase is measured
+        ops.clear()
+        sio.events.clear()
+        sio.bytes.clear()
+
+        tick_ms = 1000 / args.rate
+        ticks = int(args.duration * args.rate)
+        wall_start = time.perf_counter()
+
+        async def attempt(auction_id: str, bidder_id: str, lot_id: str, amount: int) -> bool:
+            start = time.perf_counter()
+            result = await engine.place_bid(auction_id, lot_id, bidder_id, amount)
+            bid_latencies.append((time.perf_counter() - start) * 1000)
+            return result["success"]
+
+        for _ in range(ticks):
+            attempts = []
+            for setup in setups:
+                lot_state = engine.lot_states.get(setup["auction_id"])
+                if not lot_state or not lot_state.is_biddable or lot_state.bids_count >= args.bids_per_lot:
+                    continue  # War over for this lot; let it close
+                # Bidding war: occasionally several bidders race for the same amount
+                racers = 1 + sum(rng.random() < args.contention for _ in range(args.bidders - 1))
+                amount = lot_state.current_bid + 1
+                for bidder_id in rng.sample(setup["bidders"], racers):
+                    attempts.append(attempt(setup["auction_id"], bidder_id, lot_state.lot_id, amount))
+
+            for ok in await asyncio.gather(*attempts):
+                if ok:
+                    accepted += 1
+                else:
+                    rejected += 1
+
+            # Advance deterministic time and fire due lot deadlines
+            time_provider.advance_time_ms(int(tick_ms))
+            engine.scheduler.run_due()
+            for _ in range(5):
+                await asyncio.sleep(0)
+
+        await engine.write_behind.stop()
+        wall_seconds = time.perf_counter() - wall_start
+
+        for setup in setups:
+            await engine.stop_time_sync(setup["auction_id"])
+        await engine.scheduler.stop()
+
+        if args.mongo_url:
+            await client.drop_database(db_name)
+
+    attempts_total = accepted + rejected
+    total_ops = sum(ops.values())
+    return {
+        "config": {
+            "auctions": args.auctions,
+            "bidders": args.bidders,
+            "rate": args.rate,
+            "duration": args.duration,
+            "bids_per_lot": args.bids_per_lot,
+            "contention": args.contention,
+            "store": "mongod" if args.mongo_url else "memory",
+            "seed": args.seed
+        },
+        "bids": {
+            "attempted": attempts_total,
+            "accepted": accepted,
+            "rejected": rejected,
+            "per_second": round(attempts_total / wall_seconds, 1) if wall_seconds else 0.0
+        },
+        "latency_ms": {
+            "bid_p50": round(percentile(bid_latencies, 50), 3),
+            "bid_p99": round(percentile(bid_latencies, 99), 3),
+            "bid_max": round(max(bid_latencies, default=0.0), 3),
+            "close_p50": round(percentile(close_latencies, 50), 3),
+            "close_p99": round(percentile(close_latencies, 99), 3),
+            "broadcast_p50": round(percentile(broadcast_latencies, 50), 3),
+            "broadcast_p99": round(percentile(broadcast_latencies, 99), 3)
+        },
+        "db": {
+            "ops_total": total_ops,
+            "ops_per_bid": round(total_ops / attempts_total, 3) if attempts_total else 0.0,
+            "by_operation": dict(ops.most_common())
+        },
+        "socket": {
+            "events": dict(sio.events),
+            "bytes_per_bid": round(sum(sio.bytes.values()) / attempts_total, 1) if attempts_total else 0.0
+        },
+        "lots_closed": len(close_latencies),
+        "wall_seconds": round(wall_seconds, 3)
+    }
+
+def print_report(report: Dict):
+    config = report["config"]
+    print(f"\nAuction engine benchmark ({config['store']} store)")
+    print(f"  {config['auctions']} auctions x {config['bidders']} bidders x {config['rate']} bids/s "
+          f"for {config['duration']}s simulated, seed {config['seed']}")
+    print("\nBids")
+    print(f"  attempted {report['bids']['attempted']}  accepted {report['bids']['accepted']}  "
+          f"rejected {report['bids']['rejected']}  throughput {report['bids']['per_second']}/s")
+    print("\nLatency (ms)")
+    for key, value in report["latency_ms"].items():
+        print(f"  {key:<14} {value}")
+    print("\nDatabase")
+    print(f"  ops total {report['db']['ops_total']}  ops/bid {report['db']['ops_per_bid']}")
+    for op, count in report["db"]["by_operation"].items():
+        print(f"  {op:<28} {count}")
+    print("\nSocket.IO")
+    for event, count in report["socket"]["events"].items():
+        print(f"  {event:<14} {count}")
+    print(f"  bytes/bid      {report['socket']['bytes_per_bid']}")
+    print(f"\nLots closed {report['lots_closed']} in {report['wall_seconds']}s wall time")
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the AuctionEngine bid path")
+    parser.add_argument("--auctions", type=int, default=10, help="Concurrent auctions (N)")
+    parser.add_argument("--bidders", type=int, default=8, help="Bidders per auction (M)")
+    parser.add_argument("--rate", type=float, default=10, help="Bid rounds per second per auction (K)")
+    parser.add_argument("--duration", type=float, default=30, help="Simulated seconds to replay")
+    parser.add_argument("--bids-per-lot", type=int, default=15, help="Accepted bids before a lot's war ends")
+    parser.add_argument("--contention", type=float, default=0.2,
+                        help="Chance each other bidder races the same amount in a round")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--mongo-url", default=None, help="Run against a local mongod instead of the in-memory store")
+    parser.add_argument("--json", action="store_true", help="Print the report as JSON")
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    args = parse_args(argv)
+    if not time_provider.is_test_mode:
+        raise SystemExit("TEST_MODE must be enabled for deterministic benchmark time")
+    report = asyncio.run(run_benchmark(args))
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        print_report(report)
+    if report["lots_closed"] == 0:
+        raise SystemExit("No lots closed; the close path is not completing")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,216 @@
+"""
+Budget Ledger
+In-process cache of each manager's budget and club slots for bid guardrails
+"""
+
+import asyncio
+import logging
+from typing import Dict, List, Optional, Tuple
+
+from database import db
+
+logger = logging.getLogger(__name__)
+
+class ManagerLedger:
+    """Budget and slot position for one manager in one league"""
+
+    __slots__ = ("league_id", "user_id", "budget_remaining", "clubs_owned", "max_slots", "version")
+
+    def __init__(
+        self,
+        league_id: str,
+        user_id: str,
+        budget_remaining: int,
+        clubs_owned: int,
+        max_slots: int,
+        version: int = 0
+    ):
+        self.league_id = league_id
+        self.user_id = user_id
+        self.budget_remaining = budget_remaining
+        self.clubs_owned = clubs_owned
+        self.max_slots = max_slots
+        self.version = version  # mirrors rosters.ledger_version
+
+    @property
+    def slots_remaining(self) -> int:
+        return max(0, self.max_slots - self.clubs_owned)
+
+    def max_bid(self, min_increment: int) -> int:
+        """
+        Largest legal bid: the budget minus a minimum-increment reserve for
+        every other empty slot, so the manager can still fill their roster
+        """
+        if self.slots_remaining == 0:
+            return 0
+        return max(0, self.budget_remaining - (self.slots_remaining - 1) * min_increment)
+
+    def to_dict(self, min_increment: Optional[int] = None) -> Dict:
+        data = {
+            "user_id": self.user_id,
+            "budget_remaining": self.budget_remaining,
+            "clubs_owned": self.clubs_owned,
+            "max_slots": self.max_slots,
+            "version": self.version
+        }
+        if min_increment is not None:
+            data["max_bid"] = self.max_bid(min_increment)
+        return data
+
+class BudgetLedger:
+    """
+    Ledger of (league_id, user_id) -> ManagerLedger
+
+    Leagues are loaded on first use with one read per collection. Every write
+    path that changes a roster budget or slot count must also update the
+    ledger, and bumps rosters.ledger_version so drift can be detected.
+    """
+
+    def __init__(self):
+        self._entries: Dict[Tuple[str, str], ManagerLedger] = {}
+        self._loaded_leagues: Dict[str, int] = {}  # league_id -> max slots
+        self._load_locks: Dict[str, asyncio.Lock] = {}
+
+    async def load_league(self, league_id: str, force: bool = False):
+        """Load every manager in a league from the database"""
+        lock = self._load_locks.setdefault(league_id, asyncio.Lock())
+        async with lock:
+            if league_id in self._loaded_leagues and not force:
+                return  # Loaded by a concurrent caller
+
+            league = await db.leagues.find_one(
+                {"_id": league_id}, {"settings.club_slots_per_manager": 1}
+            )
+            if not league:
+                return
+            max_slots = league["settings"]["club_slots_per_manager"]
+
+            rosters = await db.rosters.find(
+                {"league_id": league_id},
+                {"user_id": 1, "budget_remaining": 1, "ledger_version": 1}
+            ).to_list(length=None)
+            owned = await db.roster_clubs.aggregate([
+                {"$match": {"league_id": league_id}},
+                {"$group": {"_id": "$user_id", "clubs_owned": {"$sum": 1}}}
+            ]).to_list(length=None)
+            owned_by_user = {row["_id"]: row["clubs_owned"] for row in owned}
+
+            self.invalidate_league(league_id)
+            for roster in rosters:
+                user_id = roster["user_id"]
+                self._entries[(league_id, user_id)] = ManagerLedger(
+                    league_id=league_id,
+                    user_id=user_id,
+                    budget_remaining=roster["budget_remaining"],
+                    clubs_owned=owned_by_user.get(user_id, 0),
+                    max_slots=max_slots,
+                    version=roster.get("ledger_version", 0)
+                )
+            self._loaded_leagues[league_id] = max_slots
+
+    async def _load_manager(self, league_id: str, user_id: str) -> Optional[ManagerLedger]:
+        """Load a single manager, e.g. one who joined after the league was loaded"""
+        roster = await db.rosters.find_one(
+            {"league_id": league_id, "user_id": user_id},
+            {"budget_remaining": 1, "ledger_version": 1}
+        )
+        if not roster:
+            return None
+
+        clubs_owned = await db.roster_clubs.count_documents({"league_id": league_id, "user_id": user_id})
+        entry = ManagerLedger(
+            league_id=league_id,
+            user_id=user_id,
+            budget_remaining=roster["budget_remaining"],
+            clubs_owned=clubs_owned,
+            max_slots=self._loaded_leagues[league_id],
+            version=roster.get("ledger_version", 0)
+        )
+        self._entries[(league_id, user_id)] = entry
+        return entry
+
+    async def get(self, league_id: str, user_id: str) -> Optional[ManagerLedger]:
+        """Get a manager's ledger entry, loading the league on first use"""
+        entry = self._entries.get((league_id, user_id))
+        if entry is not None:
+            return entry
+
+        if league_id not in self._loaded_leagues:
+            await self.load_league(league_id)
+            entry = self._entries.get((league_id, user_id))
+            if entry is not None or league_id not in self._loaded_leagues:
+                return entry
+
+        return await self._load_manager(league_id, user_id)
+
+    def league_entries(self, league_id: str) -> List[ManagerLedger]:
+        """Loaded entries for a league"""
+        return [entry for (entry_league, _), entry in self._entries.items() if entry_league == league_id]
+
+    def record_sale(self, league_id: str, user_id: str, price: int):
+        """Apply a committed lot sale"""
+        entry = self._entries.get((league_id, user_id))
+        if entry is None:
+            return  # Loaded fresh from the database on next use
+        entry.budget_remaining -= price
+        entry.clubs_owned += 1
+        entry.version += 1
+
+    def apply_settings(self, league_id: str, club_slots: Optional[int] = None, budget: Optional[int] = None):
+        """Apply committed league settings changes"""
+        if league_id not in self._loaded_leagues:
+            return
+        if club_slots is not None:
+            self._loaded_leagues[league_id] = club_slots
+        for entry in self.league_entries(league_id):
+            if club_slots is not None:
+                entry.max_slots = club_slots
+            if budget is not None:
+                entry.budget_remaining = budget
+            entry.version += 1
+
+    def remove_manager(self, league_id: str, user_id: str):
+        """Drop a manager who left or was removed from the league"""
+        self._entries.pop((league_id, user_id), None)
+
+    def invalidate_league(self, league_id: str):
+        """Forget a league so it is reloaded on next use"""
+        for key in [key for key in self._entries if key[0] == league_id]:
+            del self._entries[key]
+        self._loaded_leagues.pop(league_id, None)
+
+    async def verify_league(self, league_id: str) -> List[str]:
+        """
+        Compare loaded entries against the database and reload any that drifted
+        Returns the user ids whose entries were stale
+        """
+        if league_id not in self._loaded_leagues:
+            return []
+
+        rosters = await db.rosters.find(
+            {"league_id": league_id},
+            {"user_id": 1, "budget_remaining": 1, "ledger_version": 1}
+        ).to_list(length=None)
+
+        drifted = []
+        for roster in rosters:
+            entry = self._entries.get((league_id, roster["user_id"]))
+            if entry is None:
+                continue
+            if entry.version != roster.get("ledger_version", 0) or entry.budget_remaining != roster["budget_remaining"]:
+                drifted.append(roster["user_id"])
+
+        if drifted:
+            logger.warning(f"Budget ledger drift in league {league_id} for users {drifted}; reloading")
+            await self.load_league(league_id, force=True)
+        return drifted
+
+# Global budget ledger instance
+budget_ledger: Optional[BudgetLedger] = None
+
+def get_budget_ledger() -> BudgetLedger:
+    """Get global budget ledger, creating it on first use"""
+    global budget_ledger
+    if budget_ledger is None:
+        budget_ledger = BudgetLedger()
+    return budget_ledger
@@ -0,0 +1,53 @@
+"""
+Cache Generations
+Per-league generation counters that invalidate precomputed read models across processes
+"""
+
+import logging
+from typing import Iterable
+
+from pymongo import UpdateOne
+
+from database import db
+
+logger = logging.getLogger(__name__)
+
+# Generation scopes
+FIXTURES = "fixtures"    # Fixtures, results and ownership shown on the fixtures page
+STANDINGS = "standings"  # Points, budgets and members shown on the leaderboard
+MEMBERSHIPS = "memberships"  # League memberships behind access and commissioner checks
+
+class CacheGenerations:
+    """
+    One document per league in `cache_generations`: {_id: league_id, <scope>: int}
+
+    Writers bump a scope after changing data it covers; readers compare the
+    generation a read model was built at with the current one. Counters live
+    in MongoDB so a bump in the scoring worker or another API process is
+    seen everywhere.
+    """
+
+    async def bump(self, league_ids: Iterable[str], *scopes: str):
+        """Advance scopes for these leagues; failures are logged, never raised to the writer"""
+        operations = [
+            UpdateOne({"_id": league_id}, {"$inc": {scope: 1 for scope in scopes}}, upsert=True)
+            for league_id in set(league_ids)
+        ]
+        if not operations:
+            return
+        try:
+            await db.cache_generations.bulk_write(operations, ordered=False)
+        except Exception as e:
+            logger.error(f"Failed to bump {', '.join(scopes)} generations: {e}")
+
+    async def get(self, league_id: str, scope: str) -> int:
+        """Current generation of a scope (0 if never bumped)"""
+        doc = await db.cache_generations.find_one({"_id": league_id}, {scope: 1})
+        return (doc or {}).get(scope, 0)
+
+# Global cache generations instance
+cache_generations = CacheGenerations()
+
+def get_cache_generations() -> CacheGenerations:
+    """Get the cache generations instance"""
+    return cache_generations
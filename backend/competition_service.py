@@ -7,6 +7,7 @@ import logging
 from typing import List, Optional, Dict
 from models import CompetitionProfile, CompetitionProfileResponse, LeagueSettings, LeagueSize, ScoringRulePoints
 from database import db
+from utils.single_flight import single_flight
 
 logger = logging.getLogger(__name__)
 
@@ -14,6 +15,7 @@ class CompetitionService:
     """Service for managing competition profiles and applying defaults"""
     
     @staticmethod
+    @single_flight
     async def get_all_profiles() -> List[CompetitionProfileResponse]:
         """Get all available competition profiles"""
         try:
@@ -33,6 +35,7 @@ class CompetitionService:
             return []
     
     @staticmethod
+    @single_flight
     async def get_profile_by_id(profile_id: str) -> Optional[CompetitionProfileResponse]:
         """Get specific competition profile by ID"""
         try:
@@ -1,5 +1,5 @@
 from motor.motor_asyncio import AsyncIOMotorClient, AsyncIOMotorDatabase
-from pymongo import IndexModel, ASCENDING
+from pymongo import IndexModel, ASCENDING, DESCENDING
 import os
 from dotenv import load_dotenv
 import logging
@@ -170,7 +170,8 @@ SCHEMAS = {
                 "user_id": {"bsonType": "string"},
                 "budget_start": {"bsonType": "int", "minimum": 0},
                 "budget_remaining": {"bsonType": "int", "minimum": 0},
-                "club_slots": {"bsonType": "int", "minimum": 1}
+                "club_slots": {"bsonType": "int", "minimum": 1},
+                "ledger_version": {"bsonType": "int", "minimum": 0}
             }
         }
     },
@@ -203,7 +204,8 @@ SCHEMAS = {
                         "club_win": {"bsonType": "int"},
                         "club_draw": {"bsonType": "int"}
                     }
-                }
+                },
+                "rescore": {"bsonType": "object"}
             }
         }
     },
@@ -219,7 +221,8 @@ SCHEMAS = {
                 "date": {"bsonType": "date"},
                 "home_ext": {"bsonType": "string"},
                 "away_ext": {"bsonType": "string"},
-                "status": {"bsonType": "string"}
+                "status": {"bsonType": "string"},
+                "stage": {"bsonType": ["string", "null"]}
             }
         }
     },
@@ -231,6 +234,7 @@ SCHEMAS = {
                 "_id": {"bsonType": "string"},
                 "league_id": {"bsonType": "string"},
                 "match_id": {"bsonType": "string"},
+                "season": {"bsonType": ["string", "null"]},
                 "home_ext": {"bsonType": "string"},
                 "away_ext": {"bsonType": "string"},
                 "home_goals": {"bsonType": "int", "minimum": 0},
@@ -274,6 +278,49 @@ SCHEMAS = {
                 "created_at": {"bsonType": "date"}
             }
         }
+    },
+    "league_standings": {
+        "$jsonSchema": {
+            "bsonType": "object",
+            "required": ["_id", "league_id", "user_id", "total_points", "matches_played"],
+            "properties": {
+                "_id": {"bsonType": "string"},
+                "league_id": {"bsonType": "string"},
+                "user_id": {"bsonType": "string"},
+                "total_points": {"bsonType": "int"},
+                "matches_played": {"bsonType": "int"},
+                "weekly_breakdown": {"bsonType": "array"},
+                "updated_at": {"bsonType": "date"}
+            }
+        }
+    },
+    "league_matchday_summaries": {
+        "$jsonSchema": {
+            "bsonType": "object",
+            "required": ["_id", "league_id", "matchday", "total_points", "total_matches"],
+            "properties": {
+                "_id": {"bsonType": "string"},
+                "league_id": {"bsonType": "string"},
+                "matchday": {"bsonType": "int"},
+                "total_points": {"bsonType": "int"},
+                "total_matches": {"bsonType": "int"},
+                "managers": {"bsonType": "object"},
+                "updated_at": {"bsonType": "date"}
+            }
+        }
+    },
+    "manager_series": {
+        "$jsonSchema": {
+            "bsonType": "object",
+            "required": ["_id", "league_id", "user_id", "matchdays"],
+            "properties": {
+                "_id": {"bsonType": "string"},
+                "league_id": {"bsonType": "string"},
+                "user_id": {"bsonType": "string"},
+                "matchdays": {"bsonType": "object"},
+                "updated_at": {"bsonType": "date"}
+            }
+        }
     }
 }
 
@@ -334,6 +381,7 @@ INDEXES = {
     ],
     "result_ingest": [
         IndexModel([("processed", ASCENDING)]),
+        IndexModel([("processed", ASCENDING), ("league_id", ASCENDING), ("received_at", ASCENDING)]),
         IndexModel([("league_id", ASCENDING), ("match_id", ASCENDING)]),
         IndexModel([("received_at", ASCENDING)])
     ],
@@ -343,6 +391,16 @@ INDEXES = {
     "weekly_points": [
         IndexModel([("league_id", ASCENDING), ("user_id", ASCENDING), ("match_id", ASCENDING)], unique=True),
         IndexModel([("league_id", ASCENDING), ("bucket.type", ASCENDING), ("bucket.value", ASCENDING)])
+    ],
+    "league_standings": [
+        IndexModel([("league_id", ASCENDING), ("user_id", ASCENDING)], unique=True),
+        IndexModel([("league_id", ASCENDING), ("total_points", DESCENDING)])
+    ],
+    "league_matchday_summaries": [
+        IndexModel([("league_id", ASCENDING), ("matchday", DESCENDING)], unique=True)
+    ],
+    "manager_series": [
+        IndexModel([("league_id", ASCENDING), ("user_id", ASCENDING)], unique=True)
     ]
 }
 
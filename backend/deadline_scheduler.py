@@ -0,0 +1,165 @@
+"""
+Deadline Scheduler
+Single heap-based scheduler that owns every lot and undo deadline in the process
+"""
+
+import asyncio
+import heapq
+import itertools
+import logging
+from datetime import datetime
+from typing import Awaitable, Callable, Dict, List, Optional, Set, Tuple
+
+from time_provider import now_ms
+
+logger = logging.getLogger(__name__)
+
+DeadlineCallback = Callable[[], Awaitable[None]]
+
+# Upper bound on a single wait so controlled test time is picked up promptly
+MAX_WAIT_SECONDS = 1.0
+
+def to_ms(value: datetime) -> int:
+    """Convert a datetime deadline to epoch milliseconds"""
+    return int(value.timestamp() * 1000)
+
+class _Deadline:
+    """Scheduled callback for a key"""
+
+    __slots__ = ("due_ms", "callback", "queued_ms")
+
+    def __init__(self, due_ms: int, callback: DeadlineCallback, queued_ms: int):
+        self.due_ms = due_ms
+        self.callback = callback
+        self.queued_ms = queued_ms  # due time of the live heap entry for this key
+
+class DeadlineScheduler:
+    """
+    One runner task services all deadlines from a min-heap
+
+    Each key has at most one live deadline. Moving a deadline later (the
+    anti-snipe case) only updates the entry in O(1); the stale heap entry is
+    re-queued at the new time when it surfaces. Cancelling is also O(1).
+    """
+
+    def __init__(self):
+        self._deadlines: Dict[str, _Deadline] = {}
+        self._heap: List[Tuple[int, int, str]] = []
+        self._counter = itertools.count()
+        self._wakeup = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+        self._running: Set[asyncio.Task] = set()
+
+    @property
+    def depth(self) -> int:
+        """Number of live deadlines"""
+        return len(self._deadlines)
+
+    @property
+    def heap_size(self) -> int:
+        """Number of heap entries, including stale ones awaiting re-queue"""
+        return len(self._heap)
+
+    def schedule(self, key: str, due_ms: int, callback: DeadlineCallback):
+        """Schedule or reschedule the deadline for a key"""
+        entry = self._deadlines.get(key)
+        if entry is not None and entry.queued_ms <= due_ms:
+            # Later (or same) deadline: the queued entry will re-queue itself
+            entry.due_ms = due_ms
+            entry.callback = callback
+            return
+
+        self._deadlines[key] = _Deadline(due_ms, callback, due_ms)
+        self._push(due_ms, key)
+
+    def cancel(self, key: str) -> bool:
+        """Drop the deadline for a key"""
+        return self._deadlines.pop(key, None) is not None
+
+    def cancel_prefix(self, prefix: str) -> int:
+        """Drop every deadline whose key starts with prefix"""
+        keys = [key for key in self._deadlines if key.startswith(prefix)]
+        for key in keys:
+            del self._deadlines[key]
+        return len(keys)
+
+    def due_at(self, key: str) -> Optional[int]:
+        """Deadline for a key in epoch milliseconds"""
+        entry = self._deadlines.get(key)
+        return entry.due_ms if entry else None
+
+    def _push(self, due_ms: int, key: str):
+        heapq.heappush(self._heap, (due_ms, next(self._counter), key))
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+        # Wake the runner if this entry is now the earliest
+        if self._heap[0][2] == key:
+            self._wakeup.set()
+
+    async def _run(self):
+        """Sleep until the earliest deadline, then fire everything that is due"""
+        try:
+            while self._heap:
+                self._wakeup.clear()
+                wait = (self._heap[0][0] - now_ms()) / 1000
+                if wait > 0:
+                    try:
+                        await asyncio.wait_for(self._wakeup.wait(), timeout=min(wait, MAX_WAIT_SECONDS))
+                    except asyncio.TimeoutError:
+                        pass
+                    continue
+
+                self.run_due()
+        except asyncio.CancelledError:
+            logger.info("Deadline scheduler cancelled")
+
+    def run_due(self) -> int:
+        """Fire every deadline that is due now; returns the number fired"""
+        current_ms = now_ms()
+        fired = 0
+
+        while self._heap and self._heap[0][0] <= current_ms:
+            queued_ms, _, key = heapq.heappop(self._heap)
+            entry = self._deadlines.get(key)
+            if entry is None or entry.queued_ms != queued_ms:
+                continue  # cancelled or superseded
+
+            if entry.due_ms > current_ms:
+                # Deadline was pushed back since this entry was queued
+                entry.queued_ms = entry.due_ms
+                heapq.heappush(self._heap, (entry.due_ms, next(self._counter), key))
+                continue
+
+            del self._deadlines[key]
+            self._fire(key, entry.callback)
+            fired += 1
+
+        return fired
+
+    def _fire(self, key: str, callback: DeadlineCallback):
+        task = asyncio.create_task(self._invoke(key, callback))
+        self._running.add(task)
+        task.add_done_callback(self._running.discard)
+
+    async def _invoke(self, key: str, callback: DeadlineCallback):
+        try:
+            await callback()
+        except Exception as e:
+            logger.error(f"Deadline callback failed for {key}: {e}")
+
+    async def stop(self):
+        """Stop the runner and drop all deadlines"""
+        self._deadlines.clear()
+        self._heap.clear()
+        if self._task and not self._task.done():
+            self._task.cancel()
+
+# Global deadline scheduler instance
+deadline_scheduler: Optional[DeadlineScheduler] = None
+
+def get_deadline_scheduler() -> DeadlineScheduler:
+    """Get global deadline scheduler, creating it on first use"""
+    global deadline_scheduler
+    if deadline_scheduler is None:
+        deadline_scheduler = DeadlineScheduler()
+    return deadline_scheduler
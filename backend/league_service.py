@@ -1,9 +1,11 @@
-from typing import List, Optional
+from typing import Dict, List, Optional
 from datetime import datetime, timezone, timedelta
 import logging
 
 from models import *
 from database import db
+from membership_cache import get_membership_cache
+from utils.single_flight import single_flight
 import os
 
 # Test environment overrides
@@ -366,6 +368,7 @@ class LeagueService:
             )
             membership_dict = membership.dict(by_alias=True)
             await db.league_memberships.insert_one(membership_dict)
+            await get_membership_cache().invalidate_league(invitation["league_id"])
             
             # Create roster for new member
             roster = Roster(
@@ -497,25 +500,55 @@ class LeagueService:
             if not league:
                 return False
             
-            min_members = league["settings"]["league_size"]["min"]
-            current_members = league["member_count"]
-            
-            is_ready = current_members >= min_members
-            
-            # Update league status if ready
-            if is_ready and league["status"] == "setup":
-                await db.leagues.update_one(
-                    {"_id": league_id},
-                    {"$set": {"status": "ready"}}
-                )
-                logger.info(f"League {league_id} is now ready with {current_members} members")
-            
-            return is_ready
+            return await LeagueService._check_league_ready(league)
             
         except Exception as e:
             logger.error(f"Failed to validate league readiness: {e}")
             return False
 
+    @staticmethod
+    async def _check_league_ready(league: Dict) -> bool:
+        """
+        Readiness check on a league document already read
+        Moves a setup league to ready once it has its minimum members, updating `league` in place
+        """
+        min_members = league["settings"]["league_size"]["min"]
+        current_members = league["member_count"]
+        
+        is_ready = current_members >= min_members
+        
+        # Update league status if ready
+        if is_ready and league["status"] == "setup":
+            await db.leagues.update_one(
+                {"_id": league["_id"], "status": "setup"},
+                {"$set": {"status": "ready"}}
+            )
+            league["status"] = "ready"
+            logger.info(f"League {league['_id']} is now ready with {current_members} members")
+        
+        return is_ready
+
+    @staticmethod
+    @single_flight
+    async def get_league_status(league_id: str) -> Optional[Dict]:
+        """
+        League readiness status from a single league read
+        """
+        league = await db.leagues.find_one({"_id": league_id})
+        if not league:
+            return None
+        
+        is_ready = await LeagueService._check_league_ready(league)
+        return {
+            "league_id": league_id,
+            "status": league["status"],
+            "member_count": league["member_count"],
+            "min_members": league["settings"]["league_size"]["min"],
+            "max_members": league["settings"]["league_size"]["max"],
+            "is_ready": is_ready,
+            "can_start_auction": is_ready and league["status"] == "ready"
+        }
+
     @staticmethod
     async def resend_invitation(invitation_id: str, inviter_id: str) -> InvitationResponse:
         """
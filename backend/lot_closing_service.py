@@ -3,7 +3,6 @@ Lot Closing Service with Atomic Operations and Undo Support
 Handles two-phase lot closing with 10-second undo window
 """
 
-import asyncio
 import logging
 from datetime import datetime, timezone, timedelta
 from typing import Dict, Optional, Tuple, List
@@ -12,6 +11,7 @@ from motor.motor_asyncio import AsyncIOMotorClientSession
 from database import db
 from models import LotStatus, UndoableAction, AdminAction
 from audit_service import AuditService
+from deadline_scheduler import get_deadline_scheduler, to_ms
 
 logger = logging.getLogger(__name__)
 
@@ -120,10 +120,8 @@ class LotClosingService:
                     )
                     
                     # Schedule automatic finalization
-                    asyncio.create_task(
-                        LotClosingService._schedule_auto_finalize(
-                            action.action_id, undo_deadline
-                        )
+                    LotClosingService._schedule_auto_finalize(
+                        action.action_id, undo_deadline
                     )
                     
                     logger.info(
@@ -222,6 +220,9 @@ class LotClosingService:
                         session
                     )
                     
+                    # Nothing left to finalize
+                    get_deadline_scheduler().cancel(f"undo:{action_id}")
+                    
                     logger.info(f"Lot close undone for lot {action.lot_id} by {commissioner_id}")
                     return True, "Lot close successfully undone"
                     
@@ -384,15 +385,18 @@ class LotClosingService:
         return False
     
     @staticmethod
-    async def _schedule_auto_finalize(action_id: str, deadline: datetime):
-        """Schedule automatic finalization of lot close"""
+    def _schedule_auto_finalize(action_id: str, deadline: datetime):
+        """Schedule automatic finalization of lot close on the shared deadline scheduler"""
+        get_deadline_scheduler().schedule(
+            f"undo:{action_id}",
+            to_ms(deadline),
+            lambda: LotClosingService._auto_finalize(action_id)
+        )
+
+    @staticmethod
+    async def _auto_finalize(action_id: str):
+        """Finalize a lot close once its undo window has passed"""
         try:
-            # Calculate sleep time
-            sleep_time = (deadline - datetime.now(timezone.utc)).total_seconds()
-            if sleep_time > 0:
-                await asyncio.sleep(sleep_time)
-            
-            # Auto-finalize
             success, message = await LotClosingService.finalize_lot_close(action_id)
             if success:
                 logger.info(f"Auto-finalized lot close action {action_id}")
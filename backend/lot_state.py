@@ -0,0 +1,286 @@
+"""
+In-Memory Lot State for the Live Auction Engine
+Holds the authoritative state of each open lot and persists it write-behind
+"""
+
+import asyncio
+import logging
+import os
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+from pymongo import UpdateOne
+from pymongo.errors import BulkWriteError
+
+from database import db
+from models import generate_uuid
+
+logger = logging.getLogger(__name__)
+
+# Lot statuses that still accept bids
+BIDDABLE_STATUSES = ("open", "going_once", "going_twice")
+
+# Delay before the writer retries a failed flush
+WRITE_BEHIND_RETRY_SECONDS = float(os.getenv("WRITE_BEHIND_RETRY_SECONDS", "1.0"))
+
+DUPLICATE_KEY = 11000
+
+class WriteBehindError(Exception):
+    """Some pending writes failed; they were requeued for the next flush"""
+
+class LiveLotState:
+    """
+    Authoritative in-memory state for a single open lot
+    All mutations must happen while holding `lock`
+    """
+
+    __slots__ = (
+        "lot_id", "auction_id", "club_id", "order_index", "status",
+        "current_bid", "leading_bidder_id", "timer_ends_at", "bids_count", "seq", "lock"
+    )
+
+    def __init__(
+        self,
+        lot_id: str,
+        auction_id: str,
+        club_id: str,
+        order_index: int,
+        timer_ends_at: Optional[datetime],
+        status: str = "open",
+        current_bid: int = 0,
+        leading_bidder_id: Optional[str] = None
+    ):
+        self.lot_id = lot_id
+        self.auction_id = auction_id
+        self.club_id = club_id
+        self.order_index = order_index
+        self.status = status
+        self.current_bid = current_bid
+        self.leading_bidder_id = leading_bidder_id
+        self.timer_ends_at = timer_ends_at
+        self.bids_count = 0
+        self.seq = 0  # sequence number of the last broadcast delta
+        self.lock = asyncio.Lock()
+
+    @classmethod
+    def from_document(cls, lot: Dict) -> "LiveLotState":
+        """Build lot state from a persisted lot document"""
+        return cls(
+            lot_id=lot["_id"],
+            auction_id=lot["auction_id"],
+            club_id=lot["club_id"],
+            order_index=lot.get("order_index", 0),
+            timer_ends_at=lot.get("timer_ends_at"),
+            status=lot.get("status", "open"),
+            current_bid=lot.get("current_bid", 0),
+            leading_bidder_id=lot.get("leading_bidder_id") or lot.get("top_bidder_id")
+        )
+
+    @property
+    def is_biddable(self) -> bool:
+        """Check if the lot is still accepting bids"""
+        return self.status in BIDDABLE_STATUSES
+
+    def validate_bid(self, amount: int, min_increment: int) -> Tuple[bool, str]:
+        """
+        Validate a bid against the current lot state
+
+        Returns:
+            Tuple of (is_valid, error_message)
+        """
+        if not self.is_biddable:
+            return False, "Lot is no longer accepting bids"
+
+        if amount <= self.current_bid:
+            return False, f"Bid must be higher than current bid of {self.current_bid}"
+
+        minimum_bid = self.current_bid + min_increment if self.current_bid > 0 else min_increment
+        if amount < minimum_bid:
+            return False, f"Bid must be at least {minimum_bid}"
+
+        return True, ""
+
+    def apply_bid(self, bidder_id: str, amount: int):
+        """Accept a validated bid"""
+        self.current_bid = amount
+        self.leading_bidder_id = bidder_id
+        self.bids_count += 1
+
+    def next_seq(self) -> int:
+        """Advance the broadcast sequence number"""
+        self.seq += 1
+        return self.seq
+
+    def persisted_fields(self) -> Dict:
+        """Fields written back to db.lots"""
+        return {
+            "status": self.status,
+            "current_bid": self.current_bid,
+            "top_bidder_id": self.leading_bidder_id,
+            "leading_bidder_id": self.leading_bidder_id,
+            "timer_ends_at": self.timer_ends_at
+        }
+
+    def to_dict(self) -> Dict:
+        """Lot state shaped like a lot document for API responses"""
+        return {
+            "_id": self.lot_id,
+            "auction_id": self.auction_id,
+            "club_id": self.club_id,
+            "order_index": self.order_index,
+            **self.persisted_fields()
+        }
+
+class LotWriteBehind:
+    """
+    Background writer that persists accepted bids and lot state to MongoDB
+    Lot updates are coalesced per lot so only the latest state is written
+    """
+
+    def __init__(self):
+        self._pending_bids: List[Dict] = []
+        self._dirty_lots: Dict[str, Dict] = {}  # lot_id -> fields to $set
+        self._wakeup = asyncio.Event()
+        self._flush_lock = asyncio.Lock()
+        self._task: Optional[asyncio.Task] = None
+        self._stopping = False
+
+    @property
+    def pending_count(self) -> int:
+        """Number of bids and lot updates waiting to be written"""
+        return len(self._pending_bids) + len(self._dirty_lots)
+
+    def record_bid(self, bid: Dict):
+        """Queue an accepted bid for insertion into db.bids"""
+        self._pending_bids.append(bid)
+        self._schedule()
+
+    def record_lot(self, lot_id: str, fields: Dict):
+        """Queue the latest lot fields for db.lots"""
+        self._dirty_lots.setdefault(lot_id, {}).update(fields)
+        self._schedule()
+
+    def _schedule(self):
+        """Wake the writer task, starting it if needed"""
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+        self._wakeup.set()
+
+    async def _run(self):
+        """Flush pending writes whenever new work arrives"""
+        try:
+            while True:
+                await self._wakeup.wait()
+                self._wakeup.clear()
+                try:
+                    await self.flush()
+                except WriteBehindError:
+                    # Requeued writes are retried after a pause, even if no new work arrives
+                    await asyncio.sleep(WRITE_BEHIND_RETRY_SECONDS)
+                    self._wakeup.set()
+        except asyncio.CancelledError:
+            logger.info("Lot write-behind task cancelled")
+
+    async def flush(self):
+        """
+        Write all pending bids and lot updates now
+        Raises WriteBehindError if anything failed; failed writes stay queued
+        """
+        failures = []
+        async with self._flush_lock:
+            bids, self._pending_bids = self._pending_bids, []
+            lots, self._dirty_lots = self._dirty_lots, {}
+
+            if lots:
+                try:
+                    await db.lots.bulk_write(
+                        [UpdateOne({"_id": lot_id}, {"$set": fields}) for lot_id, fields in lots.items()],
+                        ordered=False
+                    )
+                except Exception as e:
+                    logger.error(f"Write-behind lot flush failed: {e}")
+                    failures.append(f"lots: {e}")
+                    # Requeue without clobbering anything newer
+                    for lot_id, fields in lots.items():
+                        self._dirty_lots[lot_id] = {**fields, **self._dirty_lots.get(lot_id, {})}
+
+            if bids:
+                try:
+                    await db.bids.insert_many(bids, ordered=False)
+                except BulkWriteError as e:
+                    # Unordered insert: everything except the reported errors was written.
+                    # Duplicate keys are bids a previous attempt already wrote.
+                    failed = sorted(
+                        error["index"] for error in e.details.get("writeErrors", [])
+                        if error.get("code") != DUPLICATE_KEY
+                    )
+                    if failed:
+                        logger.error(f"Write-behind bid flush failed for {len(failed)} of {len(bids)} bids: {e}")
+                        failures.append(f"bids: {len(failed)} not written")
+                        self._pending_bids = [bids[i] for i in failed] + self._pending_bids
+                except Exception as e:
+                    logger.error(f"Write-behind bid flush failed: {e}")
+                    failures.append(f"bids: {e}")
+                    self._pending_bids = bids + self._pending_bids
+
+        if failures:
+            if not self._stopping:
+                self._schedule()  # Make sure the writer retries what was requeued
+            raise WriteBehindError("; ".join(failures))
+
+    async def take_lot(self, lot_id: str) -> Optional[Dict]:
+        """
+        Remove and return a lot's queued fields, after any in-flight flush finishes
+        Used when the caller writes the lot's final state itself
+        """
+        async with self._flush_lock:
+            return self._dirty_lots.pop(lot_id, None)
+
+    async def stop(self):
+        """Flush remaining writes and stop the writer task; raises WriteBehindError on failure"""
+        self._stopping = True
+        if self._task and not self._task.done():
+            self._task.cancel()
+        await self.flush()
+
+def build_bid_document(
+    lot_id: str,
+    auction_id: str,
+    league_id: str,
+    bidder_id: str,
+    amount: int,
+    server_ts: datetime
+) -> Dict:
+    """Build a raw bid document for db.bids"""
+    return {
+        "_id": generate_uuid(),
+        "lot_id": lot_id,
+        "auction_id": auction_id,
+        "league_id": league_id,
+        "bidder_id": bidder_id,
+        "amount": amount,
+        "status": "accepted",
+        "created_at": server_ts,
+        "server_ts": server_ts,
+        "timestamp": server_ts
+    }
+
+def build_lot_document(
+    auction_id: str,
+    club_id: str,
+    nominated_by: Optional[str],
+    order_index: int,
+    created_at: datetime
+) -> Dict:
+    """Build a raw pending lot document for db.lots (same shape as models.Lot)"""
+    return {
+        "_id": generate_uuid(),
+        "auction_id": auction_id,
+        "club_id": club_id,
+        "status": "pending",
+        "nominated_by": nominated_by,
+        "order_index": order_index,
+        "current_bid": 0,
+        "top_bidder_id": None,
+        "timer_ends_at": None,
+        "created_at": created_at
+    }
@@ -0,0 +1,343 @@
+"""
+Matchday Calendar
+Per-competition, per-season matchday intervals, built once from fixtures and the competition profile
+"""
+
+import asyncio
+import hashlib
+import logging
+import os
+import time
+from bisect import bisect_right
+from collections import Counter
+from datetime import datetime, timezone, timedelta
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from pymongo.errors import DuplicateKeyError
+
+from database import db
+from cache_generations import get_cache_generations, FIXTURES
+
+logger = logging.getLogger(__name__)
+
+# Competition of leagues that cannot be found; its profile is competition_profiles._id "ucl"
+DEFAULT_COMPETITION = "UCL"
+
+# Calendars are rebuilt after this long, so fixtures written by other processes are picked up
+MATCHDAY_CALENDAR_TTL_SECONDS = float(os.getenv("MATCHDAY_CALENDAR_TTL_SECONDS", "300"))
+
+# Used when the profile has no `calendar` block (UCL shape)
+DEFAULT_CALENDAR = {
+    "season_start": "09-01",         # MM-DD in the season's first year
+    "group_matchdays": 6,
+    "group_matchday_days": 14,
+    "knockout_round_days": 30,
+    "knockout_stages": ["round_of_16", "quarter_finals", "semi_finals", "final"],
+    "knockout_legs": {"round_of_16": 2, "quarter_finals": 2, "semi_finals": 2, "final": 1},
+    "knockout_stage_starts": {},     # Optional stage -> MM-DD, overrides counting legs
+    "matchday_gap_days": 3           # Fixtures further apart than this start a new matchday
+}
+
+def _aware(value: datetime) -> datetime:
+    return value if value.tzinfo else value.replace(tzinfo=timezone.utc)
+
+def season_for(kicked_off_at: datetime) -> str:
+    """Season label (e.g. "2024-25") for a kick-off; seasons turn over in July"""
+    year = kicked_off_at.year if kicked_off_at.month >= 7 else kicked_off_at.year - 1
+    return f"{year}-{(year + 1) % 100:02d}"
+
+def profile_id(competition: str) -> str:
+    """competition_profiles _id for a league competition (e.g. "UCL" -> "ucl")"""
+    return competition.lower()
+
+def _season_date(season: str, month_day: str) -> datetime:
+    """A MM-DD within a season: July onwards in its first year, earlier months in its second"""
+    month, day = (int(part) for part in month_day.split("-"))
+    year = int(season[:4]) if month >= 7 else int(season[:4]) + 1
+    return datetime(year, month, day, tzinfo=timezone.utc)
+
+class MatchdayCalendar:
+    """
+    One season as a sorted list of matchday start times, each with its stage
+    A kick-off belongs to the last matchday starting at or before it
+    """
+
+    __slots__ = ("season", "starts", "values", "stages", "knockout_stages", "source")
+
+    def __init__(self, season: str, starts: List[datetime], stages: List[str], config: Dict, source: str):
+        self.season = season
+        self.starts = starts
+        self.values = list(range(1, len(starts) + 1))
+        self.stages = stages
+        self.knockout_stages = config["knockout_stages"]
+        self.source = source
+
+    @classmethod
+    def from_fixtures(
+        cls,
+        season: str,
+        dates: Iterable[datetime],
+        config: Dict,
+        fixture_stages: Optional[Dict[datetime, str]] = None
+    ) -> "MatchdayCalendar":
+        """
+        Cluster fixture dates into matchdays separated by more than matchday_gap_days
+        A matchday takes the stage its fixtures carry; otherwise see _default_stages
+        """
+        fixture_stages = {_aware(d): stage for d, stage in (fixture_stages or {}).items() if stage}
+        gap = timedelta(days=config["matchday_gap_days"])
+        starts = []
+        clusters: List[Counter] = []
+        previous = None
+        for date in sorted(_aware(d) for d in dates):
+            if previous is None or date - previous > gap:
+                starts.append(date)
+                clusters.append(Counter())
+            if date in fixture_stages:
+                clusters[-1][fixture_stages[date]] += 1
+            previous = date
+        stages = [
+            explicit.most_common(1)[0][0] if explicit else default
+            for explicit, default in zip(clusters, cls._default_stages(season, starts, config))
+        ]
+        return cls(season, starts, stages, config, "fixtures")
+
+    @staticmethod
+    def _default_stages(season: str, starts: List[datetime], config: Dict) -> List[str]:
+        """
+        Stages for matchdays whose fixtures carry none: the first group_matchdays are
+        the group stage, then each knockout stage starts on its configured date
+        (knockout_stage_starts) or otherwise spans its number of legs
+        """
+        stages = ["group_stage"] * min(config["group_matchdays"], len(starts))
+        knockout = starts[len(stages):]
+        stage_starts = config.get("knockout_stage_starts") or {}
+        if stage_starts:
+            windows = sorted(
+                (_season_date(season, stage_starts[stage]), stage)
+                for stage in config["knockout_stages"] if stage in stage_starts
+            )
+            window_starts = [start for start, _ in windows]
+            for start in knockout:
+                stages.append(windows[max(bisect_right(window_starts, start) - 1, 0)][1])
+            return stages
+        legs = config.get("knockout_legs") or {}
+        by_legs = [stage for stage in config["knockout_stages"] for _ in range(legs.get(stage, 1))]
+        for i in range(len(knockout)):
+            stages.append(by_legs[min(i, len(by_legs) - 1)])
+        return stages
+
+    @classmethod
+    def from_profile(cls, season: str, config: Dict) -> "MatchdayCalendar":
+        """Fixed windows from the season start: group matchdays, then one window per knockout stage"""
+        season_start = _season_date(season, config["season_start"])
+        starts = [
+            season_start + timedelta(days=config["group_matchday_days"] * i)
+            for i in range(config["group_matchdays"])
+        ]
+        knockout_start = season_start + timedelta(days=config["group_matchday_days"] * config["group_matchdays"])
+        starts += [
+            knockout_start + timedelta(days=config["knockout_round_days"] * i)
+            for i in range(len(config["knockout_stages"]))
+        ]
+        stages = ["group_stage"] * config["group_matchdays"] + list(config["knockout_stages"])
+        return cls(season, starts, stages, config, "profile")
+
+    def matchday(self, kicked_off_at: datetime) -> int:
+        """O(log n) matchday lookup; kick-offs before the first matchday count as matchday 1"""
+        index = bisect_right(self.starts, _aware(kicked_off_at)) - 1
+        return self.values[max(index, 0)] if self.values else 1
+
+    def bucket(self, kicked_off_at: datetime) -> Dict:
+        return {"type": "matchday", "value": self.matchday(kicked_off_at)}
+
+    def stage(self, matchday: int) -> str:
+        """Competition stage for a matchday number"""
+        if not self.stages:
+            return "group_stage"
+        return self.stages[min(max(matchday, 1), len(self.stages)) - 1]
+
+    @property
+    def signature(self) -> str:
+        """Digest of the matchday starts and stages; equal signatures bucket kick-offs identically"""
+        layout = ";".join(f"{start.isoformat()}={stage}" for start, stage in zip(self.starts, self.stages))
+        return hashlib.sha1(layout.encode()).hexdigest()
+
+CalendarKey = Tuple[str, str]  # (competition, season)
+
+class MatchdayCalendarIndex:
+    """
+    (competition, season) -> MatchdayCalendar, built once per key
+
+    `load` builds calendars from the fixtures of the competition's leagues
+    (falling back to the profile's fixed windows when a season has none) and
+    must be awaited before settlement; `get` is the synchronous lookup used
+    on the hot path. Calendars older than ttl_seconds are rebuilt on the next
+    load, so fixtures written by another process (e.g. the seed script) show up.
+
+    Each key's signature is stored in `matchday_calendars`. A process whose
+    rebuild changes it swaps the stored signature with a compare-and-set; the
+    winner re-scores the affected leagues, since their settled points and
+    materialized tables were bucketed with the old calendar, and bumps their
+    fixtures generation, since the fixtures page embeds matchdays and stages.
+    Other processes see the new signature on their next load and rebuild their copy.
+    """
+
+    def __init__(self, ttl_seconds: float = MATCHDAY_CALENDAR_TTL_SECONDS):
+        self.ttl_seconds = ttl_seconds
+        self.calendars: Dict[CalendarKey, MatchdayCalendar] = {}
+        self.built_at: Dict[CalendarKey, float] = {}
+        self.configs: Dict[str, Dict] = {}
+        self.competitions: Dict[str, str] = {}  # league_id -> competition; a league's competition never changes
+        self._lock = asyncio.Lock()
+
+    def _is_fresh(self, key: CalendarKey) -> bool:
+        return key in self.calendars and time.monotonic() - self.built_at[key] < self.ttl_seconds
+
+    async def league_competitions(self, league_ids: Iterable[str]) -> Dict[str, str]:
+        """Competition of each league, DEFAULT_COMPETITION for leagues that cannot be found"""
+        league_ids = set(league_ids)
+        missing = league_ids - self.competitions.keys()
+        if missing:
+            leagues = await db.leagues.find(
+                {"_id": {"$in": list(missing)}}, {"competition": 1}
+            ).to_list(length=None)
+            for league in leagues:
+                self.competitions[league["_id"]] = league.get("competition") or DEFAULT_COMPETITION
+        return {league_id: self.competitions.get(league_id, DEFAULT_COMPETITION) for league_id in league_ids}
+
+    async def _load_config(self, competition: str) -> Dict:
+        if competition not in self.configs:
+            profile = await db.competition_profiles.find_one({"_id": profile_id(competition)}, {"calendar": 1})
+            self.configs[competition] = {**DEFAULT_CALENDAR, **((profile or {}).get("calendar") or {})}
+        return self.configs[competition]
+
+    async def _stored_signatures(self, keys: Set[CalendarKey]) -> Dict[CalendarKey, str]:
+        try:
+            docs = await db.matchday_calendars.find(
+                {"_id": {"$in": [f"{competition}:{season}" for competition, season in keys]}},
+                {"competition": 1, "season": 1, "signature": 1}
+            ).to_list(length=None)
+        except Exception as e:
+            logger.error(f"Failed to read stored matchday calendars: {e}")
+            return {}
+        return {(doc["competition"], doc["season"]): doc["signature"] for doc in docs}
+
+    async def load(self, keys: Iterable[CalendarKey]):
+        """
+        Build calendars for any of these (competition, season) keys not indexed,
+        indexed too long ago, or changed by another process since
+        """
+        keys = set(keys)
+        if not keys:
+            return
+        stored = await self._stored_signatures(keys)
+        stale = {
+            key for key in keys
+            if not self._is_fresh(key) or stored.get(key, self.calendars[key].signature) != self.calendars[key].signature
+        }
+        if not stale:
+            return
+        async with self._lock:
+            for key in stale:
+                await self._build(key, stored.get(key))
+
+    async def _build(self, key: CalendarKey, stored_signature: Optional[str]):
+        competition, season = key
+        config = await self._load_config(competition)
+        try:
+            league_ids = await db.leagues.distinct("_id", {"competition": competition})
+            rows = await db.fixtures.aggregate([
+                {"$match": {"season": season, "league_id": {"$in": league_ids}}},
+                {"$group": {"_id": "$date", "stage": {"$max": "$stage"}}}
+            ]).to_list(length=None)
+        except Exception as e:
+            logger.error(f"Failed to load fixtures for {competition} {season} calendar: {e}")
+            rows = []
+        calendar = (
+            MatchdayCalendar.from_fixtures(
+                season, [row["_id"] for row in rows], config,
+                {row["_id"]: row.get("stage") for row in rows}
+            ) if rows
+            else MatchdayCalendar.from_profile(season, config)
+        )
+        previous = self.calendars.get(key)
+        self.calendars[key] = calendar
+        self.built_at[key] = time.monotonic()
+        if previous is None or previous.signature != calendar.signature:
+            logger.info(
+                f"Built {calendar.source} matchday calendar for {competition} {season}: {len(calendar.starts)} matchdays"
+            )
+        if calendar.signature != stored_signature and await self._record(key, stored_signature, calendar.signature):
+            await self._calendar_changed(key)
+
+    async def _record(self, key: CalendarKey, expected: Optional[str], signature: str) -> bool:
+        """
+        Swap the stored signature if it is still `expected`
+        Returns True if this process changed an existing calendar; a first record is not a change
+        """
+        competition, season = key
+        doc_id = f"{competition}:{season}"
+        fields = {"signature": signature, "updated_at": datetime.now(timezone.utc)}
+        try:
+            if expected is None:
+                await db.matchday_calendars.insert_one(
+                    {"_id": doc_id, "competition": competition, "season": season, **fields}
+                )
+                return False
+            swapped = await db.matchday_calendars.update_one(
+                {"_id": doc_id, "signature": expected}, {"$set": fields}
+            )
+            return swapped.modified_count == 1
+        except DuplicateKeyError:
+            return False  # Another process recorded it first
+        except Exception as e:
+            logger.error(f"Failed to record matchday calendar {doc_id}: {e}")
+            return False
+
+    async def _calendar_changed(self, key: CalendarKey):
+        """
+        Rebuild the fixtures pages of every league in the competition (any league
+        may view any season), and re-score the season's leagues in the background
+        """
+        # Import here to avoid circular imports
+        from rescoring_service import RescoringService
+
+        competition, season = key
+        try:
+            fixture_league_ids = await db.leagues.distinct("_id", {"competition": competition})
+            league_ids = await db.leagues.distinct("_id", {"competition": competition, "season": season})
+        except Exception as e:
+            logger.error(f"Failed to find leagues for changed {competition} {season} calendar: {e}")
+            return
+        await get_cache_generations().bump(fixture_league_ids, FIXTURES)
+        logger.info(f"Matchday calendar for {competition} {season} changed; re-scoring {len(league_ids)} leagues")
+        for league_id in league_ids:
+            RescoringService.start_rescore_job(league_id)
+
+    def get(
+        self,
+        competition: Optional[str],
+        season: Optional[str],
+        kicked_off_at: Optional[datetime] = None
+    ) -> MatchdayCalendar:
+        """Indexed calendar for a competition's season, or the profile's fixed windows if it was never loaded"""
+        competition = competition or DEFAULT_COMPETITION
+        season = season or season_for(kicked_off_at)
+        calendar = self.calendars.get((competition, season))
+        if calendar is None:
+            calendar = MatchdayCalendar.from_profile(season, self.configs.get(competition, DEFAULT_CALENDAR))
+        return calendar
+
+    def invalidate(self, season: Optional[str] = None):
+        """Drop one season (or every season) of every competition after fixtures change"""
+        for key in [key for key in self.calendars if season is None or key[1] == season]:
+            self.calendars.pop(key, None)
+            self.built_at.pop(key, None)
+
+# Global matchday calendar index
+matchday_calendars = MatchdayCalendarIndex()
+
+def get_matchday_calendars() -> MatchdayCalendarIndex:
+    """Get the matchday calendar index"""
+    return matchday_calendars
@@ -0,0 +1,119 @@
+"""
+Membership Cache
+In-process cache of (league_id, user_id) -> role/status for access checks
+"""
+
+import asyncio
+import logging
+import os
+from typing import Dict, Optional, Set
+
+from database import db
+from time_provider import now_ms
+from cache_generations import get_cache_generations, MEMBERSHIPS
+
+logger = logging.getLogger(__name__)
+
+# Backstop for membership writes that do not invalidate the cache
+MEMBERSHIP_CACHE_TTL_SECONDS = float(os.getenv("MEMBERSHIP_CACHE_TTL_SECONDS", "300"))
+
+class MembershipEntry:
+    """A user's role and status in one league"""
+
+    __slots__ = ("role", "status")
+
+    def __init__(self, role: str, status: Optional[str]):
+        self.role = role
+        self.status = status
+
+class LeagueMemberships:
+    """One league's memberships, tagged with the generation they were loaded at"""
+
+    __slots__ = ("entries", "commissioners", "generation", "loaded_at")
+
+    def __init__(self, entries: Dict[str, MembershipEntry], commissioners: Set[str], generation: int):
+        self.entries = entries
+        self.commissioners = commissioners
+        self.generation = generation
+        self.loaded_at = now_ms()
+
+class MembershipCache:
+    """
+    League memberships loaded in bulk, one league at a time
+
+    Each check grants what it did before the cache: league access comes from
+    `league_memberships`, commissioner checks from `memberships`.
+
+    A league is served from memory while its `memberships` generation in
+    `cache_generations` is the one read before it was loaded, so an
+    invalidation in any process is seen on the next check. A load that races
+    a local invalidation is returned to its caller but not kept.
+    """
+
+    def __init__(self):
+        self._leagues: Dict[str, LeagueMemberships] = {}
+        self._invalidations: Dict[str, int] = {}
+        self._load_locks: Dict[str, asyncio.Lock] = {}
+
+    def _is_current(self, league_id: str, generation: int) -> bool:
+        cached = self._leagues.get(league_id)
+        return (
+            cached is not None
+            and cached.generation == generation
+            and now_ms() - cached.loaded_at < MEMBERSHIP_CACHE_TTL_SECONDS * 1000
+        )
+
+    async def load_league(self, league_id: str) -> LeagueMemberships:
+        """Load every membership in a league unless the cached copy is current"""
+        generation = await get_cache_generations().get(league_id, MEMBERSHIPS)
+        if self._is_current(league_id, generation):
+            return self._leagues[league_id]
+
+        lock = self._load_locks.setdefault(league_id, asyncio.Lock())
+        async with lock:
+            if self._is_current(league_id, generation):
+                return self._leagues[league_id]  # Loaded by a concurrent caller
+
+            invalidations = self._invalidations.get(league_id, 0)
+            projection = {"user_id": 1, "role": 1, "status": 1}
+            rows = await db.league_memberships.find({"league_id": league_id}, projection).to_list(length=None)
+            entries = {row["user_id"]: MembershipEntry(row.get("role"), row.get("status")) for row in rows}
+            commissioner_rows = await db.memberships.find(
+                {"league_id": league_id, "role": "commissioner"}, {"user_id": 1}
+            ).to_list(length=None)
+            league = LeagueMemberships(entries, {row["user_id"] for row in commissioner_rows}, generation)
+
+            if self._invalidations.get(league_id, 0) == invalidations:
+                self._leagues[league_id] = league
+            return league
+
+    async def get(self, league_id: str, user_id: str) -> Optional[MembershipEntry]:
+        """Get a user's league membership, which grants access to the league"""
+        league = await self.load_league(league_id)
+        return league.entries.get(user_id)
+
+    async def get_role(self, league_id: str, user_id: str) -> Optional[str]:
+        """Get a user's role in a league, or None if not a member"""
+        entry = await self.get(league_id, user_id)
+        return entry.role if entry else None
+
+    async def is_commissioner(self, league_id: str, user_id: str) -> bool:
+        """Whether a user holds a commissioner membership in the league"""
+        league = await self.load_league(league_id)
+        return user_id in league.commissioners
+
+    async def invalidate_league(self, league_id: str):
+        """Forget a league here and advance its generation so every process reloads it"""
+        self._invalidations[league_id] = self._invalidations.get(league_id, 0) + 1
+        self._leagues.pop(league_id, None)
+        await get_cache_generations().bump([league_id], MEMBERSHIPS)
+
+# Global membership cache instance
+membership_cache: Optional[MembershipCache] = None
+
+def get_membership_cache() -> MembershipCache:
+    """Get global membership cache, creating it on first use"""
+    global membership_cache
+    if membership_cache is None:
+        membership_cache = MembershipCache()
+    return membership_cache
@@ -177,6 +177,7 @@ class Club(BaseModel):
     short_name: str
     country: str
     ext_ref: str  # External reference (e.g., UEFA ID)
+    competitions: List[str] = Field(default_factory=list)  # Empty means eligible for every competition
     
     class Config:
         populate_by_name = True
@@ -394,6 +395,7 @@ class Fixture(BaseModel):
     home_ext: str  # Home team external reference
     away_ext: str  # Away team external reference
     status: str = "scheduled"
+    stage: Optional[str] = None  # Competition stage (e.g. "round_of_16"), if the feed provides it
     
     class Config:
         populate_by_name = True
@@ -406,6 +408,7 @@ class FixtureCreate(BaseModel):
     home_ext: str
     away_ext: str
     status: Optional[str] = "scheduled"
+    stage: Optional[str] = None
 
 class FixtureResponse(BaseModel):
     id: str
@@ -416,12 +419,14 @@ class FixtureResponse(BaseModel):
     home_ext: str
     away_ext: str
     status: str
+    stage: Optional[str] = None
 
 # Result Ingest Models
 class ResultIngest(BaseModel):
     id: str = Field(default_factory=generate_uuid, alias="_id")
     league_id: str
     match_id: str
+    season: Optional[str] = None
     home_ext: str
     away_ext: str
     home_goals: int
@@ -0,0 +1,383 @@
+#!/usr/bin/env python3
+"""
+Bulk Re-Scoring Service
+Recomputes weekly_points and league_standings from settled results in bulk
+
+    python rescoring_service.py [--league LEAGUE_ID ...] [--dry-run]
+
+Results, ownership and scoring rules are loaded once into pandas frames and
+every league's rules are applied vectorized, instead of replaying settlement
+match by match. Rows are rewritten with upserts stamped with the run time,
+then rows the run did not touch are deleted, so readers never see an empty
+table mid-run. Writes happen while holding the scoring lease of every league
+being re-scored, so no settlement lands between a run's upserts and its
+delete of rows it did not stamp; --dry-run writes nothing and takes no lease.
+"""
+
+import argparse
+import asyncio
+import logging
+import os
+import time
+from contextlib import asynccontextmanager
+from datetime import datetime, timezone
+from typing import Dict, List, Optional, Set
+
+import numpy as np
+import pandas as pd
+from pymongo import UpdateOne
+
+from database import db
+from models import generate_uuid
+from scoring_service import ScoringService
+from matchday_calendar import get_matchday_calendars, season_for
+from cache_generations import get_cache_generations, STANDINGS
+from scoring_leases import ScoringLeases, default_worker_id
+
+logger = logging.getLogger(__name__)
+
+# Operations per bulk_write call
+RESCORE_WRITE_CHUNK = 5000
+
+# How long a re-scoring job waits for a worker to release the league
+RESCORE_LEASE_WAIT_SECONDS = float(os.getenv("RESCORE_LEASE_WAIT_SECONDS", "120"))
+RESCORE_LEASE_POLL_SECONDS = float(os.getenv("RESCORE_LEASE_POLL_SECONDS", "1.0"))
+
+# Running background jobs, referenced so they are not garbage collected
+_rescore_jobs: Set[asyncio.Task] = set()
+
+class RescoringService:
+    """Vectorized re-scoring of settled results under each league's current rules"""
+
+    @staticmethod
+    async def _load_frames(league_ids: Optional[List[str]]) -> Dict[str, pd.DataFrame]:
+        """Load settled results, rules, clubs and ownership as DataFrames"""
+        query = {"processed": True}
+        if league_ids is not None:
+            query["league_id"] = {"$in": league_ids}
+        results = pd.DataFrame(await db.result_ingest.find(query, {
+            "league_id": 1, "match_id": 1, "home_ext": 1, "away_ext": 1,
+            "home_goals": 1, "away_goals": 1, "kicked_off_at": 1, "season": 1
+        }).to_list(length=None))
+
+        scope = list(league_ids) if league_ids is not None else (
+            sorted(results["league_id"].unique()) if not results.empty else []
+        )
+        rules = await ScoringService.load_scoring_rules(scope)
+        if not results.empty:
+            calendars = get_matchday_calendars()
+            competitions = await calendars.league_competitions(results["league_id"].unique())
+            results["competition"] = results["league_id"].map(competitions)
+            seasons = results["season"] if "season" in results else pd.Series(None, index=results.index)
+            await calendars.load({
+                (competition, season if isinstance(season, str) else season_for(kickoff))
+                for competition, season, kickoff in zip(results["competition"], seasons, results["kicked_off_at"])
+            })
+        rules_frame = pd.DataFrame([{"league_id": league_id, **r} for league_id, r in rules.items()])
+
+        ext_refs = [] if results.empty else list(pd.unique(results[["home_ext", "away_ext"]].values.ravel()))
+        clubs = await db.clubs.find({"ext_ref": {"$in": ext_refs}}, {"ext_ref": 1}).to_list(length=None)
+        owners = pd.DataFrame(await db.roster_clubs.find(
+            {"league_id": {"$in": scope}}, {"_id": 0, "league_id": 1, "club_id": 1, "user_id": 1}
+        ).to_list(length=None), columns=["league_id", "club_id", "user_id"])
+
+        return {
+            "scope": scope,
+            "results": results,
+            "rules": rules_frame,
+            "club_ids": {club["ext_ref"]: club["_id"] for club in clubs},
+            "owners": owners
+        }
+
+    @staticmethod
+    def score_frames(
+        results: pd.DataFrame,
+        rules: pd.DataFrame,
+        club_ids: Dict[str, str],
+        owners: pd.DataFrame
+    ) -> pd.DataFrame:
+        """
+        One row per (league, owner, match) with the owner's points
+        Columns: league_id, user_id, match_id, points, matchday, kicked_off_at
+        """
+        columns = ["league_id", "user_id", "match_id", "points", "matchday", "kicked_off_at"]
+        if results.empty:
+            return pd.DataFrame(columns=columns)
+
+        # Each result becomes a home row and an away row
+        home = results.assign(ext=results["home_ext"], goals_for=results["home_goals"], goals_against=results["away_goals"])
+        away = results.assign(ext=results["away_ext"], goals_for=results["away_goals"], goals_against=results["home_goals"])
+        sides = pd.concat([home, away], ignore_index=True).merge(rules, on="league_id")
+
+        goals_for = sides["goals_for"].to_numpy()
+        goals_against = sides["goals_against"].to_numpy()
+        sides["points"] = (
+            goals_for * sides["club_goal"].to_numpy()
+            + np.where(goals_for > goals_against, sides["club_win"].to_numpy(), 0)
+            + np.where(goals_for == goals_against, sides["club_draw"].to_numpy(), 0)
+        )
+
+        # Bucket once per distinct kick-off and calendar rather than once per owner row
+        sides["season"] = sides["season"].fillna("") if "season" in sides else ""
+        sides["competition"] = sides["competition"].fillna("") if "competition" in sides else ""
+        kickoffs = sides[["kicked_off_at", "season", "competition"]].drop_duplicates()
+        matchdays = {
+            (kickoff, season, competition): ScoringService.calculate_matchday_bucket(
+                pd.Timestamp(kickoff).to_pydatetime(), season or None, competition or None
+            )["value"]
+            for kickoff, season, competition in kickoffs.itertuples(index=False)
+        }
+        sides["matchday"] = [
+            matchdays[key] for key in zip(sides["kicked_off_at"], sides["season"], sides["competition"])
+        ]
+
+        sides["club_id"] = sides["ext"].map(club_ids)
+        scored = sides.dropna(subset=["club_id"]).merge(owners, on=["league_id", "club_id"])
+        return scored[columns].reset_index(drop=True)
+
+    @staticmethod
+    async def _write_chunked(collection, operations: List[UpdateOne]):
+        for start in range(0, len(operations), RESCORE_WRITE_CHUNK):
+            await collection.bulk_write(operations[start:start + RESCORE_WRITE_CHUNK], ordered=False)
+
+    @staticmethod
+    async def rescore(league_ids: Optional[List[str]] = None, dry_run: bool = False) -> Dict:
+        """
+        Re-score settled results for the given leagues (all leagues if None)
+        Returns a summary of what was (or would be) written
+        """
+        started = time.perf_counter()
+        frames = await RescoringService._load_frames(league_ids)
+        scored = RescoringService.score_frames(
+            frames["results"], frames["rules"], frames["club_ids"], frames["owners"]
+        )
+        scope = frames["scope"]
+        stamp = datetime.now(timezone.utc)
+
+        points_ops = [
+            UpdateOne(
+                {"league_id": row.league_id, "user_id": row.user_id, "match_id": row.match_id},
+                {
+                    "$set": {
+                        "league_id": row.league_id,
+                        "user_id": row.user_id,
+                        "match_id": row.match_id,
+                        "points_delta": int(row.points),
+                        "bucket": {"type": "matchday", "value": int(row.matchday)},
+                        "rescored_at": stamp
+                    },
+                    "$setOnInsert": {"_id": generate_uuid(), "created_at": stamp}
+                },
+                upsert=True
+            )
+            for row in scored.itertuples(index=False)
+        ]
+
+        totals = scored.groupby(["league_id", "user_id"]).agg(
+            total_points=("points", "sum"), matches_played=("points", "size")
+        )
+        standings_ops = [
+            UpdateOne(
+                {"league_id": league_id, "user_id": user_id},
+                {
+                    "$set": {
+                        "total_points": int(row.total_points),
+                        "matches_played": int(row.matches_played),
+                        "updated_at": stamp,
+                        "rescored_at": stamp
+                    },
+                    "$unset": {"weekly_breakdown": ""},
+                    "$setOnInsert": {"_id": generate_uuid()}
+                },
+                upsert=True
+            )
+            for (league_id, user_id), row in totals.iterrows()
+        ]
+        
+        per_manager = scored.groupby(["league_id", "matchday", "user_id"]).agg(
+            points=("points", "sum"), matches=("points", "size")
+        ).reset_index()
+        summary_ops = []
+        for (league_id, matchday), rows in per_manager.groupby(["league_id", "matchday"]):
+            summary_ops.append(UpdateOne(
+                {"_id": f"{league_id}:{int(matchday)}"},
+                {"$set": {
+                    "league_id": league_id,
+                    "matchday": int(matchday),
+                    "total_points": int(rows["points"].sum()),
+                    "total_matches": int(rows["matches"].sum()),
+                    "managers": {
+                        user_id: {"points": int(points), "matches": int(matches)}
+                        for user_id, points, matches in zip(rows["user_id"], rows["points"], rows["matches"])
+                    },
+                    "updated_at": stamp,
+                    "rescored_at": stamp
+                }},
+                upsert=True
+            ))
+
+        series_ops = []
+        for (league_id, user_id), rows in per_manager.groupby(["league_id", "user_id"]):
+            series_ops.append(UpdateOne(
+                {"_id": f"{league_id}:{user_id}"},
+                {"$set": {
+                    "league_id": league_id,
+                    "user_id": user_id,
+                    "matchdays": {
+                        str(int(matchday)): {"points": int(points), "matches": int(matches)}
+                        for matchday, points, matches in zip(rows["matchday"], rows["points"], rows["matches"])
+                    },
+                    "updated_at": stamp,
+                    "rescored_at": stamp
+                }},
+                upsert=True
+            ))
+
+        summary = {
+            "leagues": len(scope),
+            "results": len(frames["results"]),
+            "weekly_points": len(points_ops),
+            "managers": len(standings_ops),
+            "matchdays": len(summary_ops),
+            "dry_run": dry_run
+        }
+
+        if not dry_run and scope:
+            await RescoringService._write_chunked(db.weekly_points, points_ops)
+            await RescoringService._write_chunked(db.league_standings, standings_ops)
+            await RescoringService._write_chunked(db.league_matchday_summaries, summary_ops)
+            await RescoringService._write_chunked(db.manager_series, series_ops)
+
+            # Rows this run did not produce are stale (e.g. an owner who no longer holds the club)
+            stale = {"league_id": {"$in": scope}, "rescored_at": {"$ne": stamp}}
+            deleted_points = await db.weekly_points.delete_many(stale)
+            deleted_standings = await db.league_standings.delete_many(stale)
+            deleted_summaries = await db.league_matchday_summaries.delete_many(stale)
+            deleted_series = await db.manager_series.delete_many(stale)
+            summary["deleted"] = {
+                "weekly_points": deleted_points.deleted_count,
+                "standings": deleted_standings.deleted_count,
+                "matchday_summaries": deleted_summaries.deleted_count,
+                "manager_series": deleted_series.deleted_count
+            }
+            # Every table was rewritten from the recomputed weekly_points
+            await ScoringService.mark_materialized(scope)
+            await get_cache_generations().bump(scope, STANDINGS)
+
+        summary["seconds"] = round(time.perf_counter() - started, 3)
+        logger.info(f"Re-scored {summary}")
+        return summary
+
+    @staticmethod
+    def start_rescore_job(league_id: str) -> asyncio.Task:
+        """Re-score a league in the background; the outcome is recorded on its scoring rules"""
+        task = asyncio.create_task(RescoringService.rescore_league_job(league_id))
+        _rescore_jobs.add(task)
+        task.add_done_callback(_rescore_jobs.discard)
+        return task
+
+    @staticmethod
+    async def rescore_leased(league_ids: Optional[List[str]] = None) -> Dict:
+        """
+        Re-score and write the given leagues (all leagues with settled results if None)
+        while holding their scoring leases
+        """
+        if league_ids is None:
+            league_ids = sorted(await db.result_ingest.distinct("league_id", {"processed": True}))
+        async with RescoringService._holding_leases(league_ids):
+            return await RescoringService.rescore(league_ids)
+
+    @staticmethod
+    async def rescore_league_job(league_id: str) -> Optional[Dict]:
+        """
+        Re-score one league while holding its scoring lease
+        Workers skip leased leagues, so no settlement lands between the run's
+        upserts and its delete of rows it did not stamp
+        """
+        await RescoringService._record_status(league_id, "waiting")
+        try:
+            async with RescoringService._holding_leases([league_id]):
+                await RescoringService._record_status(league_id, "running")
+                summary = await RescoringService.rescore([league_id])
+            await RescoringService._record_status(league_id, "completed")
+            return summary
+        except Exception as e:
+            logger.error(f"Failed to re-score league {league_id}: {e}")
+            await RescoringService._record_status(league_id, "failed", str(e))
+            return None
+
+    @staticmethod
+    @asynccontextmanager
+    async def _holding_leases(league_ids: List[str]):
+        """Claim every league's scoring lease, renewed until the block exits, then release them"""
+        leases = ScoringLeases(worker_id=f"rescore:{default_worker_id()}")
+        claimed: List[str] = []
+        # Renew leases already held while waiting for the rest
+        renewal = asyncio.create_task(RescoringService._renew_leases(leases, claimed))
+        try:
+            for league_id in league_ids:
+                if not await RescoringService._wait_for_lease(leases, league_id):
+                    raise RuntimeError(f"Timed out waiting for the scoring worker to release league {league_id}")
+                claimed.append(league_id)
+            yield
+        finally:
+            renewal.cancel()
+            for league_id in claimed:
+                await leases.release(league_id)
+
+    @staticmethod
+    async def _wait_for_lease(leases: ScoringLeases, league_id: str) -> bool:
+        """Claim the league's lease, waiting while a worker holds it"""
+        deadline = time.monotonic() + RESCORE_LEASE_WAIT_SECONDS
+        while not await leases.claim(league_id):
+            if time.monotonic() >= deadline:
+                return False
+            await asyncio.sleep(RESCORE_LEASE_POLL_SECONDS)
+        return True
+
+    @staticmethod
+    async def _renew_leases(leases: ScoringLeases, league_ids: List[str]):
+        """Keep the claimed leases alive for as long as the run takes"""
+        while True:
+            await asyncio.sleep(leases.lease_seconds / 3)
+            for league_id in list(league_ids):
+                if not await leases.claim(league_id):
+                    logger.warning(f"Lost the scoring lease on league {league_id} while re-scoring")
+
+    @staticmethod
+    async def _record_status(league_id: str, status: str, error: Optional[str] = None):
+        """Record a job's progress on the league's scoring rules; failures are only logged"""
+        try:
+            await db.scoring_rules.update_one(
+                {"league_id": league_id},
+                {"$set": {"rescore": {
+                    "status": status,
+                    "error": error,
+                    "updated_at": datetime.now(timezone.utc)
+                }}}
+            )
+        except Exception as e:
+            logger.error(f"Failed to record re-scoring status for league {league_id}: {e}")
+
+    @staticmethod
+    async def get_rescore_status(league_id: str) -> Optional[Dict]:
+        """Latest re-scoring job status for a league, None if it was never re-scored"""
+        rules = await db.scoring_rules.find_one({"league_id": league_id}, {"rescore": 1})
+        return (rules or {}).get("rescore")
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Re-score settled results in bulk")
+    parser.add_argument("--league", action="append", dest="leagues", help="League to re-score (repeatable; default all)")
+    parser.add_argument("--dry-run", action="store_true", help="Compute and report without writing")
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+    args = parse_args(argv)
+    if args.dry_run:
+        print(asyncio.run(RescoringService.rescore(args.leagues, dry_run=True)))
+    else:
+        print(asyncio.run(RescoringService.rescore_leased(args.leagues)))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+"""
+Scoring Leases
+Per-league leases so several scoring workers can settle results without overlap
+"""
+
+import logging
+import os
+import socket
+import uuid
+from datetime import datetime, timezone, timedelta
+from typing import List, Optional
+
+from pymongo import ReturnDocument
+from pymongo.errors import DuplicateKeyError
+
+from database import db
+
+logger = logging.getLogger(__name__)
+
+# How long a claimed league stays with its worker without renewal
+SCORING_LEASE_SECONDS = int(os.getenv("SCORING_LEASE_SECONDS", "30"))
+
+def default_worker_id() -> str:
+    """Identify a worker process: host, pid and a random suffix"""
+    return f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:6]}"
+
+class ScoringLeases:
+    """
+    Lease documents in `scoring_leases`, one per league (_id = league_id)
+
+    A claim is a single findOneAndUpdate that only matches a lease that is
+    expired or already ours; when another worker holds a live lease the
+    upsert collides on _id and the claim fails. Results are partitioned by
+    league, so two workers never settle the same rows.
+    """
+
+    def __init__(self, worker_id: Optional[str] = None, lease_seconds: int = SCORING_LEASE_SECONDS):
+        self.worker_id = worker_id or default_worker_id()
+        self.lease_seconds = lease_seconds
+
+    async def pending_leagues(self) -> List[str]:
+        """Leagues with unprocessed results"""
+        return await db.result_ingest.distinct("league_id", {"processed": False})
+
+    async def claim(self, league_id: str) -> bool:
+        """Claim or renew the lease on a league; False if another worker holds it"""
+        now = datetime.now(timezone.utc)
+        try:
+            lease = await db.scoring_leases.find_one_and_update(
+                {
+                    "_id": league_id,
+                    "$or": [{"expires_at": {"$lte": now}}, {"owner": self.worker_id}]
+                },
+                {"$set": {
+                    "owner": self.worker_id,
+                    "expires_at": now + timedelta(seconds=self.lease_seconds),
+                    "claimed_at": now
+                }},
+                upsert=True,
+                return_document=ReturnDocument.AFTER
+            )
+        except DuplicateKeyError:
+            return False  # Live lease held by another worker
+        return lease is not None and lease["owner"] == self.worker_id
+
+    async def release(self, league_id: str):
+        """Give up a lease early so another worker can pick the league up"""
+        await db.scoring_leases.update_one(
+            {"_id": league_id, "owner": self.worker_id},
+            {"$set": {"expires_at": datetime.now(timezone.utc)}}
+        )
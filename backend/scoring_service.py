@@ -1,15 +1,28 @@
 import asyncio
 import logging
+import os
 from datetime import datetime, timezone, timedelta
-from typing import List, Dict, Optional, Tuple
+from typing import Iterable, List, Dict, Optional, Set, Tuple
 from motor.motor_asyncio import AsyncIOMotorClientSession
-from pymongo.errors import DuplicateKeyError
+from pymongo import UpdateOne
+from pymongo.errors import BulkWriteError, DuplicateKeyError
+from pydantic import ValidationError
 
 from models import *
 from database import db
+from scoring_leases import ScoringLeases, default_worker_id
+from matchday_calendar import get_matchday_calendars, season_for
+from cache_generations import get_cache_generations, FIXTURES, STANDINGS
+from utils.single_flight import single_flight
 
 logger = logging.getLogger(__name__)
 
+# Settle pending results in one batch per window instead of one transaction per result
+BATCH_SETTLEMENT = os.getenv("BATCH_SETTLEMENT", "true").lower() == "true"
+
+# Results upserted per bulk_write during bulk ingest
+INGEST_BULK_CHUNK = int(os.getenv("INGEST_BULK_CHUNK", "1000"))
+
 class ScoringService:
     """
     Idempotent scoring service for UCL club matches
@@ -17,34 +30,16 @@ class ScoringService:
     """
     
     @staticmethod
-    def calculate_matchday_bucket(kicked_off_at: datetime, season: str) -> Dict:
+    def calculate_matchday_bucket(
+        kicked_off_at: datetime,
+        season: Optional[str],
+        competition: Optional[str] = None
+    ) -> Dict:
         """
-        Calculate matchday bucket from match date
-        UCL typically has 6 group stage matchdays, then knockout rounds
+        Calculate matchday bucket from the competition's matchday calendar for the season
+        Await get_matchday_calendars().load(...) first so fixtures-derived calendars are used
         """
-        # Ensure kicked_off_at is timezone-aware
-        if kicked_off_at.tzinfo is None:
-            kicked_off_at = kicked_off_at.replace(tzinfo=timezone.utc)
-        
-        # Simplified matchday calculation based on date
-        season_start = datetime(2024, 9, 1, tzinfo=timezone.utc)  # UCL season start
-        days_since_start = (kicked_off_at - season_start).days
-        
-        # Group stage: 6 matchdays (roughly every 2 weeks)
-        if days_since_start < 84:  # ~12 weeks for group stage
-            matchday = min(6, max(1, (days_since_start // 14) + 1))
-            return {"type": "matchday", "value": matchday}
-        
-        # Knockout stage
-        knockout_days = days_since_start - 84
-        if knockout_days < 30:
-            return {"type": "matchday", "value": 7}  # Round of 16
-        elif knockout_days < 60:
-            return {"type": "matchday", "value": 8}  # Quarter-finals
-        elif knockout_days < 90:
-            return {"type": "matchday", "value": 9}  # Semi-finals
-        else:
-            return {"type": "matchday", "value": 10}  # Final
+        return get_matchday_calendars().get(competition, season, kicked_off_at).bucket(kicked_off_at)
     
     @staticmethod
     async def ingest_result(
@@ -67,6 +62,7 @@ class ScoringService:
             result_ingest = ResultIngest(
                 league_id=league_id,
                 match_id=match_id,
+                season=season,
                 home_ext=home_ext,
                 away_ext=away_ext,
                 home_goals=home_goals,
@@ -89,6 +85,8 @@ class ScoringService:
             )
             
             created = update_result.upserted_id is not None
+            if created:
+                await get_cache_generations().bump([league_id], FIXTURES)
             
             logger.info(f"Result ingested for match {match_id} in league {league_id}, created: {created}")
             
@@ -108,16 +106,132 @@ class ScoringService:
             }
     
     @staticmethod
-    async def process_pending_results(limit: int = 100) -> Dict:
+    async def ingest_results_bulk(results: List[ResultIngestCreate]) -> List[Dict]:
+        """
+        Ingest many results idempotently with one bulk_write of $setOnInsert upserts
+        Returns one status per result, in input order
+        """
+        received_at = utc_now()
+        statuses = []
+        operations = []
+        operation_statuses = []
+        seen = set()
+        
+        for r in results:
+            status = {"league_id": r.league_id, "match_id": r.match_id}
+            statuses.append(status)
+            if (r.league_id, r.match_id) in seen:
+                status.update(status="idempotent", idempotent=True, created=False)
+                continue
+            seen.add((r.league_id, r.match_id))
+            
+            operations.append(UpdateOne(
+                {"league_id": r.league_id, "match_id": r.match_id},
+                {"$setOnInsert": {
+                    "_id": generate_uuid(),
+                    "league_id": r.league_id,
+                    "match_id": r.match_id,
+                    "season": r.season,
+                    "home_ext": r.home_ext,
+                    "away_ext": r.away_ext,
+                    "home_goals": r.home_goals,
+                    "away_goals": r.away_goals,
+                    "kicked_off_at": r.kicked_off_at,
+                    "status": r.status or "final",
+                    "received_at": received_at,
+                    "processed": False
+                }},
+                upsert=True
+            ))
+            operation_statuses.append(status)
+        
+        if not operations:
+            return statuses
+        
+        upserted: Dict[int, str] = {}
+        errors: Dict[int, Dict] = {}
+        try:
+            write_result = await db.result_ingest.bulk_write(operations, ordered=False)
+            upserted = write_result.upserted_ids
+        except BulkWriteError as e:
+            # Concurrent upserts of the same key collide on the unique index; that is a replay
+            upserted = {u["index"]: u["_id"] for u in e.details.get("upserted", [])}
+            errors = {
+                err["index"]: err for err in e.details.get("writeErrors", [])
+                if err.get("code") != 11000
+            }
+        
+        for index, status in enumerate(operation_statuses):
+            if index in upserted:
+                status.update(status="created", idempotent=False, created=True, result_id=upserted[index])
+            elif index in errors:
+                status.update(status="error", created=False, error=errors[index].get("errmsg"))
+            else:
+                status.update(status="idempotent", idempotent=True, created=False)
+        
+        await get_cache_generations().bump(
+            [s["league_id"] for s in operation_statuses if s["status"] == "created"], FIXTURES
+        )
+        return statuses
+    
+    @staticmethod
+    async def ingest_result_stream(items) -> Dict:
+        """
+        Ingest (item, parse_error) pairs as they are parsed, upserting every INGEST_BULK_CHUNK results
+        Invalid items are reported and skipped without failing the rest
+        """
+        statuses: List[Dict] = []
+        chunk: List[ResultIngestCreate] = []
+        chunk_slots: List[int] = []
+        
+        async def flush():
+            for slot, status in zip(chunk_slots, await ScoringService.ingest_results_bulk(chunk)):
+                statuses[slot].update(status)
+            chunk.clear()
+            chunk_slots.clear()
+        
+        async for item, error in items:
+            statuses.append({"index": len(statuses)})
+            if error is None:
+                try:
+                    chunk.append(ResultIngestCreate.model_validate(item))
+                    chunk_slots.append(len(statuses) - 1)
+                except ValidationError as e:
+                    error = "; ".join(f"{'.'.join(map(str, err['loc']))}: {err['msg']}" for err in e.errors())
+            if error is not None:
+                statuses[-1].update(status="invalid", created=False, error=error)
+            if len(chunk) >= INGEST_BULK_CHUNK:
+                await flush()
+        if chunk:
+            await flush()
+        
+        counts = {"created": 0, "idempotent": 0, "invalid": 0, "error": 0}
+        for status in statuses:
+            counts[status["status"]] += 1
+        logger.info(f"Bulk result ingest: {len(statuses)} received, {counts}")
+        
+        return {"success": counts["error"] == 0, "received": len(statuses), **counts, "results": statuses}
+    
+    @staticmethod
+    async def process_pending_results(
+        limit: int = 100,
+        batch: Optional[bool] = None,
+        league_id: Optional[str] = None
+    ) -> Dict:
         """
         Process unprocessed results in order (settlement worker)
+        In batch mode the whole window settles in a handful of round trips
+        Pass league_id to settle a single leased league
         Returns processing summary
         """
         try:
             # Get unprocessed results ordered by received_at
-            unprocessed_results = await db.result_ingest.find({
-                "processed": False
-            }).sort("received_at", 1).limit(limit).to_list(length=None)
+            query = {"processed": False}
+            if league_id is not None:
+                query["league_id"] = league_id
+            unprocessed_results = await db.result_ingest.find(
+                query
+            ).sort("received_at", 1).limit(limit).to_list(length=None)
             
             if not unprocessed_results:
                 return {
@@ -126,6 +240,13 @@ class ScoringService:
                     "message": "No unprocessed results found"
                 }
             
+            use_batch = BATCH_SETTLEMENT if batch is None else batch
+            if use_batch:
+                summary = await ScoringService._process_batch(unprocessed_results)
+                if summary["processed_count"]:
+                    await get_cache_generations().bump({r["league_id"] for r in unprocessed_results}, STANDINGS)
+                return summary
+            
             processed_count = 0
             errors = []
             
@@ -141,6 +262,9 @@ class ScoringService:
                     logger.error(error_msg)
                     errors.append(error_msg)
             
+            if processed_count:
+                await get_cache_generations().bump({r["league_id"] for r in unprocessed_results}, STANDINGS)
+            
             return {
                 "success": True,
                 "processed_count": processed_count,
@@ -156,6 +280,195 @@ class ScoringService:
                 "message": f"Processing failed: {str(e)}"
             }
     
+    @staticmethod
+    async def _process_batch(results: List[Dict]) -> Dict:
+        """
+        Settle a window of results together, in one transaction where available
+        Returns processing summary
+        """
+        try:
+            try:
+                async with await db.client.start_session() as session:
+                    async with session.start_transaction():
+                        settled = await ScoringService._settle_batch(results, session)
+            except Exception as e:
+                if "Transaction numbers are only allowed" in str(e):
+                    # Fall back to non-transactional approach for local MongoDB
+                    logger.info("Using non-transactional batch settlement for local MongoDB")
+                    settled = await ScoringService._settle_batch(results, None)
+                else:
+                    raise e
+            
+            return {
+                "success": True,
+                "processed_count": settled,
+                "total_found": len(results),
+                "errors": []
+            }
+            
+        except Exception as e:
+            # Nothing is marked processed, so the window is retried on the next pass
+            error_msg = f"Batch settlement of {len(results)} results failed: {str(e)}"
+            logger.error(error_msg)
+            return {
+                "success": True,
+                "processed_count": 0,
+                "total_found": len(results),
+                "errors": [error_msg]
+            }
+    
+    @staticmethod
+    async def _settle_batch(results: List[Dict], session=None) -> int:
+        """
+        Settle results in bulk with the same idempotency as single settlement:
+        a settlement record is inserted per (league_id, match_id) before any
+        points are written, and results that already have one are skipped
+        Returns the number of results settled or found already settled
+        """
+        session_args = {"session": session} if session else {}
+        
+        # 1. Skip results settled by an earlier or concurrent pass
+        existing = await db.settlements.find(
+            {"$or": [{"league_id": r["league_id"], "match_id": r["match_id"]} for r in results]},
+            {"league_id": 1, "match_id": 1},
+            **session_args
+        ).to_list(length=None)
+        settled_keys = {(s["league_id"], s["match_id"]) for s in existing}
+        pending = [r for r in results if (r["league_id"], r["match_id"]) not in settled_keys]
+        
+        # 2. Create settlement records (idempotency guard)
+        if pending:
+            settlement_docs = [
+                Settlement(league_id=r["league_id"], match_id=r["match_id"]).dict(by_alias=True)
+                for r in pending
+            ]
+            try:
+                await db.settlements.insert_many(settlement_docs, ordered=False, **session_args)
+            except BulkWriteError as e:
+                duplicates = {err["index"] for err in e.details.get("writeErrors", []) if err.get("code") == 11000}
+                if session or len(duplicates) != len(e.details.get("writeErrors", [])):
+                    raise
+                # Race condition - another process settled these
+                pending = [r for i, r in enumerate(pending) if i not in duplicates]
+        
+        # 3. Resolve clubs and owners for the whole window, one query each
+        ext_refs = {ext for r in pending for ext in (r["home_ext"], r["away_ext"])}
+        clubs = await db.clubs.find(
+            {"ext_ref": {"$in": list(ext_refs)}}, {"ext_ref": 1}, **session_args
+        ).to_list(length=None) if pending else []
+        club_ids = {club["ext_ref"]: club["_id"] for club in clubs}
+        for ext in ext_refs - club_ids.keys():
+            logger.warning(f"Club not found for ext_ref: {ext}")
+        
+        owners: Dict[Tuple[str, str], List[str]] = {}
+        if club_ids:
+            roster_clubs = await db.roster_clubs.find(
+                {
+                    "league_id": {"$in": list({r["league_id"] for r in pending})},
+                    "club_id": {"$in": list(club_ids.values())}
+                },
+                {"league_id": 1, "club_id": 1, "user_id": 1},
+                **session_args
+            ).to_list(length=None)
+            for rc in roster_clubs:
+                owners.setdefault((rc["league_id"], rc["club_id"]), []).append(rc["user_id"])
+        
+        # 4. Compute points for every owner of every club in the window
+        rules = await ScoringService.load_scoring_rules(
+            {r["league_id"] for r in pending}, session
+        ) if pending else {}
+        materialized = await ScoringService.materialized_leagues(
+            {r["league_id"] for r in pending}, session
+        ) if pending else set()
+        calendars = get_matchday_calendars()
+        competitions = await calendars.league_competitions({r["league_id"] for r in pending}) if pending else {}
+        await calendars.load(
+            {(competitions[r["league_id"]], r.get("season") or season_for(r["kicked_off_at"])) for r in pending}
+        )
+        points_ops = []
+        standings_ops = []
+        summary_ops = []
+        series_ops = []
+        for r in pending:
+            home_points, away_points = ScoringService._match_points(
+                r["home_goals"], r["away_goals"], rules[r["league_id"]]
+            )
+            bucket = ScoringService.calculate_matchday_bucket(
+                r["kicked_off_at"], r.get("season"), competitions[r["league_id"]]
+            )
+            for ext, points in ((r["home_ext"], home_points), (r["away_ext"], away_points)):
+                for owner_id in owners.get((r["league_id"], club_ids.get(ext)), []):
+                    points_dict = WeeklyPoints(
+                        league_id=r["league_id"],
+                        user_id=owner_id,
+                        bucket=WeeklyPointsBucket(**bucket),
+                        points_delta=points,
+                        match_id=r["match_id"]
+                    ).dict(by_alias=True)
+                    points_id = points_dict.pop("_id")
+                    points_ops.append(UpdateOne(
+                        {"league_id": r["league_id"], "user_id": owner_id, "match_id": r["match_id"]},
+                        {"$set": points_dict, "$setOnInsert": {"_id": points_id}},
+                        upsert=True
+                    ))
+                    if r["league_id"] not in materialized:
+                        continue  # Rebuilt from weekly_points on first read
+                    standings_ops.append(ScoringService._standings_increment(r["league_id"], owner_id, points))
+                    summary_ops.append(ScoringService._matchday_summary_increment(
+                        r["league_id"], bucket["value"], owner_id, points
+                    ))
+                    series_ops.append(ScoringService._series_increment(
+                        r["league_id"], owner_id, bucket["value"], points
+                    ))
+        
+        # 5. Write points, standings, matchday summaries and manager series in bulk
+        if points_ops:
+            await db.weekly_points.bulk_write(points_ops, ordered=False, **session_args)
+        if standings_ops:
+            await db.league_standings.bulk_write(standings_ops, ordered=False, **session_args)
+            await db.league_matchday_summaries.bulk_write(summary_ops, ordered=False, **session_args)
+            await db.manager_series.bulk_write(series_ops, ordered=False, **session_args)
+        
+        # 6. Mark the whole window processed, including results settled earlier
+        await db.result_ingest.update_many(
+            {"_id": {"$in": [r["_id"] for r in results]}},
+            {"$set": {"processed": True}},
+            **session_args
+        )
+        
+        logger.info(
+            f"Batch settled {len(pending)} results ({len(results) - len(pending)} already settled), "
+            f"{len(points_ops)} owner point entries"
+        )
+        return len(results)
+    
+    @staticmethod
+    async def load_scoring_rules(league_ids, session=None) -> Dict[str, Dict]:
+        """
+        Scoring rules per league from `scoring_rules`
+        Leagues without a rules document score with the defaults
+        """
+        league_ids = list(league_ids)
+        docs = await db.scoring_rules.find(
+            {"league_id": {"$in": league_ids}}, {"league_id": 1, "rules": 1},
+            **({"session": session} if session else {})
+        ).to_list(length=None)
+        rules = {doc["league_id"]: ScoringRulePoints(**doc["rules"]).dict() for doc in docs}
+        defaults = ScoringRulePoints().dict()
+        return {league_id: rules.get(league_id, defaults) for league_id in league_ids}
+    
+    @staticmethod
+    def _match_points(home_goals: int, away_goals: int, rules: Optional[Dict] = None) -> Tuple[int, int]:
+        """Points for the home and away clubs: per goal plus win or draw (default +1/goal, +3/win, +1/draw)"""
+        rules = rules or ScoringRulePoints().dict()
+        home_points = home_goals * rules["club_goal"]
+        away_points = away_goals * rules["club_goal"]
+        if home_goals > away_goals:
+            return home_points + rules["club_win"], away_points
+        if away_goals > home_goals:
+            return home_points, away_points + rules["club_win"]
+        return home_points + rules["club_draw"], away_points + rules["club_draw"]
+    
     @staticmethod
     async def _process_single_result(result: Dict) -> bool:
         """
@@ -248,30 +561,26 @@ class ScoringService:
                 result["league_id"], result["away_ext"], session
             )
             
-            # 3. Calculate points for each owner
+            # 3. Calculate points for each owner under the league's scoring rules
             home_goals = result["home_goals"]
             away_goals = result["away_goals"]
-            
-            # Determine match result
-            if home_goals > away_goals:
-                home_result_points = 3  # Win
-                away_result_points = 0  # Loss
-            elif away_goals > home_goals:
-                home_result_points = 0  # Loss
-                away_result_points = 3  # Win
-            else:
-                home_result_points = 1  # Draw
-                away_result_points = 1  # Draw
+            rules = await ScoringService.load_scoring_rules([result["league_id"]], session)
+            home_total, away_total = ScoringService._match_points(
+                home_goals, away_goals, rules[result["league_id"]]
+            )
             
             # Calculate matchday bucket
-            bucket = ScoringService.calculate_matchday_bucket(
-                result["kicked_off_at"], 
-                result.get("season", "2024-25")
-            )
+            season = result.get("season") or season_for(result["kicked_off_at"])
+            calendars = get_matchday_calendars()
+            competition = (await calendars.league_competitions([result["league_id"]]))[result["league_id"]]
+            await calendars.load([(competition, season)])
+            bucket = ScoringService.calculate_matchday_bucket(result["kicked_off_at"], season, competition)
             
             # 4. Create/update weekly points for home team owners
+            owner_points = []
             for owner_id in home_owners:
-                total_points = home_goals + home_result_points  # Goals + result
+                total_points = home_total  # Goals + result
+                owner_points.append((owner_id, total_points))
                 await ScoringService._upsert_weekly_points(
                     result["league_id"],
                     owner_id,
@@ -283,7 +592,8 @@ class ScoringService:
             
             # 5. Create/update weekly points for away team owners
             for owner_id in away_owners:
-                total_points = away_goals + away_result_points  # Goals + result
+                total_points = away_total  # Goals + result
+                owner_points.append((owner_id, total_points))
                 await ScoringService._upsert_weekly_points(
                     result["league_id"],
                     owner_id,
@@ -293,7 +603,40 @@ class ScoringService:
                     session
                 )
             
-            # 6. Mark result as processed
+            # 6. Roll the points into the materialized standings
+            # Safe to $inc: the settlement record guarantees one pass per match
+            if owner_points and await ScoringService.materialized_leagues([result["league_id"]], session):
+                session_args = {"session": session} if session else {}
+                await db.league_standings.bulk_write(
+                    [
+                        ScoringService._standings_increment(result["league_id"], owner_id, points)
+                        for owner_id, points in owner_points
+                    ],
+                    ordered=False,
+                    **session_args
+                )
+                await db.league_matchday_summaries.bulk_write(
+                    [
+                        ScoringService._matchday_summary_increment(
+                            result["league_id"], bucket["value"], owner_id, points
+                        )
+                        for owner_id, points in owner_points
+                    ],
+                    ordered=False,
+                    **session_args
+                )
+                await db.manager_series.bulk_write(
+                    [
+                        ScoringService._series_increment(
+                            result["league_id"], owner_id, bucket["value"], points
+                        )
+                        for owner_id, points in owner_points
+                    ],
+                    ordered=False,
+                    **session_args
+                )
+            
+            # 7. Mark result as processed
             await db.result_ingest.update_one(
                 {"_id": result["_id"]},
                 {"$set": {"processed": True}},
@@ -403,61 +746,297 @@ class ScoringService:
             return False
     
     @staticmethod
+    def _standings_increment(league_id: str, user_id: str, points: int) -> UpdateOne:
+        """Standings update for one owner's points from one settled match"""
+        return UpdateOne(
+            {"league_id": league_id, "user_id": user_id},
+            {
+                "$inc": {"total_points": points, "matches_played": 1},
+                "$set": {"updated_at": datetime.now(timezone.utc)},
+                "$setOnInsert": {"_id": generate_uuid()}
+            },
+            upsert=True
+        )
+    
+    @staticmethod
+    def _matchday_summary_increment(league_id: str, matchday: int, user_id: str, points: int) -> UpdateOne:
+        """Matchday summary update for one owner's points from one settled match"""
+        return UpdateOne(
+            {"_id": f"{league_id}:{matchday}"},
+            {
+                "$inc": {
+                    "total_points": points,
+                    "total_matches": 1,
+                    f"managers.{user_id}.points": points,
+                    f"managers.{user_id}.matches": 1
+                },
+                "$set": {"updated_at": datetime.now(timezone.utc)},
+                "$setOnInsert": {"league_id": league_id, "matchday": matchday}
+            },
+            upsert=True
+        )
+    
+    @staticmethod
+    def _series_increment(league_id: str, user_id: str, matchday: int, points: int) -> UpdateOne:
+        """Manager series update for one owner's points from one settled match"""
+        return UpdateOne(
+            {"_id": f"{league_id}:{user_id}"},
+            {
+                "$inc": {
+                    f"matchdays.{matchday}.points": points,
+                    f"matchdays.{matchday}.matches": 1
+                },
+                "$set": {"updated_at": datetime.now(timezone.utc)},
+                "$setOnInsert": {"league_id": league_id, "user_id": user_id}
+            },
+            upsert=True
+        )
+    
+    @staticmethod
+    async def materialized_leagues(league_ids: Iterable[str], session=None) -> Set[str]:
+        """
+        Leagues whose standings, matchday summaries and manager series were rebuilt
+        from weekly_points and are kept current by settlement since
+        Settlement only $incs these tables for such leagues; the others are
+        rebuilt on first read
+        """
+        docs = await db.materialized_leagues.find(
+            {"_id": {"$in": list(league_ids)}}, {"_id": 1},
+            **({"session": session} if session else {})
+        ).to_list(length=None)
+        return {doc["_id"] for doc in docs}
+    
+    @staticmethod
+    async def mark_materialized(league_ids: Iterable[str]):
+        """Record that these leagues' materialized tables match weekly_points"""
+        rebuilt_at = datetime.now(timezone.utc)
+        operations = [
+            UpdateOne({"_id": league_id}, {"$set": {"rebuilt_at": rebuilt_at}}, upsert=True)
+            for league_id in set(league_ids)
+        ]
+        if operations:
+            await db.materialized_leagues.bulk_write(operations, ordered=False)
+    
+    @staticmethod
+    async def ensure_materialized(league_id: str) -> bool:
+        """
+        Rebuild a league's materialized tables if they were never rebuilt
+        The rebuild holds the league's scoring lease so no settlement lands between
+        reading weekly_points and marking the league; if a worker holds it the
+        rebuild is left to a later read
+        Returns whether the tables are current
+        """
+        if await ScoringService.materialized_leagues([league_id]):
+            return True
+        
+        leases = ScoringLeases(worker_id=f"rebuild:{default_worker_id()}")
+        if not await leases.claim(league_id):
+            logger.info(f"League {league_id} is being settled; deferring its standings rebuild")
+            return False
+        try:
+            await ScoringService.rebuild_league_standings(league_id)
+        finally:
+            await leases.release(league_id)
+        await get_cache_generations().bump([league_id], STANDINGS)
+        return True
+    
+    @staticmethod
+    async def rebuild_league_standings(league_id: str) -> int:
+        """
+        Rebuild a league's materialized standings, matchday summaries and manager
+        series from weekly_points, then mark the league materialized
+        Callers hold the league's scoring lease
+        Returns the number of standings rows written
+        """
+        totals = await db.weekly_points.aggregate([
+            {"$match": {"league_id": league_id}},
+            {"$group": {
+                "_id": "$user_id",
+                "total_points": {"$sum": "$points_delta"},
+                "matches_played": {"$sum": 1}
+            }}
+        ]).to_list(length=None)
+        
+        await db.league_standings.delete_many({"league_id": league_id})
+        if totals:
+            updated_at = datetime.now(timezone.utc)
+            await db.league_standings.insert_many([
+                {
+                    "_id": generate_uuid(),
+                    "league_id": league_id,
+                    "user_id": row["_id"],
+                    "total_points": row["total_points"],
+                    "matches_played": row["matches_played"],
+                    "updated_at": updated_at
+                }
+                for row in totals
+            ])
+        await ScoringService.rebuild_matchday_summaries(league_id)
+        await ScoringService.rebuild_manager_series(league_id)
+        await ScoringService.mark_materialized([league_id])
+        logger.info(f"Rebuilt standings for league {league_id}: {len(totals)} managers")
+        return len(totals)
+    
+    @staticmethod
+    async def rebuild_matchday_summaries(league_id: str) -> int:
+        """
+        Rebuild a league's per-matchday summaries from weekly_points
+        Returns the number of matchdays written
+        """
+        rows = await db.weekly_points.aggregate([
+            {"$match": {"league_id": league_id}},
+            {"$group": {
+                "_id": {"matchday": "$bucket.value", "user_id": "$user_id"},
+                "points": {"$sum": "$points_delta"},
+                "matches": {"$sum": 1}
+            }}
+        ]).to_list(length=None)
+        
+        summaries: Dict[int, Dict] = {}
+        updated_at = datetime.now(timezone.utc)
+        for row in rows:
+            matchday = row["_id"]["matchday"]
+            summary = summaries.setdefault(matchday, {
+                "_id": f"{league_id}:{matchday}",
+                "league_id": league_id,
+                "matchday": matchday,
+                "total_points": 0,
+                "total_matches": 0,
+                "managers": {},
+                "updated_at": updated_at
+            })
+            summary["total_points"] += row["points"]
+            summary["total_matches"] += row["matches"]
+            summary["managers"][row["_id"]["user_id"]] = {"points": row["points"], "matches": row["matches"]}
+        
+        await db.league_matchday_summaries.delete_many({"league_id": league_id})
+        if summaries:
+            await db.league_matchday_summaries.insert_many(list(summaries.values()))
+        return len(summaries)
+    
+    @staticmethod
+    async def load_matchday_summaries(
+        league_id: str,
+        before: Optional[int] = None,
+        limit: int = 5
+    ) -> Tuple[List[Dict], bool]:
+        """
+        Up to `limit` matchday summaries for a league, latest first, older than `before` if given
+        Returns (summaries, has_more)
+        """
+        await ScoringService.ensure_materialized(league_id)
+        query = {"league_id": league_id}
+        if before is not None:
+            query["matchday"] = {"$lt": before}
+        summaries = await db.league_matchday_summaries.find(query).sort("matchday", -1).limit(limit + 1).to_list(length=None)
+        return summaries[:limit], len(summaries) > limit
+    
+    @staticmethod
+    async def rebuild_manager_series(league_id: str) -> int:
+        """
+        Rebuild a league's per-manager matchday series from weekly_points
+        Returns the number of managers written
+        """
+        rows = await db.weekly_points.aggregate([
+            {"$match": {"league_id": league_id}},
+            {"$group": {
+                "_id": {"user_id": "$user_id", "matchday": "$bucket.value"},
+                "points": {"$sum": "$points_delta"},
+                "matches": {"$sum": 1}
+            }}
+        ]).to_list(length=None)
+        
+        series: Dict[str, Dict] = {}
+        updated_at = datetime.now(timezone.utc)
+        for row in rows:
+            user_id = row["_id"]["user_id"]
+            doc = series.setdefault(user_id, {
+                "_id": f"{league_id}:{user_id}",
+                "league_id": league_id,
+                "user_id": user_id,
+                "matchdays": {},
+                "updated_at": updated_at
+            })
+            doc["matchdays"][str(row["_id"]["matchday"])] = {"points": row["points"], "matches": row["matches"]}
+        
+        await db.manager_series.delete_many({"league_id": league_id})
+        if series:
+            await db.manager_series.insert_many(list(series.values()))
+        return len(series)
+    
+    @staticmethod
+    async def load_manager_series(league_id: str, user_ids: Optional[List[str]] = None) -> List[Dict]:
+        """
+        Per-manager matchday series for a league, all managers or only `user_ids`
+        Each document maps matchday (as a string key) to {points, matches}
+        """
+        await ScoringService.ensure_materialized(league_id)
+        query = {"league_id": league_id}
+        if user_ids is not None:
+            query["user_id"] = {"$in": list(user_ids)}
+        return await db.manager_series.find(query).to_list(length=None)
+    
+    @staticmethod
+    async def load_league_standings(league_id: str) -> List[Dict]:
+        """
+        Materialized standings rows for a league, highest total first,
+        with each manager's user and roster details attached
+        """
+        await ScoringService.ensure_materialized(league_id)
+        rows = await db.league_standings.find(
+            {"league_id": league_id}
+        ).sort([("total_points", -1), ("user_id", 1)]).to_list(length=None)
+        if not rows:
+            return []
+        
+        user_ids = [row["user_id"] for row in rows]
+        users = await db.users.find(
+            {"_id": {"$in": user_ids}}, {"display_name": 1, "email": 1}
+        ).to_list(length=None)
+        rosters = await db.rosters.find(
+            {"league_id": league_id, "user_id": {"$in": user_ids}},
+            {"user_id": 1, "budget_remaining": 1, "budget_start": 1, "club_slots": 1}
+        ).to_list(length=None)
+        users_by_id = {user["_id"]: user for user in users}
+        rosters_by_user = {roster["user_id"]: roster for roster in rosters}
+        
+        # Managers without a user or roster are dropped, as the $unwind joins did
+        standings = []
+        for row in rows:
+            user = users_by_id.get(row["user_id"])
+            roster = rosters_by_user.get(row["user_id"])
+            if user and roster:
+                standings.append({**row, "user": user, "roster": roster})
+        return standings
+    
+    @staticmethod
+    @single_flight
     async def get_league_standings(league_id: str) -> List[Dict]:
         """
         Get current league standings with total points
         """
         try:
-            pipeline = [
-                {"$match": {"league_id": league_id}},
-                {"$group": {
-                    "_id": "$user_id",
-                    "total_points": {"$sum": "$points_delta"},
-                    "matches_played": {"$sum": 1}
-                }},
-                {"$lookup": {
-                    "from": "users",
-                    "localField": "_id",
-                    "foreignField": "_id",
-                    "as": "user"
-                }},
-                {"$unwind": "$user"},
-                {"$lookup": {
-                    "from": "rosters",
-                    "let": {"user_id": "$_id", "league_id": league_id},
-                    "pipeline": [
-                        {"$match": {
-                            "$expr": {
-                                "$and": [
-                                    {"$eq": ["$user_id", "$$user_id"]},
-                                    {"$eq": ["$league_id", "$$league_id"]}
-                                ]
-                            }
-                        }}
-                    ],
-                    "as": "roster"
-                }},
-                {"$unwind": "$roster"},
-                {"$project": {
-                    "user_id": "$_id",
-                    "display_name": "$user.display_name",
-                    "email": "$user.email",
-                    "total_points": 1,
-                    "matches_played": 1,
-                    "budget_remaining": "$roster.budget_remaining",
-                    "clubs_owned": {"$subtract": ["$roster.club_slots", {"$divide": ["$roster.budget_remaining", 10]}]}  # Approximation
-                }},
-                {"$sort": {"total_points": -1}}
+            rows = await ScoringService.load_league_standings(league_id)
+            return [
+                {
+                    "_id": row["user_id"],
+                    "user_id": row["user_id"],
+                    "display_name": row["user"]["display_name"],
+                    "email": row["user"]["email"],
+                    "total_points": row["total_points"],
+                    "matches_played": row["matches_played"],
+                    "budget_remaining": row["roster"]["budget_remaining"],
+                    "clubs_owned": row["roster"].get("club_slots", 0) - row["roster"]["budget_remaining"] / 10  # Approximation
+                }
+                for row in rows
             ]
             
-            standings = await db.weekly_points.aggregate(pipeline).to_list(length=None)
-            return standings
-            
         except Exception as e:
             logger.error(f"Failed to get league standings: {e}")
             return []
     
     @staticmethod
+    @single_flight
     async def get_user_match_history(league_id: str, user_id: str) -> List[Dict]:
         """
         Get match history and points for a specific user
@@ -497,39 +1076,118 @@ class ScoringWorker:
     """
     Background worker for processing match results
     Can be run as cron job or continuous queue processor
+
+    Wakes as soon as a result is ingested: through notify() from the ingest
+    endpoint, or a result_ingest change stream where the deployment supports
+    one. interval_seconds is only the fallback poll for results written by
+    other processes. Bursts drain one window of batch_size at a time.
+
+    Each pass only settles leagues this worker has claimed in `scoring_leases`,
+    renewing the lease while a window settles, so the in-process worker,
+    standalone workers and re-scoring jobs can run side by side.
     """
     
-    def __init__(self, interval_seconds: int = 60):
+    def __init__(
+        self,
+        interval_seconds: int = 60,
+        batch_size: int = 100,
+        leases: Optional[ScoringLeases] = None
+    ):
         self.interval_seconds = interval_seconds
+        self.batch_size = batch_size
+        self.leases = leases or ScoringLeases()
         self.running = False
+        self.wakeup = asyncio.Event()
+        self.watch_task: Optional[asyncio.Task] = None
+    
+    def notify(self):
+        """Signal that new results are waiting; repeated signals coalesce"""
+        self.wakeup.set()
+    
+    async def _watch_result_ingest(self):
+        """Notify on result_ingest inserts via a change stream, if available"""
+        try:
+            async with db.result_ingest.watch([{"$match": {"operationType": "insert"}}]) as stream:
+                logger.info("Scoring worker listening for results on change stream")
+                async for _ in stream:
+                    self.notify()
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.info(f"Result change stream unavailable, using notifications and polling: {e}")
     
     async def start_continuous_processing(self):
         """Start continuous processing of results"""
         self.running = True
         logger.info("Starting continuous scoring worker")
+        self.watch_task = asyncio.create_task(self._watch_result_ingest())
         
         while self.running:
             try:
-                result = await ScoringService.process_pending_results()
+                self.wakeup.clear()
+                result = await self._process_pass()
                 if result["processed_count"] > 0:
                     logger.info(f"Processed {result['processed_count']} results")
                 
-                await asyncio.sleep(self.interval_seconds)
+                # A full window means more are waiting: keep draining, yielding between windows
+                if result.get("total_found", 0) >= self.batch_size and result["processed_count"] > 0:
+                    await asyncio.sleep(0)
+                    continue
+                
+                try:
+                    await asyncio.wait_for(self.wakeup.wait(), timeout=self.interval_seconds)
+                except asyncio.TimeoutError:
+                    pass  # Fallback poll
                 
             except Exception as e:
                 logger.error(f"Scoring worker error: {e}")
                 await asyncio.sleep(self.interval_seconds)
+        
+        if self.watch_task:
+            self.watch_task.cancel()
+    
+    async def _process_pass(self) -> Dict:
+        """Settle one window of results per claimed league"""
+        processed_count = 0
+        backlog = False
+        for league_id in await self.leases.pending_leagues():
+            if not await self.leases.claim(league_id):
+                continue  # Another worker or a re-scoring job holds this league
+            renewal = asyncio.create_task(self._renew_lease(league_id))
+            try:
+                result = await ScoringService.process_pending_results(
+                    limit=self.batch_size, league_id=league_id
+                )
+            finally:
+                renewal.cancel()
+                await self.leases.release(league_id)
+            processed_count += result["processed_count"]
+            if result.get("total_found", 0) >= self.batch_size and result["processed_count"] > 0:
+                backlog = True
+        
+        return {
+            "processed_count": processed_count,
+            "total_found": self.batch_size if backlog else 0  # A full window means keep draining
+        }
+    
+    async def _renew_lease(self, league_id: str):
+        """Keep a league's lease alive while a slow window settles"""
+        while True:
+            await asyncio.sleep(self.leases.lease_seconds / 3)
+            if not await self.leases.claim(league_id):
+                logger.warning(f"Lost the scoring lease on league {league_id} mid-window")
     
     def stop(self):
         """Stop continuous processing"""
         self.running = False
+        self.wakeup.set()
         logger.info("Stopping scoring worker")
     
     @staticmethod
     async def run_once():
-        """Process all pending results once (for cron jobs)"""
+        """Process one window of pending results per league once (for cron jobs)"""
         logger.info("Running scoring worker once")
-        result = await ScoringService.process_pending_results()
+        result = await ScoringWorker()._process_pass()
         logger.info(f"Scoring worker completed: {result}")
         return result
 
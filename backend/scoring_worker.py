@@ -0,0 +1,54 @@
+#!/usr/bin/env python3
+"""
+Standalone Scoring Worker
+Runs result settlement outside the API process; start as many as needed
+
+    python scoring_worker.py [--interval 5] [--batch-size 100] [--worker-id ID]
+
+Workers partition pending results by league through `scoring_leases`, so
+running several, alongside the API's in-process worker, never settles the
+same rows twice. Set SCORING_WORKER_IN_PROCESS=false on the API servers to
+leave settlement to these processes.
+"""
+
+import argparse
+import asyncio
+import logging
+import signal
+
+from scoring_leases import ScoringLeases, SCORING_LEASE_SECONDS
+from scoring_service import ScoringWorker
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Run a scoring worker process")
+    parser.add_argument("--interval", type=float, default=5,
+                        help="Fallback poll interval in seconds when no change stream is available")
+    parser.add_argument("--batch-size", type=int, default=100, help="Results settled per league per window")
+    parser.add_argument("--lease-seconds", type=int, default=SCORING_LEASE_SECONDS,
+                        help="How long a claimed league is held without renewal")
+    parser.add_argument("--worker-id", default=None, help="Lease owner id (defaults to host:pid:random)")
+    return parser.parse_args(argv)
+
+async def run(args):
+    leases = ScoringLeases(worker_id=args.worker_id, lease_seconds=args.lease_seconds)
+    worker = ScoringWorker(interval_seconds=args.interval, batch_size=args.batch_size, leases=leases)
+
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, worker.stop)
+
+    logger.info(f"Scoring worker {leases.worker_id} starting")
+    await worker.start_continuous_processing()
+    logger.info(f"Scoring worker {leases.worker_id} stopped")
+
+def main(argv=None):
+    asyncio.run(run(parse_args(argv)))
+
+if __name__ == "__main__":
+    main()
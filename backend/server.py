@@ -1,11 +1,15 @@
 from fastapi import FastAPI, APIRouter, HTTPException, Depends, Request, status
 from fastapi.responses import Response
+from fastapi.encoders import jsonable_encoder
 from dotenv import load_dotenv
 from starlette.middleware.cors import CORSMiddleware
 from starlette.middleware.base import BaseHTTPMiddleware
 from starlette.responses import JSONResponse
 from motor.motor_asyncio import AsyncIOMotorClient
 import os
+import asyncio
+import json
+import hashlib
 import logging
 import socketio
 from pathlib import Path
@@ -19,19 +23,27 @@ from league_service import LeagueService
 from auth import (
     create_access_token, create_magic_link_token, verify_magic_link_token,
     send_magic_link_email, get_current_user, get_current_verified_user,
-    require_league_access, require_commissioner_access, AccessControl
+    require_league_access, require_commissioner_access, AccessControl,
+    invalidate_principal
 )
 
 # Import auction, scoring, aggregation, admin, and competition modules
 from auction_engine import initialize_auction_engine, get_auction_engine
-from scoring_service import ScoringService, get_scoring_worker
+from socket_handler import sio  # Socket.IO server with its event handlers registered
+from lot_state import WriteBehindError
+from scoring_service import ScoringService, ScoringWorker, get_scoring_worker
+from rescoring_service import RescoringService
 from aggregation_service import AggregationService
 from admin_service import AdminService
 from audit_service import AuditService
 from lot_closing_service import LotClosingService
+from deadline_scheduler import get_deadline_scheduler
+from membership_cache import get_membership_cache
+from cache_generations import get_cache_generations, FIXTURES, STANDINGS
 from competition_service import CompetitionService
 from time_provider import time_provider, now, now_ms, is_test_mode
 from database_indexes import initialize_scoring_indexes
+from utils.json_stream import iter_json_items
 
 ROOT_DIR = Path(__file__).parent
 load_dotenv(ROOT_DIR / '.env')
@@ -51,28 +63,6 @@ FRONTEND_ORIGIN = os.getenv("FRONTEND_ORIGIN", "http://localhost:3000")
 SOCKET_PATH = os.getenv("SOCKET_PATH", "/api/socketio")
 SOCKETIO_PATH_INTERNAL = SOCKET_PATH.lstrip("/")  # "api/socketio"
 
-# Create Socket.IO server
-sio = socketio.AsyncServer(async_mode="asgi", cors_allowed_origins=[FRONTEND_ORIGIN])
-
-# Socket.IO event handlers
-@sio.event
-async def connect(sid, environ):
-    """Handle client connection"""
-    print(f"Socket.IO client connected: {sid}")
-
-@sio.event
-async def disconnect(sid):
-    """Handle client disconnection"""
-    print(f"Socket.IO client disconnected: {sid}")
-
-@sio.event
-async def join_auction(sid, data):
-    """Join auction room"""
-    auction_id = data.get('auction_id')
-    if auction_id:
-        await sio.enter_room(sid, f"auction_{auction_id}")
-        await sio.emit('joined', {'auction_id': auction_id}, to=sid)
-
 # Create FastAPI app
 fastapi_app = FastAPI(title="Friends of PIFA API", version="1.0.0")
 
@@ -127,6 +117,17 @@ def convert_doc_to_response(doc, response_class):
     
     return response_class(**converted)
 
+def etag_response(request: Request, content, etag: str = None) -> Response:
+    """
+    JSON response with an ETag; 304 when the client already has it
+    The ETag is a content hash unless the caller supplies a version-based one
+    """
+    body = json.dumps(content, sort_keys=True, separators=(",", ":"))
+    etag = etag or f'"{hashlib.sha1(body.encode()).hexdigest()}"'
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers={"ETag": etag})
+    return Response(content=body, media_type="application/json", headers={"ETag": etag})
+
 # Create a router with the /api prefix
 api_router = APIRouter(prefix="/api")
 
@@ -195,10 +196,11 @@ async def startup_event():
     
     initialize_auction_engine(sio)  # Initialize with Socket.IO server
     
-    # Start scoring worker in background
+    # Start scoring worker in background; it wakes on ingest rather than polling
     scoring_worker = get_scoring_worker()
-    # Note: In production, run scoring worker as separate process/container
-    # asyncio.create_task(scoring_worker.start_continuous_processing())
+    # Note: In production, run scoring_worker.py as separate processes/containers
+    if os.getenv("SCORING_WORKER_IN_PROCESS", "true").lower() == "true":
+        asyncio.create_task(scoring_worker.start_continuous_processing())
     
     logger.info("Friends of PIFA API with Live Auction Engine and Scoring System started successfully")
 
@@ -207,6 +209,12 @@ async def shutdown_event():
     """Clean up on shutdown"""
     scoring_worker = get_scoring_worker()
     scoring_worker.stop()
+    
+    # Accepted bids live only in the write-behind queue until flushed
+    try:
+        await get_auction_engine().write_behind.stop()
+    except WriteBehindError as e:
+        logger.error(f"Bids or lot updates could not be persisted at shutdown: {e}")
     logger.info("Friends of PIFA API shutting down")
 
 # Health check endpoint
@@ -328,6 +336,7 @@ async def verify_magic_link(request: MagicLinkVerify):
         {"_id": user["_id"]},
         {"$set": {"verified": True}}
     )
+    invalidate_principal(user["_id"])
     
     # Create access token
     access_token = create_access_token(data={"sub": user["_id"]})
@@ -424,6 +433,7 @@ async def test_login(request: dict, response: Response):
                 {"_id": existing_user["_id"]}, 
                 {"$set": {"verified": True}}
             )
+            invalidate_principal(existing_user["_id"])
             user_doc = {**existing_user, "verified": True}
             logger.info(f"[{request_id}] 🧪 TEST USER VERIFIED: {email}")
         else:
@@ -798,6 +808,7 @@ async def add_test_member(request: dict):
     else:
         # Ensure user is verified for testing
         await db.users.update_one({"_id": user["_id"]}, {"$set": {"verified": True}})
+        invalidate_principal(user["_id"])
         logger.info("🧪 TEST USER VERIFIED: %s", email)
     
     # Add user to league
@@ -1066,11 +1077,15 @@ async def reset_test_scoring(request: dict):
     # Clear weeklyPoints for the league
     weekly_points_result = await db.weeklyPoints.delete_many({"league_id": league_id})
     
+    # Clear materialized standings for the league
+    await db.league_standings.delete_many({"league_id": league_id})
+    
     # Clear settlements for the league
     settlements_result = await db.settlements.delete_many({"league_id": league_id})
     
     # Clear result_ingest for the league
     result_ingest_result = await db.result_ingest.delete_many({"league_id": league_id})
+    await get_cache_generations().bump([league_id], FIXTURES, STANDINGS)
     
     logger.info("🧪 TEST SCORING RESET: %s (weeklyPoints: %d, settlements: %d, result_ingest: %d)", 
                league_id, 
@@ -1118,6 +1133,12 @@ async def update_profile(
         {"_id": current_user.id},
         {"$set": {"display_name": display_name}}
     )
+    get_auction_engine().invalidate_user_display(current_user.id)
+    invalidate_principal(current_user.id)
+    # Fixtures badges and leaderboards show the display name
+    await get_cache_generations().bump(
+        await db.memberships.distinct("league_id", {"user_id": current_user.id}), FIXTURES, STANDINGS
+    )
     
     updated_user = await db.users.find_one({"_id": current_user.id})
     return UserResponse(
@@ -1207,27 +1228,36 @@ async def create_league(
         )
 
 @api_router.get("/leagues", response_model=List[LeagueResponse])
-async def get_my_leagues(current_user: UserResponse = Depends(get_current_verified_user)):
+async def get_my_leagues(request: Request, current_user: UserResponse = Depends(get_current_verified_user)):
     """Get leagues where current user is a member"""
-    memberships = await db.memberships.find({"user_id": current_user.id}).to_list(length=None)
-    league_ids = [m["league_id"] for m in memberships]
-    
-    leagues = await db.leagues.find({"_id": {"$in": league_ids}}).to_list(length=None)
-    
-    # Add missing fields for each league
-    enriched_leagues = []
-    for league in leagues:
-        # Add status field (default to 'setup' if not present)
-        if 'status' not in league:
-            league['status'] = 'setup'
-        
-        # Add member_count by counting memberships
-        member_count = await db.memberships.count_documents({"league_id": league["_id"]})
-        league['member_count'] = member_count
-        
-        enriched_leagues.append(league)
+    # One round trip: memberships -> leagues, with each league's member count
+    leagues = await db.memberships.aggregate([
+        {"$match": {"user_id": current_user.id}},
+        {"$group": {"_id": "$league_id"}},
+        {"$lookup": {"from": "leagues", "localField": "_id", "foreignField": "_id", "as": "league"}},
+        {"$unwind": "$league"},
+        {"$lookup": {
+            "from": "memberships",
+            "let": {"league_id": "$_id"},
+            "pipeline": [
+                {"$match": {"$expr": {"$eq": ["$league_id", "$$league_id"]}}},
+                {"$count": "count"}
+            ],
+            "as": "members"
+        }},
+        {"$replaceRoot": {"newRoot": {"$mergeObjects": [
+            "$league",
+            {
+                # Add status field (default to 'setup' if not present)
+                "status": {"$ifNull": ["$league.status", "setup"]},
+                "member_count": {"$ifNull": [{"$arrayElemAt": ["$members.count", 0]}, 0]}
+            }
+        ]}}},
+        {"$sort": {"created_at": 1, "_id": 1}}
+    ]).to_list(length=None)
     
-    return [convert_doc_to_response(league, LeagueResponse) for league in enriched_leagues]
+    content = jsonable_encoder([convert_doc_to_response(league, LeagueResponse) for league in leagues])
+    return etag_response(request, content)
 
 @api_router.get("/leagues/{league_id}", response_model=LeagueResponse)
 async def get_league(
@@ -1326,6 +1356,7 @@ async def join_league_direct(
     )
     membership_dict = membership.dict(by_alias=True)
     await db.memberships.insert_one(membership_dict)
+    await get_membership_cache().invalidate_league(league_id)
     
     # Create roster
     roster = Roster(
@@ -1374,18 +1405,12 @@ async def get_league_status(
     await require_league_access(current_user.id, league_id)
     
     try:
-        is_ready = await LeagueService.validate_league_ready(league_id)
-        league = await db.leagues.find_one({"_id": league_id})
-        
-        return {
-            "league_id": league_id,
-            "status": league["status"],
-            "member_count": league["member_count"],
-            "min_members": league["settings"]["league_size"]["min"],
-            "max_members": league["settings"]["league_size"]["max"],
-            "is_ready": is_ready,
-            "can_start_auction": is_ready and league["status"] == "ready"
-        }
+        league_status = await LeagueService.get_league_status(league_id)
+        if league_status is None:
+            raise HTTPException(status_code=404, detail="League not found")
+        return league_status
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Failed to get league status: {e}")
         raise HTTPException(status_code=500, detail="Failed to get league status")
@@ -1709,6 +1734,10 @@ async def ingest_final_result(result_data: ResultIngestCreate):
         )
         
         if result["success"]:
+            # Wake the scoring worker so standings update right away
+            if result["created"]:
+                get_scoring_worker().notify()
+            
             # Add idempotent field to indicate this was a new ingestion
             result["idempotent"] = False
             return result
@@ -1721,11 +1750,30 @@ async def ingest_final_result(result_data: ResultIngestCreate):
         logger.error(f"Failed to ingest result: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
+@api_router.post("/ingest/final_results")
+async def ingest_final_results(request: Request):
+    """
+    Bulk ingest final match results from NDJSON or a JSON array (idempotent per result)
+    The body is parsed as it streams; each result gets its own created/idempotent/invalid status
+    """
+    try:
+        summary = await ScoringService.ingest_result_stream(iter_json_items(request.stream()))
+        
+        if summary["created"]:
+            get_scoring_worker().notify()
+        
+        return summary
+        
+    except Exception as e:
+        logger.error(f"Failed to bulk ingest results: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
 @api_router.post("/scoring/process")
 async def process_pending_results(current_user: UserResponse = Depends(get_current_verified_user)):
     """Process pending results (manual trigger for testing)"""
     try:
-        result = await ScoringService.process_pending_results()
+        # Settles under league leases like the background workers
+        result = await ScoringWorker.run_once()
         return result
     except Exception as e:
         logger.error(f"Failed to process results: {e}")
@@ -1825,6 +1873,20 @@ async def update_league_settings_admin(
         logger.error(f"Failed to update league settings: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
+@api_router.get("/admin/leagues/{league_id}/rescore")
+async def get_league_rescore_status(
+    league_id: str,
+    current_user: UserResponse = Depends(get_current_verified_user)
+):
+    """Get the status of the league's latest re-scoring job"""
+    await require_league_access(current_user.id, league_id)
+    
+    try:
+        return {"league_id": league_id, "rescore": await RescoringService.get_rescore_status(league_id)}
+    except Exception as e:
+        logger.error(f"Failed to get re-scoring status: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
 @api_router.patch("/leagues/{league_id}/settings")
 async def patch_league_settings(
     league_id: str,
@@ -2119,15 +2181,24 @@ async def get_roster_summary(
 @api_router.get("/fixtures/{league_id}")
 async def get_league_fixtures(
     league_id: str,
+    request: Request,
     season: str = "2024-25",
     current_user: UserResponse = Depends(get_current_verified_user)
 ):
-    """Get all fixtures and results for the league with ownership badges"""
+    """
+    Get all fixtures and results for the league with ownership badges
+    The ETag is the league's fixtures generation, so revalidation costs one lookup
+    """
     await require_league_access(current_user.id, league_id)
     
     try:
-        fixtures_data = await AggregationService.get_league_fixtures(league_id, season)
-        return fixtures_data
+        generation = await get_cache_generations().get(league_id, FIXTURES)
+        etag = f'"fixtures-{league_id}-{season}-{generation}"'
+        if request.headers.get("if-none-match") == etag:
+            return Response(status_code=304, headers={"ETag": etag})
+        
+        fixtures_data = await AggregationService.get_league_fixtures(league_id, season, generation)
+        return etag_response(request, jsonable_encoder(fixtures_data), etag)
     except Exception as e:
         logger.error(f"Failed to get league fixtures: {e}")
         raise HTTPException(status_code=500, detail=str(e))
@@ -2147,6 +2218,22 @@ async def get_league_leaderboard(
         logger.error(f"Failed to get league leaderboard: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
+@api_router.get("/leaderboard/{league_id}/matchdays")
+async def get_leaderboard_matchday_history(
+    league_id: str,
+    before: int,
+    limit: int = 5,
+    current_user: UserResponse = Depends(get_current_verified_user)
+):
+    """Get older matchday breakdowns, `limit` at a time before the `before` cursor"""
+    await require_league_access(current_user.id, league_id)
+    
+    try:
+        return await AggregationService.get_league_matchday_history(league_id, before, limit)
+    except Exception as e:
+        logger.error(f"Failed to get matchday history: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
 @api_router.get("/analytics/head-to-head/{league_id}")
 async def get_head_to_head(
     league_id: str,
@@ -2164,6 +2251,34 @@ async def get_head_to_head(
         logger.error(f"Failed to get head-to-head comparison: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
+@api_router.get("/analytics/head-to-head/{league_id}/matrix")
+async def get_head_to_head_matrix(
+    league_id: str,
+    current_user: UserResponse = Depends(get_current_verified_user)
+):
+    """Get all-pairs head-to-head matchday wins for a league"""
+    await require_league_access(current_user.id, league_id)
+    
+    try:
+        return await AggregationService.get_league_head_to_head_matrix(league_id)
+    except Exception as e:
+        logger.error(f"Failed to get head-to-head matrix: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+@api_router.get("/analytics/rank-history/{league_id}")
+async def get_rank_history(
+    league_id: str,
+    current_user: UserResponse = Depends(get_current_verified_user)
+):
+    """Get each manager's cumulative points and rank after every matchday"""
+    await require_league_access(current_user.id, league_id)
+    
+    try:
+        return await AggregationService.get_league_rank_history(league_id)
+    except Exception as e:
+        logger.error(f"Failed to get rank history: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
 # Health check endpoint
 @fastapi_app.get("/health")
 async def health_check():
@@ -2201,6 +2316,10 @@ async def health_check():
                 "websocket": True,  # Socket.IO is mounted
                 "email": bool(os.getenv("SMTP_HOST")),
                 "auth": bool(os.getenv("JWT_SECRET"))
+            },
+            "scheduler": {
+                "pending_deadlines": get_deadline_scheduler().depth,
+                "heap_size": get_deadline_scheduler().heap_size
             }
         }
         
@@ -0,0 +1,150 @@
+"""
+Auction Snapshot Service
+Builds a versioned per-auction snapshot once and serves joins from the cached copy
+"""
+
+import asyncio
+import logging
+import os
+from typing import Dict, Optional
+
+from database import db
+from time_provider import now_ms
+
+logger = logging.getLogger(__name__)
+
+# Upper bound on how long a cached snapshot is served without a rebuild
+SNAPSHOT_TTL_SECONDS = float(os.getenv("SNAPSHOT_TTL_SECONDS", "30"))
+
+class AuctionSnapshot:
+    """Shared part of an auction snapshot; identical for every participant"""
+
+    __slots__ = ("auction_id", "version", "built_at_ms", "auction", "current_lot", "participants", "rosters")
+
+    def __init__(self, auction_id: str, version: int, auction: Dict, current_lot: Optional[Dict],
+                 participants: list, rosters: Dict[str, Dict]):
+        self.auction_id = auction_id
+        self.version = version
+        self.built_at_ms = now_ms()
+        self.auction = auction
+        self.current_lot = current_lot
+        self.participants = participants
+        self.rosters = rosters  # user_id -> roster fields for the per-user overlay
+
+class SnapshotCache:
+    """
+    Versioned snapshot per auction
+
+    A build costs four reads (auction, lot, rosters, users via $in) regardless
+    of league size. Concurrent joins for the same auction wait on one build.
+    Write paths that change participants or budgets call invalidate().
+    """
+
+    def __init__(self):
+        self._snapshots: Dict[str, AuctionSnapshot] = {}
+        self._versions: Dict[str, int] = {}
+        self._build_locks: Dict[str, asyncio.Lock] = {}
+
+    def invalidate(self, auction_id: str):
+        """Drop the cached snapshot so the next request rebuilds it"""
+        self._snapshots.pop(auction_id, None)
+
+    def invalidate_league(self, league_id: str):
+        """Drop cached snapshots for every auction in a league"""
+        for auction_id, snapshot in list(self._snapshots.items()):
+            if snapshot.auction.get("league_id") == league_id:
+                del self._snapshots[auction_id]
+
+    def _is_fresh(self, snapshot: Optional[AuctionSnapshot]) -> bool:
+        return snapshot is not None and now_ms() - snapshot.built_at_ms < SNAPSHOT_TTL_SECONDS * 1000
+
+    async def get(self, auction_id: str) -> Optional[AuctionSnapshot]:
+        """Get the cached snapshot, building it if missing or expired"""
+        snapshot = self._snapshots.get(auction_id)
+        if self._is_fresh(snapshot):
+            return snapshot
+
+        lock = self._build_locks.setdefault(auction_id, asyncio.Lock())
+        async with lock:
+            snapshot = self._snapshots.get(auction_id)
+            if self._is_fresh(snapshot):
+                return snapshot  # Built while we waited
+
+            snapshot = await self._build(auction_id)
+            if snapshot:
+                self._snapshots[auction_id] = snapshot
+            return snapshot
+
+    async def _build(self, auction_id: str) -> Optional[AuctionSnapshot]:
+        auction = await db.auctions.find_one({"_id": auction_id})
+        if not auction:
+            return None
+
+        current_lot = None
+        if auction.get("current_lot_id"):
+            lot = await db.lots.find_one({"_id": auction["current_lot_id"]})
+            if lot:
+                current_lot = {
+                    "id": lot["_id"],
+                    "club_id": lot["club_id"],
+                    "status": lot["status"],
+                    "current_bid": lot.get("current_bid", 0),
+                    "leading_bidder_id": lot.get("leading_bidder_id") or lot.get("top_bidder_id"),
+                    "timer_ends_at": lot.get("timer_ends_at").isoformat() if lot.get("timer_ends_at") else None
+                }
+
+        league_rosters = await db.rosters.find({"league_id": auction["league_id"]}).to_list(length=None)
+        user_ids = [roster["user_id"] for roster in league_rosters]
+        users = await db.users.find(
+            {"_id": {"$in": user_ids}}, {"display_name": 1}
+        ).to_list(length=None)
+        names = {user["_id"]: user["display_name"] for user in users}
+
+        participants = []
+        rosters = {}
+        for roster in league_rosters:
+            user_id = roster["user_id"]
+            clubs_owned = len(roster.get("clubs", []))
+            rosters[user_id] = {
+                "budget_remaining": roster["budget_remaining"],
+                "slots_used": clubs_owned,
+                "max_slots": roster.get("club_slots", 3)
+            }
+            if user_id in names:
+                participants.append({
+                    "user_id": user_id,
+                    "display_name": names[user_id],
+                    "budget_remaining": roster["budget_remaining"],
+                    "clubs_owned": clubs_owned
+                })
+
+        version = self._versions.get(auction_id, 0) + 1
+        self._versions[auction_id] = version
+        return AuctionSnapshot(
+            auction_id=auction_id,
+            version=version,
+            auction={
+                "id": auction["_id"],
+                "league_id": auction["league_id"],
+                "status": auction["status"],
+                "settings": {
+                    "min_increment": auction["min_increment"],
+                    "bid_timer_seconds": auction["bid_timer_seconds"],
+                    "anti_snipe_seconds": auction["anti_snipe_seconds"],
+                    "budget_per_manager": auction["budget_per_manager"]
+                }
+            },
+            current_lot=current_lot,
+            participants=participants,
+            rosters=rosters
+        )
+
+# Global snapshot cache instance
+snapshot_cache: Optional[SnapshotCache] = None
+
+def get_snapshot_cache() -> SnapshotCache:
+    """Get global snapshot cache, creating it on first use"""
+    global snapshot_cache
+    if snapshot_cache is None:
+        snapshot_cache = SnapshotCache()
+    return snapshot_cache
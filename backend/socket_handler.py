@@ -1,90 +1,65 @@
+import asyncio
 import socketio
-import jwt
 import logging
 import os
-from typing import Dict, Optional, List
+from typing import Dict, Optional, List, Set
 from datetime import datetime, timezone
 
 from models import UserResponse
-from database import db
-from auth import SECRET_KEY, ALGORITHM
+from auth import resolve_principal, check_league_access
 from auction_engine import get_auction_engine
+from snapshot_service import get_snapshot_cache
 
 class StateSnapshot:
     """Manages server state snapshots for reconnection"""
     
     @staticmethod
     async def get_auction_snapshot(auction_id: str, user_id: str) -> Dict:
-        """Get complete auction state snapshot for reconnecting user"""
+        """
+        Get complete auction state snapshot for reconnecting user
+        The shared part comes from the snapshot cache; only the user's own
+        state, the live lot and presence are filled in per request
+        """
         try:
-            # Get auction state
-            auction = await db.auctions.find_one({"_id": auction_id})
-            if not auction:
+            base = await get_snapshot_cache().get(auction_id)
+            if not base:
                 return {"error": "Auction not found"}
             
-            # Get current lot
-            current_lot = None
-            if auction.get("current_lot_id"):
-                lot = await db.lots.find_one({"_id": auction["current_lot_id"]})
-                if lot:
-                    current_lot = {
-                        "id": lot["_id"],
-                        "club_id": lot["club_id"],
-                        "status": lot["status"],
-                        "current_bid": lot.get("current_bid", 0),
-                        "leading_bidder_id": lot.get("leading_bidder_id"),
-                        "timer_ends_at": lot.get("timer_ends_at").isoformat() if lot.get("timer_ends_at") else None
-                    }
+            # Live lot state is authoritative while the engine holds it
+            current_lot = base.current_lot
+            try:
+                lot_state = get_auction_engine().lot_states.get(auction_id)
+            except RuntimeError:
+                lot_state = None  # Engine not running in this process
+            if lot_state:
+                current_lot = {
+                    "id": lot_state.lot_id,
+                    "club_id": lot_state.club_id,
+                    "status": lot_state.status,
+                    "current_bid": lot_state.current_bid,
+                    "leading_bidder_id": lot_state.leading_bidder_id,
+                    "timer_ends_at": lot_state.timer_ends_at.isoformat() if lot_state.timer_ends_at else None,
+                    "seq": lot_state.seq
+                }
             
-            # Get user's roster and budget
-            user_roster = await db.rosters.find_one({
-                "league_id": auction["league_id"],
-                "user_id": user_id
-            })
-            
-            user_budget = user_roster["budget_remaining"] if user_roster else 0
-            user_slots = len(user_roster.get("clubs", [])) if user_roster else 0
-            
-            # Get all auction participants
-            participants = []
-            league_rosters = await db.rosters.find({"league_id": auction["league_id"]}).to_list(length=None)
-            for roster in league_rosters:
-                user = await db.users.find_one({"_id": roster["user_id"]})
-                if user:
-                    participants.append({
-                        "user_id": user["_id"],
-                        "display_name": user["display_name"],
-                        "budget_remaining": roster["budget_remaining"],
-                        "clubs_owned": len(roster.get("clubs", []))
-                    })
-            
-            # Get auction settings
-            settings = {
-                "min_increment": auction["min_increment"],
-                "bid_timer_seconds": auction["bid_timer_seconds"],
-                "anti_snipe_seconds": auction["anti_snipe_seconds"],
-                "budget_per_manager": auction["budget_per_manager"]
-            }
+            user_roster = base.rosters.get(user_id)
             
             # Get presence information
             present_users = connection_manager.get_auction_users(auction_id)
             
             snapshot = {
-                "auction": {
-                    "id": auction["_id"],
-                    "status": auction["status"],
-                    "settings": settings
-                },
+                "auction": base.auction,
                 "current_lot": current_lot,
-                "user_state": {
-                    "budget_remaining": user_budget,
-                    "slots_used": user_slots,
-                    "max_slots": user_roster.get("max_slots", 3) if user_roster else 3
+                "user_state": user_roster or {
+                    "budget_remaining": 0,
+                    "slots_used": 0,
+                    "max_slots": 3
                 },
-                "participants": participants,
+                "participants": base.participants,
                 "presence": present_users,
                 "server_time": datetime.now(timezone.utc).isoformat(),
-                "snapshot_version": "1.0"
+                "snapshot_version": "1.0",
+                "state_version": base.version
             }
             
             return snapshot
@@ -102,13 +77,8 @@ class StateSnapshot:
                 if field not in snapshot:
                     return False
             
-            # Validate auction exists
-            auction_id = snapshot["auction"]["id"]
-            auction = await db.auctions.find_one({"_id": auction_id})
-            if not auction:
-                return False
-            
-            return True
+            # The auction was read when the cached snapshot was built
+            return bool(snapshot["auction"].get("id"))
             
         except Exception:
             return False
@@ -117,7 +87,10 @@ logger = logging.getLogger(__name__)
 
 # Socket.IO configuration with environment variables
 SOCKET_PATH = os.getenv('SOCKET_PATH', '/api/socket.io')
-FRONTEND_ORIGIN = os.getenv('FRONTEND_ORIGIN', 'https://testid-enforcer.preview.emergentagent.com')
+FRONTEND_ORIGIN = os.getenv('FRONTEND_ORIGIN', 'http://localhost:3000')
+
+# Presence changes are coalesced and broadcast once per room per interval
+PRESENCE_BATCH_INTERVAL = float(os.getenv('PRESENCE_BATCH_INTERVAL', '0.25'))
 
 # Create Socket.IO server with CORS configuration (integrated via ASGIApp overlay)
 sio = socketio.AsyncServer(
@@ -137,28 +110,98 @@ class PresenceStatus:
     AWAY = "away"
     OFFLINE = "offline"
 
+class ConnectionRecord:
+    """A single socket's connection to an auction"""
+
+    __slots__ = ("sid", "user", "auction_id", "last_seen", "connected_at")
+
+    def __init__(self, sid: str, user: UserResponse, auction_id: Optional[str]):
+        self.sid = sid
+        self.user = user
+        self.auction_id = auction_id
+        self.last_seen = datetime.now(timezone.utc)
+        self.connected_at = self.last_seen
+
+    @property
+    def user_id(self) -> str:
+        return self.user.id
+
 class ConnectionManager:
-    """Manages WebSocket connections and presence"""
+    """
+    Manages WebSocket connections and presence
+    Connections are indexed by auction and by user so room lookups never scan
+    every socket. Presence changes are queued per room and flushed as one
+    presence_delta per tick, so join/leave bursts cost one emit per room.
+    """
     
     def __init__(self):
-        self.connections: Dict[str, Dict] = {}  # session_id -> connection_info
+        self.connections: Dict[str, ConnectionRecord] = {}  # session_id -> connection
+        self.auction_sids: Dict[str, Set[str]] = {}  # auction_id -> session_ids
+        self.user_sids: Dict[str, Set[str]] = {}  # user_id -> session_ids
+        self.pending_presence: Dict[str, Dict[str, Dict]] = {}  # auction_id -> user_id -> change
+        self.presence_flush_task: Optional[asyncio.Task] = None
         self.heartbeat_interval = 30  # seconds
         self.presence_timeout = 60  # seconds
     
-    async def add_connection(self, sid: str, user: UserResponse, auction_id: str = None):
-        """Add new connection and update presence"""
-        connection_info = {
+    def _index(self, record: ConnectionRecord):
+        self.connections[record.sid] = record
+        self.user_sids.setdefault(record.user_id, set()).add(record.sid)
+        if record.auction_id:
+            self.auction_sids.setdefault(record.auction_id, set()).add(record.sid)
+    
+    def _unindex(self, record: ConnectionRecord):
+        self.connections.pop(record.sid, None)
+        for index, key in ((self.user_sids, record.user_id), (self.auction_sids, record.auction_id)):
+            sids = index.get(key)
+            if sids is not None:
+                sids.discard(record.sid)
+                if not sids:
+                    del index[key]
+    
+    def _user_in_auction(self, user_id: str, auction_id: str) -> bool:
+        """Check if any of a user's sockets is still in an auction"""
+        user_sids = self.user_sids.get(user_id, ())
+        auction_sids = self.auction_sids.get(auction_id, ())
+        if len(user_sids) > len(auction_sids):
+            user_sids, auction_sids = auction_sids, user_sids
+        return any(sid in auction_sids for sid in user_sids)
+    
+    def _queue_presence(self, auction_id: str, user: UserResponse, status: str):
+        """Queue a presence change; the latest change per user wins within a tick"""
+        self.pending_presence.setdefault(auction_id, {})[user.id] = {
             'user_id': user.id,
-            'user': user,
-            'auction_id': auction_id,
-            'last_seen': datetime.now(timezone.utc),
-            'connected_at': datetime.now(timezone.utc)
+            'display_name': user.display_name,
+            'status': status,
+            'timestamp': datetime.now(timezone.utc).isoformat()
         }
+        if self.presence_flush_task is None or self.presence_flush_task.done():
+            self.presence_flush_task = asyncio.create_task(self._flush_presence_after_tick())
+    
+    async def _flush_presence_after_tick(self):
+        await asyncio.sleep(PRESENCE_BATCH_INTERVAL)
+        await self.flush_presence()
+    
+    async def flush_presence(self):
+        """Emit one presence_delta per room with every change queued since the last flush"""
+        pending, self.pending_presence = self.pending_presence, {}
+        for auction_id, changes in pending.items():
+            try:
+                await sio.emit('presence_delta', {
+                    'changes': list(changes.values())
+                }, room=f"auction_{auction_id}")
+            except Exception as e:
+                logger.error(f"Presence flush error for auction {auction_id}: {e}")
+    
+    async def add_connection(self, sid: str, user: UserResponse, auction_id: str = None):
+        """Add new connection and update presence"""
+        if sid in self.connections:
+            await self.remove_connection(sid)  # Re-joining moves the socket
         
-        self.connections[sid] = connection_info
+        self._index(ConnectionRecord(sid, user, auction_id))
         
         # Update user presence
         user_presence[user.id] = {
+            'user_id': user.id,
             'status': PresenceStatus.ONLINE,
             'last_seen': datetime.now(timezone.utc),
             'auction_id': auction_id,
@@ -166,59 +209,49 @@ class ConnectionManager:
             'session_id': sid
         }
         
-        # Broadcast presence update to auction room
+        # Queue presence update for the auction room
         if auction_id:
-            await sio.emit('user_presence', {
-                'user_id': user.id,
-                'display_name': user.display_name,
-                'status': PresenceStatus.ONLINE,
-                'timestamp': datetime.now(timezone.utc).isoformat()
-            }, room=f"auction_{auction_id}")
+            self._queue_presence(auction_id, user, PresenceStatus.ONLINE)
             
         logger.info(f"User {user.display_name} connected to auction {auction_id}")
     
     async def remove_connection(self, sid: str):
         """Remove connection and update presence"""
-        if sid not in self.connections:
+        record = self.connections.get(sid)
+        if record is None:
             return
-            
-        connection_info = self.connections[sid]
-        user_id = connection_info['user_id']
-        auction_id = connection_info.get('auction_id')
         
-        # Update presence to offline
-        if user_id in user_presence:
+        self._unindex(record)
+        user_id = record.user_id
+        
+        # Update presence to offline once the user's last socket is gone
+        if user_id in user_presence and user_id not in self.user_sids:
             user_presence[user_id]['status'] = PresenceStatus.OFFLINE
             user_presence[user_id]['last_seen'] = datetime.now(timezone.utc)
-            
-            # Broadcast presence update
-            if auction_id:
-                await sio.emit('user_presence', {
-                    'user_id': user_id,
-                    'display_name': connection_info['user']['display_name'],
-                    'status': PresenceStatus.OFFLINE,
-                    'timestamp': datetime.now(timezone.utc).isoformat()
-                }, room=f"auction_{auction_id}")
         
-        del self.connections[sid]
-        logger.info(f"User {connection_info['user']['display_name']} disconnected")
+        # Queue presence update if the user has no other socket in the auction
+        if record.auction_id and not self._user_in_auction(user_id, record.auction_id):
+            self._queue_presence(record.auction_id, record.user, PresenceStatus.OFFLINE)
+        
+        logger.info(f"User {record.user.display_name} disconnected")
     
     async def update_heartbeat(self, sid: str):
         """Update last seen timestamp for connection"""
-        if sid in self.connections:
-            self.connections[sid]['last_seen'] = datetime.now(timezone.utc)
-            user_id = self.connections[sid]['user_id']
-            if user_id in user_presence:
-                user_presence[user_id]['last_seen'] = datetime.now(timezone.utc)
+        record = self.connections.get(sid)
+        if record:
+            record.last_seen = datetime.now(timezone.utc)
+            if record.user_id in user_presence:
+                user_presence[record.user_id]['last_seen'] = record.last_seen
     
     def get_auction_users(self, auction_id: str) -> List[Dict]:
         """Get all users present in an auction"""
         auction_users = []
-        for sid, conn in self.connections.items():
-            if conn.get('auction_id') == auction_id:
-                user_id = conn['user_id']
-                if user_id in user_presence:
-                    auction_users.append(user_presence[user_id])
+        seen = set()
+        for sid in self.auction_sids.get(auction_id, ()):
+            user_id = self.connections[sid].user_id
+            if user_id not in seen and user_id in user_presence:
+                seen.add(user_id)
+                auction_users.append(user_presence[user_id])
         return auction_users
 
 # Global connection manager
@@ -227,22 +260,7 @@ connection_manager = ConnectionManager()
 async def authenticate_socket(token: str) -> Optional[UserResponse]:
     """Authenticate socket connection using JWT token"""
     try:
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-        user_id: str = payload.get("sub")
-        if user_id is None:
-            return None
-        
-        user = await db.users.find_one({"_id": user_id})
-        if user is None:
-            return None
-        
-        return UserResponse(
-            id=user["_id"],
-            email=user["email"],
-            display_name=user["display_name"],
-            verified=user["verified"],
-            created_at=user["created_at"]
-        )
+        return await resolve_principal(token)
     except Exception as e:
         logger.error(f"Socket authentication failed: {e}")
         return None
@@ -339,24 +357,19 @@ async def join_auction(sid, data):
         user = user_sessions[sid]['user']
         
         # Verify user has access to auction
-        auction = await db.auctions.find_one({"_id": auction_id})
+        auction = await get_snapshot_cache().get(auction_id)
         if not auction:
             await sio.emit('error', {'message': 'Auction not found'}, to=sid)
             return
         
         # Check league membership
-        membership = await db.memberships.find_one({
-            "league_id": auction["league_id"],
-            "user_id": user.id,
-            "status": "accepted"
-        })
-        
-        if not membership:
+        if not await check_league_access(user.id, auction.auction["league_id"]):
             await sio.emit('error', {'message': 'Access denied'}, to=sid)
             return
         
         # Join auction room
         await sio.enter_room(sid, f"auction_{auction_id}")
+        await sio.emit('joined', {'auction_id': auction_id}, to=sid)
         
         # Add to connection manager
         await connection_manager.add_connection(sid, user, auction_id)
@@ -369,12 +382,29 @@ async def join_auction(sid, data):
         present_users = connection_manager.get_auction_users(auction_id)
         await sio.emit('presence_list', {'users': present_users}, to=sid)
         
+        # Full lot state on join; later changes arrive as lot_delta
+        await get_auction_engine().send_lot_snapshot(auction_id, sid)
+        
         logger.info(f"User {user.display_name} joined auction {auction_id}")
         
     except Exception as e:
         logger.error(f"Join auction error for {sid}: {e}")
         await sio.emit('error', {'message': 'Failed to join auction'}, to=sid)
 
+@sio.event
+async def resync_lot(sid, data):
+    """Resend the full current lot after a client detects a lot_delta gap"""
+    try:
+        if sid not in user_sessions:
+            await sio.emit('error', {'message': 'Not authenticated'}, to=sid)
+            return
+        
+        auction_id = data.get('auction_id')
+        if auction_id:
+            await get_auction_engine().send_lot_snapshot(auction_id, sid)
+    except Exception as e:
+        logger.error(f"Lot resync error for {sid}: {e}")
+
 @sio.event
 async def heartbeat(sid, data):
     """Handle client heartbeat for presence tracking"""
@@ -429,7 +459,9 @@ async def leave_auction(sid, data):
         
         # Leave auction room
         await sio.leave_room(sid, f"auction_{auction_id}")
-        user_sessions[sid]["joined_auctions"].discard(auction_id)
+        record = connection_manager.connections.get(sid)
+        if record and record.auction_id == auction_id:
+            await connection_manager.remove_connection(sid)
         
         # Notify room of departure
         await sio.emit('user_left', {
@@ -0,0 +1,357 @@
+#!/usr/bin/env python3
+"""
+Unit Tests for the Auction Engine Bid Path
+Tests in-memory bidding and delta broadcasts against mocked storage
+"""
+
+import pytest
+import asyncio
+from datetime import timedelta
+from unittest.mock import AsyncMock, MagicMock, patch
+import sys
+from pathlib import Path
+
+# Add backend to path
+backend_path = Path(__file__).parent
+sys.path.append(str(backend_path))
+
+from auction_engine import (
+    AuctionEngine,
+    TIME_SYNC_INTERVAL,
+    TIME_SYNC_FINAL_INTERVAL,
+    TIME_SYNC_PAUSED_INTERVAL
+)
+from lot_state import LiveLotState
+from time_provider import now, now_ms
+
+def make_engine():
+    sio = MagicMock()
+    sio.emit = AsyncMock()
+    engine = AuctionEngine(sio)
+    engine.active_auctions["auction_1"] = {
+        "league_id": "league_1",
+        "settings": {"min_increment": 1, "anti_snipe_seconds": 3}
+    }
+    engine.lot_states["auction_1"] = LiveLotState(
+        lot_id="lot_1",
+        auction_id="auction_1",
+        club_id="club_1",
+        order_index=0,
+        timer_ends_at=now() + timedelta(seconds=60)
+    )
+    return engine
+
+def emitted(engine, event):
+    return [c.args[1] for c in engine.sio.emit.call_args_list if c.args[0] == event]
+
+class TestBidBroadcasts:
+    """Test that bids are broadcast as deltas without database reads"""
+
+    @pytest.mark.asyncio
+    async def test_bids_emit_sequenced_deltas(self):
+        engine = make_engine()
+
+        with patch('auction_engine.db') as mock_db, \
+             patch('lot_state.db') as mock_lot_db, \
+             patch('admin_service.AdminService.validate_max_bid', AsyncMock(return_value=(True, ""))):
+            mock_db.users.find_one = AsyncMock(side_effect=lambda q, p=None: {"_id": q["_id"], "display_name": q["_id"].upper()})
+            mock_db.clubs.find_one = AsyncMock()
+            mock_lot_db.lots.bulk_write = AsyncMock()
+            mock_lot_db.bids.insert_many = AsyncMock()
+
+            first = await engine.place_bid("auction_1", "lot_1", "user_a", 5)
+            second = await engine.place_bid("auction_1", "lot_1", "user_b", 6)
+            third = await engine.place_bid("auction_1", "lot_1", "user_a", 7)
+            rejected = await engine.place_bid("auction_1", "lot_1", "user_b", 7)
+            await engine.write_behind.stop()
+
+            assert first["success"] and second["success"] and third["success"]
+            assert rejected["success"] == False
+
+            deltas = emitted(engine, 'lot_delta')
+            assert [d["seq"] for d in deltas] == [1, 2, 3]
+            assert deltas[-1]["current_bid"] == 7
+            assert deltas[-1]["leader_id"] == "user_a"
+            assert deltas[-1]["leader_name"] == "USER_A"
+            assert emitted(engine, 'lot_update') == []
+
+            # Each bidder's display name is read once; clubs are never read per bid
+            assert mock_db.users.find_one.call_count == 2
+            mock_db.clubs.find_one.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_snapshot_uses_cached_club(self):
+        engine = make_engine()
+
+        with patch('auction_engine.db') as mock_db:
+            mock_db.clubs.find_one = AsyncMock(return_value={
+                "_id": "club_1", "name": "Club One", "short_name": "C1", "country": "England"
+            })
+
+            await engine.send_lot_snapshot("auction_1", "sid_1")
+            await engine.send_lot_snapshot("auction_1", "sid_2")
+
+            snapshots = emitted(engine, 'lot_update')
+            assert len(snapshots) == 2
+            assert snapshots[0]["lot"]["club"]["short_name"] == "C1"
+            assert snapshots[0]["lot"]["seq"] == 0
+            mock_db.clubs.find_one.assert_called_once()
+
+class TestTimeSync:
+    """Test the shared time sync ticker"""
+
+    def test_interval_adapts_to_lot_state(self):
+        engine = make_engine()
+        lot_state = engine.lot_states["auction_1"]
+        current_ms = now_ms()
+
+        # 60s left: normal cadence
+        assert engine._time_sync_interval("auction_1", current_ms) == TIME_SYNC_INTERVAL
+
+        # Final seconds: fast cadence
+        lot_state.timer_ends_at = now() + timedelta(seconds=5)
+        assert engine._time_sync_interval("auction_1", now_ms()) == TIME_SYNC_FINAL_INTERVAL
+
+        # Paused: slow cadence
+        engine.active_auctions["auction_1"]["paused"] = True
+        assert engine._time_sync_interval("auction_1", now_ms()) == TIME_SYNC_PAUSED_INTERVAL
+
+    @pytest.mark.asyncio
+    async def test_ticker_emits_without_database_reads(self):
+        engine = make_engine()
+
+        with patch('auction_engine.db') as mock_db:
+            await engine.start_time_sync("auction_1")
+            await asyncio.sleep(0.05)
+            await engine.stop_time_sync("auction_1")
+            await asyncio.sleep(0.1)
+
+            syncs = emitted(engine, 'time_sync')
+            assert len(syncs) == 1
+            assert syncs[0]["current_lot"]["lot_id"] == "lot_1"
+            assert mock_db.mock_calls == []
+            assert engine.time_sync_task.done()
+
+class TestLotClose:
+    """Test settling a lot from in-memory state"""
+
+    @pytest.mark.asyncio
+    async def test_close_settles_from_memory_when_flush_fails(self):
+        engine = make_engine()
+        lot_state = engine.lot_states["auction_1"]
+        lot_state.apply_bid("user_a", 12)
+        lot_state.status = "going_twice"
+        engine.write_behind.record_lot("lot_1", lot_state.persisted_fields())
+        session = MagicMock()
+        session.__aenter__ = AsyncMock(return_value=session)
+        session.__aexit__ = AsyncMock(return_value=False)
+        session.start_transaction.return_value.__aenter__ = AsyncMock()
+        session.start_transaction.return_value.__aexit__ = AsyncMock(return_value=False)
+
+        with patch('auction_engine.db') as mock_db, \
+             patch('lot_state.db') as mock_lot_db, \
+             patch('auction_engine.NEXT_LOT_DELAY_SECONDS', 0), \
+             patch('admin_service.AdminService.validate_sale', AsyncMock(return_value=(False, "duplicate ownership prevented"))):
+            mock_db.client.start_session = AsyncMock(return_value=session)
+            mock_db.lots.find_one = AsyncMock(return_value={"_id": "lot_1", "club_id": "club_1", "current_bid": 0})
+            mock_db.lots.update_one = AsyncMock()
+            mock_db.clubs.find_one = AsyncMock()
+            mock_lot_db.bids.insert_many = AsyncMock(side_effect=Exception("db down"))
+            engine.write_behind.record_bid({"_id": "bid_1"})
+            engine._start_next_lot = AsyncMock()
+
+            await engine._close_lot("auction_1", "lot_1", lot_state.timer_ends_at)
+            engine.write_behind._task.cancel()
+
+            # Guardrail failure marks the lot unsold with the in-memory bid, then the auction moves on
+            update = mock_db.lots.update_one.call_args.args[1]["$set"]
+            assert (update["status"], update["current_bid"], update["leading_bidder_id"]) == ("unsold", 12, "user_a")
+            mock_lot_db.lots.bulk_write.assert_not_called()
+            assert "auction_1" not in engine.lot_states
+            engine._start_next_lot.assert_awaited_once_with("auction_1")
+
+    @pytest.mark.asyncio
+    async def test_failed_transaction_is_retried_and_closes_lot(self):
+        engine = make_engine()
+        lot_state = engine.lot_states["auction_1"]
+        lot_state.apply_bid("user_a", 12)
+        lot_state.status = "going_twice"
+        engine.scheduler.schedule = MagicMock()
+        session = MagicMock()
+        session.__aenter__ = AsyncMock(return_value=session)
+        session.__aexit__ = AsyncMock(return_value=False)
+        session.start_transaction.return_value.__aenter__ = AsyncMock()
+        session.start_transaction.return_value.__aexit__ = AsyncMock(return_value=False)
+
+        with patch('auction_engine.db') as mock_db, \
+             patch('lot_state.db'), \
+             patch('auction_engine.NEXT_LOT_DELAY_SECONDS', 0), \
+             patch('admin_service.AdminService.validate_sale', AsyncMock(return_value=(False, "duplicate ownership prevented"))):
+            mock_db.client.start_session = AsyncMock(return_value=session)
+            mock_db.lots.find_one = AsyncMock(side_effect=[
+                Exception("transient transaction error"),
+                {"_id": "lot_1", "club_id": "club_1", "current_bid": 0}
+            ])
+            mock_db.lots.update_one = AsyncMock()
+            engine._start_next_lot = AsyncMock()
+
+            await engine._close_lot("auction_1", "lot_1", lot_state.timer_ends_at)
+
+            # The failed attempt leaves the lot closing and schedules a retry instead of moving on
+            mock_db.lots.update_one.assert_not_called()
+            engine._start_next_lot.assert_not_called()
+            assert lot_state.status == "closing"
+            engine.scheduler.schedule.assert_called_once()
+
+            retry = engine.scheduler.schedule.call_args.args[2]
+            await retry()
+
+            update = mock_db.lots.update_one.call_args.args[1]["$set"]
+            assert (update["status"], update["current_bid"], update["leading_bidder_id"]) == ("unsold", 12, "user_a")
+            assert "auction_1" not in engine.lot_states
+            engine._start_next_lot.assert_awaited_once_with("auction_1")
+
+    @pytest.mark.asyncio
+    async def test_close_validates_sale_against_database_in_transaction(self):
+        engine = make_engine()
+        lot_state = engine.lot_states["auction_1"]
+        lot_state.apply_bid("user_a", 12)
+        lot_state.status = "going_twice"
+        session = MagicMock()
+        session.__aenter__ = AsyncMock(return_value=session)
+        session.__aexit__ = AsyncMock(return_value=False)
+        session.start_transaction.return_value.__aenter__ = AsyncMock()
+        session.start_transaction.return_value.__aexit__ = AsyncMock(return_value=False)
+
+        with patch('auction_engine.db') as mock_db, \
+             patch('admin_service.db') as mock_admin_db, \
+             patch('lot_state.db'), \
+             patch('auction_engine.NEXT_LOT_DELAY_SECONDS', 0):
+            mock_db.client.start_session = AsyncMock(return_value=session)
+            mock_db.lots.find_one = AsyncMock(return_value={"_id": "lot_1", "club_id": "club_1", "current_bid": 0})
+            mock_db.lots.update_one = AsyncMock()
+            mock_db.roster_clubs.insert_one = AsyncMock()
+            # Another process already spent most of the budget
+            mock_admin_db.roster_clubs.find_one = AsyncMock(return_value=None)
+            mock_admin_db.rosters.find_one = AsyncMock(return_value={"budget_remaining": 5})
+            engine._start_next_lot = AsyncMock()
+
+            await engine._close_lot("auction_1", "lot_1", lot_state.timer_ends_at)
+
+            assert mock_admin_db.rosters.find_one.call_args.kwargs["session"] is session
+            assert mock_admin_db.roster_clubs.find_one.call_args.kwargs["session"] is session
+            mock_db.roster_clubs.insert_one.assert_not_called()
+            assert mock_db.lots.update_one.call_args.args[1]["$set"]["status"] == "unsold"
+
+class TestLotDeadlines:
+    """Test going-once/going-twice deadlines across extensions and pauses"""
+
+    @pytest.mark.asyncio
+    async def test_stale_deadline_does_not_override_extension(self):
+        engine = make_engine()
+        lot_state = engine.lot_states["auction_1"]
+        fired_for = lot_state.timer_ends_at
+        engine.scheduler.schedule = MagicMock()
+
+        # An anti-snipe bid moved the timer while the old going-once deadline waited on the lock
+        lot_state.timer_ends_at = fired_for + timedelta(seconds=6)
+        await engine._going_once("auction_1", "lot_1", fired_for)
+
+        assert lot_state.status == "open"
+        engine.scheduler.schedule.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_resume_reschedules_the_current_stage(self):
+        engine = make_engine()
+        lot_state = engine.lot_states["auction_1"]
+        lot_state.status = "going_once"
+        engine.scheduler.schedule = MagicMock()
+
+        with patch('auction_engine.db') as mock_db, patch('auction_engine.get_snapshot_cache'):
+            mock_db.auctions.find_one = AsyncMock(return_value={"_id": "auction_1", "league_id": "league_1"})
+            mock_db.leagues.find_one = AsyncMock(return_value={"_id": "league_1", "commissioner_id": "comm"})
+            mock_db.auctions.update_one = AsyncMock()
+
+            assert await engine.resume_auction("auction_1", "comm") == True
+
+        callback = engine.scheduler.schedule.call_args.args[2]
+        with patch.object(engine, '_going_twice', AsyncMock()) as going_twice:
+            await callback()
+        going_twice.assert_awaited_once_with("auction_1", "lot_1", lot_state.timer_ends_at)
+
+class FakeClubCursor:
+    """Minimal async cursor over club ids honoring the engine's filter"""
+
+    def __init__(self, club_ids, query):
+        after = query.get("_id", {}).get("$gt")
+        self.club_ids = sorted(c for c in club_ids if after is None or c > after)
+
+    def sort(self, *args):
+        return self
+
+    def limit(self, n):
+        self.club_ids = self.club_ids[:n]
+        return self
+
+    def __aiter__(self):
+        self._iter = iter(self.club_ids)
+        return self
+
+    async def __anext__(self):
+        try:
+            return {"_id": next(self._iter)}
+        except StopIteration:
+            raise StopAsyncIteration
+
+class TestLotMaterialization:
+    """Test batched and lazy lot creation"""
+
+    def make_engine_with_clubs(self, club_ids, mock_db):
+        engine = make_engine()
+        engine.active_auctions["auction_1"].update({
+            "current_lot_index": 0,
+            "nomination_order": ["user_a", "user_b"],
+            "lot_cursor": {"competition": "UCL", "last_club_id": None, "next_index": 0, "exhausted": False}
+        })
+        mock_db.clubs.find = MagicMock(side_effect=lambda query, projection: FakeClubCursor(club_ids, query))
+        mock_db.lots.insert_many = AsyncMock()
+        return engine
+
+    @pytest.mark.asyncio
+    async def test_eager_creation_inserts_in_batches(self):
+        club_ids = [f"club_{i:02d}" for i in range(7)]
+
+        with patch('auction_engine.db') as mock_db, patch('auction_engine.LOT_BATCH_SIZE', 3):
+            engine = self.make_engine_with_clubs(club_ids, mock_db)
+
+            created = await engine._materialize_lots("auction_1")
+
+            assert created == 7
+            batches = [c.args[0] for c in mock_db.lots.insert_many.call_args_list]
+            assert [len(b) for b in batches] == [3, 3, 1]
+            lots = [lot for batch in batches for lot in batch]
+            assert [lot["order_index"] for lot in lots] == list(range(7))
+            assert [lot["nominated_by"] for lot in lots[:3]] == ["user_a", "user_b", "user_a"]
+            assert lots[0]["status"] == "pending"
+            assert engine.active_auctions["auction_1"]["lot_cursor"]["exhausted"] == True
+
+            # Competition filter is pushed down to the clubs query
+            query = mock_db.clubs.find.call_args.args[0]
+            assert {"competitions": "UCL"} in query["$or"]
+
+    @pytest.mark.asyncio
+    async def test_lazy_creation_continues_from_cursor(self):
+        club_ids = [f"club_{i:02d}" for i in range(5)]
+
+        with patch('auction_engine.db') as mock_db:
+            engine = self.make_engine_with_clubs(club_ids, mock_db)
+
+            assert await engine._materialize_lots("auction_1", limit=2) == 2
+            assert engine.active_auctions["auction_1"]["lot_cursor"]["exhausted"] == False
+            assert await engine._materialize_lots("auction_1", limit=2) == 2
+            assert await engine._materialize_lots("auction_1", limit=2) == 1
+            assert engine.active_auctions["auction_1"]["lot_cursor"]["exhausted"] == True
+
+            lots = [lot for c in mock_db.lots.insert_many.call_args_list for lot in c.args[0]]
+            assert [lot["club_id"] for lot in lots] == club_ids
+            assert [lot["order_index"] for lot in lots] == list(range(5))
@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""
+Unit Tests for the Budget Ledger
+Tests league loading, in-memory updates and drift detection
+"""
+
+import pytest
+from unittest.mock import AsyncMock, patch
+import sys
+from pathlib import Path
+
+# Add backend to path
+backend_path = Path(__file__).parent
+sys.path.append(str(backend_path))
+
+from budget_ledger import BudgetLedger
+
+def mock_league_reads(mock_db, rosters, owned, club_slots=3):
+    mock_db.leagues.find_one = AsyncMock(return_value={
+        "_id": "league_1", "settings": {"club_slots_per_manager": club_slots}
+    })
+    mock_db.rosters.find.return_value.to_list = AsyncMock(return_value=rosters)
+    mock_db.roster_clubs.aggregate.return_value.to_list = AsyncMock(return_value=owned)
+
+class TestBudgetLedger:
+    """Test the per-manager ledger behind bid guardrails"""
+
+    @pytest.mark.asyncio
+    async def test_league_loads_once(self):
+        ledger = BudgetLedger()
+
+        with patch('budget_ledger.db') as mock_db:
+            mock_league_reads(
+                mock_db,
+                rosters=[
+                    {"user_id": "user_a", "budget_remaining": 100},
+                    {"user_id": "user_b", "budget_remaining": 80, "ledger_version": 2}
+                ],
+                owned=[{"_id": "user_b", "clubs_owned": 1}]
+            )
+
+            user_a = await ledger.get("league_1", "user_a")
+            user_b = await ledger.get("league_1", "user_b")
+            await ledger.get("league_1", "user_a")
+
+            assert (user_a.budget_remaining, user_a.clubs_owned, user_a.max_slots) == (100, 0, 3)
+            assert (user_b.budget_remaining, user_b.clubs_owned, user_b.version) == (80, 1, 2)
+            mock_db.leagues.find_one.assert_called_once()
+            mock_db.rosters.find.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_sale_and_settings_update_in_memory(self):
+        ledger = BudgetLedger()
+
+        with patch('budget_ledger.db') as mock_db:
+            mock_league_reads(mock_db, rosters=[{"user_id": "user_a", "budget_remaining": 100}], owned=[])
+            entry = await ledger.get("league_1", "user_a")
+
+            ledger.record_sale("league_1", "user_a", 30)
+            assert (entry.budget_remaining, entry.clubs_owned, entry.version) == (70, 1, 1)
+
+            ledger.apply_settings("league_1", club_slots=5)
+            assert entry.max_slots == 5
+            assert entry.slots_remaining == 4
+            assert entry.version == 2
+
+            ledger.remove_manager("league_1", "user_a")
+            mock_db.rosters.find_one = AsyncMock(return_value=None)
+            assert await ledger.get("league_1", "user_a") is None
+
+    @pytest.mark.asyncio
+    async def test_verify_reloads_drifted_entries(self):
+        ledger = BudgetLedger()
+
+        with patch('budget_ledger.db') as mock_db:
+            mock_league_reads(mock_db, rosters=[{"user_id": "user_a", "budget_remaining": 100}], owned=[])
+            await ledger.get("league_1", "user_a")
+
+            # Budget changed outside the ledger's write paths
+            mock_league_reads(mock_db, rosters=[{"user_id": "user_a", "budget_remaining": 60, "ledger_version": 1}], owned=[])
+
+            assert await ledger.verify_league("league_1") == ["user_a"]
+            entry = await ledger.get("league_1", "user_a")
+            assert entry.budget_remaining == 60
+            assert await ledger.verify_league("league_1") == []
+
+class TestMaxBid:
+    """Test reserve-aware max bid headroom"""
+
+    def test_reserves_min_increment_per_other_empty_slot(self):
+        from budget_ledger import ManagerLedger
+
+        entry = ManagerLedger("league_1", "user_a", budget_remaining=100, clubs_owned=0, max_slots=3)
+        assert entry.max_bid(5) == 90
+
+        entry.clubs_owned = 2
+        assert entry.max_bid(5) == 100
+
+        entry.clubs_owned = 3
+        assert entry.max_bid(5) == 0
+
+    @pytest.mark.asyncio
+    async def test_validate_max_bid_rejects_over_commitment(self):
+        from admin_service import AdminService
+        import budget_ledger
+
+        budget_ledger.budget_ledger = None
+        try:
+            with patch('budget_ledger.db') as mock_db:
+                mock_league_reads(mock_db, rosters=[{"user_id": "user_a", "budget_remaining": 100}], owned=[])
+
+                valid, error = await AdminService.validate_max_bid("user_a", "league_1", 98, 1)
+                assert valid == True
+
+                valid, error = await AdminService.validate_max_bid("user_a", "league_1", 99, 1)
+                assert valid == False
+                assert "Maximum bid is 98" in error
+        finally:
+            budget_ledger.budget_ledger = None
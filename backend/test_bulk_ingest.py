@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+Unit Tests for Bulk Result Ingest
+Tests streaming NDJSON/array parsing and per-result idempotency status
+"""
+
+import pytest
+import json
+from unittest.mock import AsyncMock, MagicMock, patch
+import sys
+from pathlib import Path
+
+# Add backend to path
+backend_path = Path(__file__).parent
+sys.path.append(str(backend_path))
+
+from pymongo.errors import BulkWriteError
+from scoring_service import ScoringService
+from models import ResultIngestCreate
+from utils.json_stream import iter_json_items
+
+def result(match_id, league_id="league_1"):
+    return {
+        "league_id": league_id, "match_id": match_id, "season": "2025-26",
+        "home_ext": "home", "away_ext": "away", "home_goals": 2, "away_goals": 1,
+        "kicked_off_at": "2025-09-16T20:00:00Z"
+    }
+
+async def stream(body: bytes, size: int = 7):
+    for start in range(0, len(body), size):
+        yield body[start:start + size]
+
+async def parse(body: bytes, size: int = 7):
+    return [item async for item in iter_json_items(stream(body, size))]
+
+class TestJsonStream:
+    """Test incremental parsing of request bodies"""
+
+    @pytest.mark.asyncio
+    async def test_array_and_ndjson_split_across_chunks(self):
+        items = [result("m1"), result("m2"), {"n": 10}]
+        as_array = json.dumps(items).encode()
+        as_ndjson = "\n".join(json.dumps(i) for i in items).encode()
+
+        for size in (1, 7, len(as_array)):
+            assert await parse(as_array, size) == [(i, None) for i in items]
+        assert await parse(as_ndjson) == [(i, None) for i in items]
+
+    @pytest.mark.asyncio
+    async def test_bad_lines_are_reported_in_place(self):
+        parsed = await parse(b'{"a": 1}\nnot json\n\n{"b": 2}\n')
+        assert [item for item, _ in parsed] == [{"a": 1}, None, {"b": 2}]
+        assert parsed[1][1].startswith("Invalid JSON")
+
+        truncated = await parse(b'[{"a": 1}, {"b": ')
+        assert truncated[0] == ({"a": 1}, None)
+        assert truncated[1][1].startswith("Invalid JSON array")
+
+class TestBulkIngest:
+    """Test bulk upserts and per-result status"""
+
+    @pytest.mark.asyncio
+    async def test_statuses_for_created_replayed_and_invalid(self):
+        body = "\n".join(json.dumps(i) for i in [
+            result("m1"), result("m2"), result("m1"), {"match_id": "m3"}
+        ]).encode()
+
+        with patch('scoring_service.db') as mock_db, patch('cache_generations.db') as generations_db:
+            # m2 already ingested: only the first operation upserts
+            mock_db.result_ingest.bulk_write = AsyncMock(return_value=MagicMock(upserted_ids={0: "id_1"}))
+            generations_db.cache_generations.bulk_write = AsyncMock()
+
+            summary = await ScoringService.ingest_result_stream(iter_json_items(stream(body)))
+
+            operations = mock_db.result_ingest.bulk_write.call_args.args[0]
+            assert len(operations) == 2
+            assert operations[0]._doc["$setOnInsert"]["season"] == "2025-26"
+            generations_db.cache_generations.bulk_write.assert_awaited_once()
+
+        assert [r["status"] for r in summary["results"]] == ["created", "idempotent", "idempotent", "invalid"]
+        assert summary["results"][0]["result_id"] == "id_1"
+        assert (summary["received"], summary["created"], summary["idempotent"], summary["invalid"]) == (4, 1, 2, 1)
+
+    @pytest.mark.asyncio
+    async def test_concurrent_duplicate_is_idempotent(self):
+        with patch('scoring_service.db') as mock_db, patch('cache_generations.db') as generations_db:
+            generations_db.cache_generations.bulk_write = AsyncMock()
+            mock_db.result_ingest.bulk_write = AsyncMock(side_effect=BulkWriteError({
+                "upserted": [{"index": 1, "_id": "id_2"}],
+                "writeErrors": [{"index": 0, "code": 11000, "errmsg": "duplicate key"}]
+            }))
+
+            statuses = await ScoringService.ingest_results_bulk(
+                [ResultIngestCreate(**result("m1")), ResultIngestCreate(**result("m2"))]
+            )
+
+        assert [s["status"] for s in statuses] == ["idempotent", "created"]
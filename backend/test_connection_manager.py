@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""
+Unit Tests for the Socket Connection Manager
+Tests indexed presence lookups and batched presence deltas
+"""
+
+import pytest
+from datetime import datetime, timezone
+from unittest.mock import AsyncMock, MagicMock, patch
+import sys
+from pathlib import Path
+
+# Add backend to path
+backend_path = Path(__file__).parent
+sys.path.append(str(backend_path))
+
+import socket_handler
+from socket_handler import ConnectionManager, PresenceStatus
+from models import UserResponse
+
+def make_user(user_id):
+    return UserResponse(
+        id=user_id,
+        email=f"{user_id}@example.com",
+        display_name=user_id.upper(),
+        verified=True,
+        created_at=datetime.now(timezone.utc)
+    )
+
+@pytest.fixture(autouse=True)
+def reset_presence():
+    socket_handler.user_presence.clear()
+    socket_handler.user_sessions.clear()
+    yield
+    socket_handler.user_presence.clear()
+    socket_handler.user_sessions.clear()
+
+class TestConnectionManager:
+    """Test connection indexes and presence batching"""
+
+    @pytest.mark.asyncio
+    async def test_auction_users_come_from_index(self):
+        manager = ConnectionManager()
+
+        with patch('socket_handler.sio') as mock_sio, patch('socket_handler.PRESENCE_BATCH_INTERVAL', 60):
+            mock_sio.emit = AsyncMock()
+            user_a, user_b = make_user("user_a"), make_user("user_b")
+
+            await manager.add_connection("sid_1", user_a, "auction_1")
+            await manager.add_connection("sid_2", user_a, "auction_1")  # second tab
+            await manager.add_connection("sid_3", user_b, "auction_2")
+
+            assert [u["user_id"] for u in manager.get_auction_users("auction_1")] == ["user_a"]
+            assert [u["user_id"] for u in manager.get_auction_users("auction_2")] == ["user_b"]
+
+            # Closing one tab keeps the user present
+            await manager.remove_connection("sid_1")
+            assert socket_handler.user_presence["user_a"]["status"] == PresenceStatus.ONLINE
+            assert len(manager.get_auction_users("auction_1")) == 1
+
+            await manager.remove_connection("sid_2")
+            assert manager.get_auction_users("auction_1") == []
+            assert socket_handler.user_presence["user_a"]["status"] == PresenceStatus.OFFLINE
+            assert "auction_1" not in manager.auction_sids
+            manager.presence_flush_task.cancel()
+
+    @pytest.mark.asyncio
+    async def test_presence_burst_is_one_delta_per_room(self):
+        manager = ConnectionManager()
+
+        with patch('socket_handler.sio') as mock_sio, patch('socket_handler.PRESENCE_BATCH_INTERVAL', 60):
+            mock_sio.emit = AsyncMock()
+
+            for i in range(10):
+                await manager.add_connection(f"sid_{i}", make_user(f"user_{i}"), "auction_1")
+            await manager.add_connection("sid_x", make_user("user_x"), "auction_2")
+            await manager.remove_connection("sid_3")
+
+            mock_sio.emit.assert_not_called()
+            manager.presence_flush_task.cancel()
+            await manager.flush_presence()
+
+            assert mock_sio.emit.call_count == 2
+            rooms = {c.kwargs["room"]: c.args[1]["changes"] for c in mock_sio.emit.call_args_list}
+            assert len(rooms["auction_auction_1"]) == 10
+            statuses = {change["user_id"]: change["status"] for change in rooms["auction_auction_1"]}
+            assert statuses["user_3"] == PresenceStatus.OFFLINE
+            assert statuses["user_4"] == PresenceStatus.ONLINE
+
+class TestRegisteredSocketHandlers:
+    """Test the handlers on the Socket.IO server the app mounts"""
+
+    @pytest.mark.asyncio
+    async def test_join_auction_feeds_presence_and_snapshot(self):
+        import server
+
+        join_auction = server.sio.handlers["/"]["join_auction"]
+        manager = ConnectionManager()
+        engine = MagicMock(lot_states={}, send_lot_snapshot=AsyncMock())
+        cache = MagicMock(get=AsyncMock(return_value=MagicMock(
+            auction={"id": "auction_1", "league_id": "league_1"},
+            current_lot=None, rosters={}, participants=[], version=3
+        )))
+        socket_handler.user_sessions["sid_1"] = {"user": make_user("user_a")}
+
+        with patch('socket_handler.sio') as mock_sio, \
+             patch('socket_handler.PRESENCE_BATCH_INTERVAL', 60), \
+             patch('socket_handler.connection_manager', manager), \
+             patch('socket_handler.get_snapshot_cache', return_value=cache), \
+             patch('socket_handler.get_auction_engine', return_value=engine), \
+             patch('socket_handler.check_league_access', AsyncMock(return_value="manager")) as access:
+            mock_sio.emit = AsyncMock()
+            mock_sio.enter_room = AsyncMock()
+
+            await join_auction("sid_1", {"auction_id": "auction_1"})
+
+            access.assert_awaited_once_with("user_a", "league_1")
+            mock_sio.enter_room.assert_awaited_once_with("sid_1", "auction_auction_1")
+            sent = {c.args[0]: c.args[1] for c in mock_sio.emit.call_args_list}
+            assert sent["auction_snapshot"]["state_version"] == 3
+            assert [u["user_id"] for u in sent["presence_list"]["users"]] == ["user_a"]
+            engine.send_lot_snapshot.assert_awaited_once_with("auction_1", "sid_1")
+
+            # The join is broadcast to the room as a batched presence_delta
+            manager.presence_flush_task.cancel()
+            await manager.flush_presence()
+            delta = mock_sio.emit.call_args
+            assert delta.args[0] == "presence_delta"
+            assert delta.kwargs["room"] == "auction_auction_1"
+            assert delta.args[1]["changes"][0]["status"] == PresenceStatus.ONLINE
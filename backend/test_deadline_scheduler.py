@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+Unit Tests for the Deadline Scheduler
+Tests firing order, O(1) extension, cancellation and queue depth
+"""
+
+import pytest
+import asyncio
+from unittest.mock import patch
+import sys
+from pathlib import Path
+
+# Add backend to path
+backend_path = Path(__file__).parent
+sys.path.append(str(backend_path))
+
+from deadline_scheduler import DeadlineScheduler
+
+class FakeClock:
+    def __init__(self, start_ms: int = 1_000_000):
+        self.ms = start_ms
+
+    def __call__(self) -> int:
+        return self.ms
+
+def recorder(fired, name):
+    async def callback():
+        fired.append(name)
+    return callback
+
+class TestDeadlineScheduler:
+    """Test deadline bookkeeping without waiting on real time"""
+
+    @pytest.mark.asyncio
+    async def test_fires_due_deadlines_in_order(self):
+        clock = FakeClock()
+        fired = []
+
+        with patch('deadline_scheduler.now_ms', clock):
+            scheduler = DeadlineScheduler()
+            scheduler.schedule("lot:b", clock.ms + 200, recorder(fired, "b"))
+            scheduler.schedule("lot:a", clock.ms + 100, recorder(fired, "a"))
+            scheduler.schedule("lot:c", clock.ms + 300, recorder(fired, "c"))
+            assert scheduler.depth == 3
+
+            clock.ms += 250
+            assert scheduler.run_due() == 2
+            await asyncio.sleep(0)
+
+            assert fired == ["a", "b"]
+            assert scheduler.depth == 1
+            await scheduler.stop()
+
+    @pytest.mark.asyncio
+    async def test_extension_does_not_grow_heap(self):
+        clock = FakeClock()
+        fired = []
+
+        with patch('deadline_scheduler.now_ms', clock):
+            scheduler = DeadlineScheduler()
+            scheduler.schedule("lot:1", clock.ms + 100, recorder(fired, "first"))
+
+            # Bidding war: many extensions, each later than the last
+            for i in range(50):
+                scheduler.schedule("lot:1", clock.ms + 200 + i, recorder(fired, "extended"))
+            assert scheduler.heap_size == 1
+            assert scheduler.depth == 1
+
+            # Original slot surfaces but is re-queued at the extended time
+            clock.ms += 150
+            assert scheduler.run_due() == 0
+            await asyncio.sleep(0)
+            assert fired == []
+
+            clock.ms += 100
+            assert scheduler.run_due() == 1
+            await asyncio.sleep(0)
+            assert fired == ["extended"]
+            await scheduler.stop()
+
+    @pytest.mark.asyncio
+    async def test_earlier_reschedule_and_cancel(self):
+        clock = FakeClock()
+        fired = []
+
+        with patch('deadline_scheduler.now_ms', clock):
+            scheduler = DeadlineScheduler()
+            scheduler.schedule("undo:1", clock.ms + 500, recorder(fired, "late"))
+            scheduler.schedule("undo:1", clock.ms + 100, recorder(fired, "early"))
+            scheduler.schedule("lot:2", clock.ms + 100, recorder(fired, "cancelled"))
+            assert scheduler.cancel("lot:2") == True
+
+            clock.ms += 1000
+            assert scheduler.run_due() == 1
+            await asyncio.sleep(0)
+
+            assert fired == ["early"]
+            assert scheduler.depth == 0
+            assert scheduler.heap_size == 0
+            await scheduler.stop()
+
+    @pytest.mark.asyncio
+    async def test_runner_fires_without_manual_poll(self):
+        fired = []
+        scheduler = DeadlineScheduler()
+
+        from time_provider import now_ms
+        scheduler.schedule("lot:1", now_ms() + 20, recorder(fired, "lot"))
+
+        await asyncio.sleep(0.1)
+        assert fired == ["lot"]
+        await scheduler.stop()
@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+"""
+Unit Tests for the Fixtures Read Model
+Tests generation-based rebuilds and ETag revalidation of the fixtures page
+"""
+
+import pytest
+import json
+from unittest.mock import AsyncMock, MagicMock, patch
+import sys
+from pathlib import Path
+
+# Add backend to path
+backend_path = Path(__file__).parent
+sys.path.append(str(backend_path))
+
+from aggregation_service import AggregationService
+from server import get_league_fixtures
+
+CONTENT = {"league_id": "league_1", "season": "2025-26", "fixtures": [], "grouped_fixtures": {}, "ownership_summary": {}}
+
+def make_request(etag=None):
+    request = MagicMock()
+    request.headers = {"if-none-match": etag} if etag else {}
+    return request
+
+class TestFixturesReadModel:
+    """Test the per-league/season fixtures document"""
+
+    @pytest.mark.asyncio
+    async def test_current_view_is_served_without_rebuilding(self):
+        with patch('aggregation_service.db') as mock_db, \
+             patch.object(AggregationService, '_build_league_fixtures', AsyncMock()) as build:
+            mock_db.league_fixtures.find_one = AsyncMock(return_value={"generation": 3, "content": CONTENT})
+
+            assert await AggregationService.get_league_fixtures("league_1", "2025-26", 3) == CONTENT
+            build.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_stale_view_is_rebuilt_and_stored(self):
+        with patch('aggregation_service.db') as mock_db, \
+             patch.object(AggregationService, '_build_league_fixtures', AsyncMock(return_value=CONTENT)):
+            mock_db.league_fixtures.find_one = AsyncMock(return_value={"generation": 2, "content": {}})
+            mock_db.league_fixtures.replace_one = AsyncMock()
+
+            assert await AggregationService.get_league_fixtures("league_1", "2025-26", 3) == CONTENT
+
+            stored = mock_db.league_fixtures.replace_one.call_args.args[1]
+            assert (stored["_id"], stored["generation"]) == ("league_1:2025-26", 3)
+
+    @pytest.mark.asyncio
+    async def test_endpoint_revalidates_on_generation(self):
+        user = MagicMock(id="user_a")
+        with patch('server.require_league_access', AsyncMock()), \
+             patch('cache_generations.db') as generations_db, \
+             patch.object(AggregationService, 'get_league_fixtures', AsyncMock(return_value=CONTENT)) as load:
+            generations_db.cache_generations.find_one = AsyncMock(return_value={"_id": "league_1", "fixtures": 3})
+
+            response = await get_league_fixtures("league_1", make_request(), "2025-26", user)
+            assert response.status_code == 200
+            assert json.loads(response.body) == CONTENT
+
+            cached = await get_league_fixtures("league_1", make_request(response.headers["etag"]), "2025-26", user)
+            assert cached.status_code == 304
+            load.assert_awaited_once()
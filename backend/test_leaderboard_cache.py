@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+Unit Tests for the Leaderboard Cache
+Tests generation-based invalidation, request coalescing and stale-while-revalidate
+"""
+
+import pytest
+import asyncio
+from unittest.mock import AsyncMock, patch
+import sys
+from pathlib import Path
+
+# Add backend to path
+backend_path = Path(__file__).parent
+sys.path.append(str(backend_path))
+
+from aggregation_service import LeaderboardCache
+
+def counting_compute(gate: asyncio.Event = None):
+    calls = []
+
+    async def compute(league_id):
+        calls.append(league_id)
+        if gate is not None:
+            await gate.wait()
+        return {"league_id": league_id, "version": len(calls)}
+
+    return compute, calls
+
+class TestLeaderboardCache:
+    """Test per-league leaderboard caching"""
+
+    @pytest.mark.asyncio
+    async def test_concurrent_misses_share_one_compute(self):
+        cache = LeaderboardCache()
+        gate = asyncio.Event()
+        compute, calls = counting_compute(gate)
+
+        with patch('cache_generations.db') as mock_db:
+            mock_db.cache_generations.find_one = AsyncMock(return_value={"standings": 1})
+
+            waiters = [asyncio.create_task(cache.get("league_1", compute)) for _ in range(8)]
+            await asyncio.sleep(0)
+            gate.set()
+            responses = await asyncio.gather(*waiters)
+
+            assert calls == ["league_1"]
+            assert all(r == {"league_id": "league_1", "version": 1} for r in responses)
+
+            # Same generation: served from memory
+            assert await cache.get("league_1", compute) == responses[0]
+            assert calls == ["league_1"]
+
+    @pytest.mark.asyncio
+    async def test_new_generation_serves_stale_while_refreshing(self):
+        cache = LeaderboardCache()
+        compute, calls = counting_compute()
+
+        with patch('cache_generations.db') as mock_db:
+            mock_db.cache_generations.find_one = AsyncMock(return_value={"standings": 1})
+            first = await cache.get("league_1", compute)
+
+            mock_db.cache_generations.find_one = AsyncMock(return_value={"standings": 2})
+            assert await cache.get("league_1", compute) == first  # Stale, refresh started
+            await asyncio.sleep(0)
+
+            assert (await cache.get("league_1", compute))["version"] == 2
+            assert len(calls) == 2
+
+    @pytest.mark.asyncio
+    async def test_failed_compute_is_not_cached(self):
+        cache = LeaderboardCache()
+        compute = AsyncMock(side_effect=[Exception("db down"), {"league_id": "league_1"}])
+
+        with patch('cache_generations.db') as mock_db:
+            mock_db.cache_generations.find_one = AsyncMock(return_value=None)
+
+            with pytest.raises(RuntimeError):
+                await cache.get("league_1", compute)
+            assert await cache.get("league_1", compute) == {"league_id": "league_1"}
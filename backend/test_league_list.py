@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+"""
+Unit Tests for the League List Endpoint
+Tests the single-aggregation league list and its ETag handling
+"""
+
+import pytest
+import json
+from datetime import datetime, timezone
+from unittest.mock import AsyncMock, MagicMock, patch
+import sys
+from pathlib import Path
+
+# Add backend to path
+backend_path = Path(__file__).parent
+sys.path.append(str(backend_path))
+
+from server import get_my_leagues
+from models import UserResponse
+
+USER = UserResponse(
+    id="user_a", email="a@example.com", display_name="A",
+    verified=True, created_at=datetime(2025, 1, 1, tzinfo=timezone.utc)
+)
+
+LEAGUE = {
+    "_id": "league_1",
+    "name": "League One",
+    "competition": "UCL",
+    "season": "2025-26",
+    "commissioner_id": "user_a",
+    "settings": {},
+    "status": "setup",
+    "member_count": 4,
+    "created_at": datetime(2025, 1, 1, tzinfo=timezone.utc)
+}
+
+def make_request(etag=None):
+    request = MagicMock()
+    request.headers = {"if-none-match": etag} if etag else {}
+    return request
+
+class TestMyLeagues:
+    """Test GET /leagues"""
+
+    @pytest.mark.asyncio
+    async def test_single_aggregation_and_not_modified(self):
+        with patch('server.db') as mock_db:
+            mock_db.memberships.aggregate.return_value.to_list = AsyncMock(return_value=[LEAGUE])
+
+            response = await get_my_leagues(make_request(), USER)
+            body = json.loads(response.body)
+
+            assert response.status_code == 200
+            assert [(league["id"], league["member_count"]) for league in body] == [("league_1", 4)]
+            mock_db.memberships.aggregate.assert_called_once()
+            mock_db.memberships.count_documents.assert_not_called()
+
+            etag = response.headers["etag"]
+            cached = await get_my_leagues(make_request(etag), USER)
+            assert cached.status_code == 304
+            assert cached.headers["etag"] == etag
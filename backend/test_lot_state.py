@@ -0,0 +1,171 @@
+#!/usr/bin/env python3
+"""
+Unit Tests for In-Memory Lot State
+Tests bid validation against live lot state and write-behind persistence
+"""
+
+import pytest
+import asyncio
+from datetime import datetime, timezone
+from unittest.mock import AsyncMock, patch
+import sys
+from pathlib import Path
+
+# Add backend to path
+backend_path = Path(__file__).parent
+sys.path.append(str(backend_path))
+
+from pymongo.errors import BulkWriteError
+
+from lot_state import LiveLotState, LotWriteBehind, WriteBehindError, build_bid_document
+
+def make_lot_state(**kwargs) -> LiveLotState:
+    return LiveLotState(
+        lot_id="lot_1",
+        auction_id="auction_1",
+        club_id="club_1",
+        order_index=0,
+        timer_ends_at=datetime(2025, 1, 1, tzinfo=timezone.utc),
+        **kwargs
+    )
+
+class TestLiveLotState:
+    """Test bid validation against in-memory lot state"""
+
+    def test_first_bid_must_meet_min_increment(self):
+        lot_state = make_lot_state()
+
+        valid, error = lot_state.validate_bid(0, 1)
+        assert valid == False
+
+        valid, error = lot_state.validate_bid(1, 1)
+        assert valid == True
+        assert error == ""
+
+    def test_bid_must_beat_current_by_increment(self):
+        lot_state = make_lot_state(current_bid=10, leading_bidder_id="user_a")
+
+        valid, error = lot_state.validate_bid(10, 5)
+        assert valid == False
+        assert "higher than current bid" in error
+
+        valid, error = lot_state.validate_bid(12, 5)
+        assert valid == False
+        assert "at least 15" in error
+
+        valid, error = lot_state.validate_bid(15, 5)
+        assert valid == True
+
+    def test_closed_lot_rejects_bids(self):
+        lot_state = make_lot_state(status="closing")
+
+        valid, error = lot_state.validate_bid(100, 1)
+        assert valid == False
+        assert "no longer accepting bids" in error
+
+    def test_apply_bid_updates_leader(self):
+        lot_state = make_lot_state()
+        lot_state.apply_bid("user_a", 5)
+
+        assert lot_state.current_bid == 5
+        assert lot_state.leading_bidder_id == "user_a"
+        assert lot_state.bids_count == 1
+        assert lot_state.persisted_fields()["top_bidder_id"] == "user_a"
+
+    def test_from_document_reads_either_bidder_field(self):
+        lot_state = LiveLotState.from_document({
+            "_id": "lot_1",
+            "auction_id": "auction_1",
+            "club_id": "club_1",
+            "status": "going_once",
+            "current_bid": 20,
+            "top_bidder_id": "user_b"
+        })
+
+        assert lot_state.leading_bidder_id == "user_b"
+        assert lot_state.is_biddable == True
+
+    @pytest.mark.asyncio
+    async def test_concurrent_bids_accept_one_winner(self):
+        """Only one of several identical concurrent bids may be accepted"""
+        lot_state = make_lot_state()
+        accepted = []
+
+        async def bid(bidder_id):
+            async with lot_state.lock:
+                valid, _ = lot_state.validate_bid(10, 1)
+                await asyncio.sleep(0)
+                if valid:
+                    lot_state.apply_bid(bidder_id, 10)
+                    accepted.append(bidder_id)
+
+        await asyncio.gather(*(bid(f"user_{i}") for i in range(5)))
+
+        assert len(accepted) == 1
+        assert lot_state.leading_bidder_id == accepted[0]
+
+class TestLotWriteBehind:
+    """Test write-behind persistence of bids and lot state"""
+
+    @pytest.mark.asyncio
+    async def test_flush_coalesces_lot_updates(self):
+        writer = LotWriteBehind()
+
+        with patch('lot_state.db') as mock_db:
+            mock_db.lots.bulk_write = AsyncMock()
+            mock_db.bids.insert_many = AsyncMock()
+
+            ts = datetime(2025, 1, 1, tzinfo=timezone.utc)
+            writer.record_bid(build_bid_document("lot_1", "auction_1", "league_1", "user_a", 5, ts))
+            writer.record_lot("lot_1", {"current_bid": 5, "status": "open"})
+            writer.record_bid(build_bid_document("lot_1", "auction_1", "league_1", "user_b", 6, ts))
+            writer.record_lot("lot_1", {"current_bid": 6})
+            await writer.stop()
+
+            operations = mock_db.lots.bulk_write.call_args[0][0]
+            assert len(operations) == 1
+            assert operations[0]._doc["$set"] == {"current_bid": 6, "status": "open"}
+
+            bids = mock_db.bids.insert_many.call_args[0][0]
+            assert [b["amount"] for b in bids] == [5, 6]
+            assert writer.pending_count == 0
+
+    @pytest.mark.asyncio
+    async def test_failed_flush_requeues(self):
+        writer = LotWriteBehind()
+
+        with patch('lot_state.db') as mock_db:
+            mock_db.lots.bulk_write = AsyncMock(side_effect=Exception("db down"))
+            mock_db.bids.insert_many = AsyncMock(side_effect=Exception("db down"))
+
+            ts = datetime(2025, 1, 1, tzinfo=timezone.utc)
+            writer.record_bid(build_bid_document("lot_1", "auction_1", "league_1", "user_a", 5, ts))
+            writer.record_lot("lot_1", {"current_bid": 5})
+            with pytest.raises(WriteBehindError):
+                await writer.stop()
+
+            assert writer.pending_count == 2
+
+    @pytest.mark.asyncio
+    async def test_partial_bid_failure_requeues_only_unwritten_bids(self):
+        writer = LotWriteBehind()
+        ts = datetime(2025, 1, 1, tzinfo=timezone.utc)
+        bids = [build_bid_document("lot_1", "auction_1", "league_1", "user_a", amount, ts) for amount in (5, 6, 7)]
+
+        with patch('lot_state.db') as mock_db:
+            mock_db.bids.insert_many = AsyncMock(side_effect=BulkWriteError({"writeErrors": [
+                {"index": 0, "code": 11000, "errmsg": "duplicate key"},  # written by an earlier attempt
+                {"index": 2, "code": 91, "errmsg": "shutdown in progress"}
+            ]}))
+            for bid in bids:
+                writer.record_bid(bid)
+            with pytest.raises(WriteBehindError):
+                await writer.stop()
+
+            assert writer._pending_bids == [bids[2]]
+
+            # The retry writes the remaining bid and drains the queue
+            mock_db.bids.insert_many = AsyncMock()
+            await writer.flush()
+            assert mock_db.bids.insert_many.call_args[0][0] == [bids[2]]
+            assert writer.pending_count == 0
@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""
+Unit Tests for Per-Manager Matchday Series
+Tests head-to-head, all-pairs matrices and rank history computed from series documents
+"""
+
+import pytest
+from unittest.mock import AsyncMock, MagicMock, patch
+import sys
+from pathlib import Path
+
+# Add backend to path
+backend_path = Path(__file__).parent
+sys.path.append(str(backend_path))
+
+from aggregation_service import AggregationService
+
+SERIES = [
+    {"league_id": "league_1", "user_id": "user_a", "matchdays": {
+        "1": {"points": 5, "matches": 1}, "2": {"points": 1, "matches": 1}, "3": {"points": 4, "matches": 2}
+    }},
+    {"league_id": "league_1", "user_id": "user_b", "matchdays": {
+        "1": {"points": 2, "matches": 1}, "2": {"points": 1, "matches": 1}, "3": {"points": 8, "matches": 1}
+    }},
+    {"league_id": "league_1", "user_id": "user_c", "matchdays": {
+        "2": {"points": 6, "matches": 1}
+    }}
+]
+
+USERS = [
+    {"_id": "user_a", "display_name": "A"},
+    {"_id": "user_b", "display_name": "B"},
+    {"_id": "user_c", "display_name": "C"}
+]
+
+@pytest.fixture
+def series_db():
+    with patch('scoring_service.db') as scoring_db, patch('aggregation_service.db') as aggregation_db:
+        scoring_db.manager_series.find = MagicMock(side_effect=lambda q: MagicMock(to_list=AsyncMock(return_value=[
+            doc for doc in SERIES if "user_id" not in q or doc["user_id"] in q["user_id"]["$in"]
+        ])))
+        scoring_db.materialized_leagues.find.return_value.to_list = AsyncMock(return_value=[{"_id": "league_1"}])
+        aggregation_db.users.find.return_value.to_list = AsyncMock(return_value=USERS)
+        yield scoring_db
+
+class TestManagerSeries:
+    """Test analytics computed from manager series"""
+
+    @pytest.mark.asyncio
+    async def test_head_to_head_slices_two_series(self, series_db):
+        result = await AggregationService.get_manager_head_to_head("league_1", "user_a", "user_b")
+
+        assert result["matchdays"] == [1, 2, 3]
+        user_a, user_b = result["comparison"]
+        assert (user_a["total_points"], user_a["matches_played"], user_a["avg_points"]) == (10, 4, 2.5)
+        assert (user_a["best_matchday"], user_a["worst_matchday"]) == (5, 1)
+        assert user_b["cumulative"] == [2, 3, 11]
+        assert result["head_to_head"] == {"user1_wins": 1, "user2_wins": 1, "draws": 1, "lead": [3, 3, -1]}
+        series_db.weekly_points.aggregate.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_matrix_counts_only_matchdays_both_played(self, series_db):
+        result = await AggregationService.get_league_head_to_head_matrix("league_1")
+
+        assert [m["user_id"] for m in result["managers"]] == ["user_a", "user_b", "user_c"]
+        assert result["wins"] == [[0, 1, 0], [1, 0, 0], [1, 1, 0]]
+        assert result["draws"] == [[0, 1, 0], [1, 0, 0], [0, 0, 0]]
+
+    @pytest.mark.asyncio
+    async def test_rank_history_shares_ranks_on_ties(self, series_db):
+        result = await AggregationService.get_league_rank_history("league_1")
+
+        ranks = {m["user_id"]: m["ranks"] for m in result["managers"]}
+        assert ranks == {"user_a": [1, 1, 2], "user_b": [2, 3, 1], "user_c": [3, 1, 3]}
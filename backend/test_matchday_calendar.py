@@ -0,0 +1,191 @@
+#!/usr/bin/env python3
+"""
+Unit Tests for the Matchday Calendar
+Tests fixture-derived matchday intervals, profile fallback and season lookup
+"""
+
+import pytest
+from datetime import datetime, timezone
+from unittest.mock import AsyncMock, MagicMock, patch
+import sys
+from pathlib import Path
+
+# Add backend to path
+backend_path = Path(__file__).parent
+sys.path.append(str(backend_path))
+
+from matchday_calendar import MatchdayCalendar, MatchdayCalendarIndex, DEFAULT_CALENDAR, season_for
+
+def utc(*args):
+    return datetime(*args, tzinfo=timezone.utc)
+
+class TestMatchdayCalendar:
+    """Test matchday interval lookup"""
+
+    def test_fixtures_cluster_into_matchdays(self):
+        dates = [
+            utc(2025, 9, 16, 20), utc(2025, 9, 17, 20), utc(2025, 9, 18, 20),  # Matchday 1 (Tue-Thu)
+            utc(2025, 9, 30, 20), utc(2025, 10, 1, 20),                        # Matchday 2
+            utc(2026, 2, 17, 20)                                               # Knockout
+        ]
+        calendar = MatchdayCalendar.from_fixtures("2025-26", reversed(dates), DEFAULT_CALENDAR)
+
+        assert calendar.matchday(utc(2025, 9, 1)) == 1  # Before the first fixture
+        assert calendar.matchday(utc(2025, 9, 18, 22)) == 1
+        assert calendar.matchday(datetime(2025, 10, 1, 20)) == 2  # Naive datetimes are UTC
+        assert calendar.bucket(utc(2026, 3, 1)) == {"type": "matchday", "value": 3}
+        assert calendar.stage(3) == "group_stage"
+
+    def test_two_legged_ties_share_a_stage(self):
+        group = [utc(2025, 9, 16) + (utc(2025, 9, 30) - utc(2025, 9, 16)) * i for i in range(6)]
+        knockout = [
+            utc(2026, 2, 17), utc(2026, 3, 10),  # Round of 16, two legs
+            utc(2026, 4, 7), utc(2026, 4, 14),   # Quarter finals
+            utc(2026, 4, 28), utc(2026, 5, 5),   # Semi finals
+            utc(2026, 5, 30)                     # Final
+        ]
+        calendar = MatchdayCalendar.from_fixtures("2025-26", group + knockout, DEFAULT_CALENDAR)
+
+        assert [calendar.stage(md) for md in range(6, 14)] == [
+            "group_stage", "round_of_16", "round_of_16", "quarter_finals", "quarter_finals",
+            "semi_finals", "semi_finals", "final"
+        ]
+
+    def test_fixture_stages_and_stage_windows_override_counting(self):
+        dates = [utc(2025, 9, 16), utc(2026, 2, 17), utc(2026, 3, 10), utc(2026, 4, 7)]
+        config = {**DEFAULT_CALENDAR, "group_matchdays": 1, "knockout_stage_starts": {
+            "round_of_16": "02-01", "quarter_finals": "04-01"
+        }}
+        calendar = MatchdayCalendar.from_fixtures("2025-26", dates, config, {utc(2026, 2, 17): "playoffs"})
+
+        assert [calendar.stage(md) for md in range(1, 5)] == [
+            "group_stage", "playoffs", "round_of_16", "quarter_finals"
+        ]
+
+    def test_profile_windows_follow_the_season(self):
+        calendar = MatchdayCalendar.from_profile("2025-26", DEFAULT_CALENDAR)
+
+        assert calendar.matchday(utc(2025, 9, 14)) == 1
+        assert calendar.matchday(utc(2025, 10, 12)) == 3
+        assert calendar.matchday(utc(2026, 2, 15)) == 9
+        assert calendar.stage(9) == "semi_finals"
+        assert calendar.stage(12) == "final"
+
+    def test_season_for_kickoff(self):
+        assert season_for(utc(2024, 9, 20)) == "2024-25"
+        assert season_for(utc(2025, 5, 31)) == "2024-25"
+        assert season_for(utc(2099, 8, 1)) == "2099-00"
+
+def calendar_db(mock_db, stored=None):
+    """Leagues of two competitions, with any stored calendar signatures"""
+    mock_db.leagues.find.return_value.to_list = AsyncMock(return_value=[
+        {"_id": "league_ucl", "competition": "UCL"}, {"_id": "league_uel", "competition": "UEL"}
+    ])
+    mock_db.leagues.distinct = AsyncMock(side_effect=lambda field, query: [
+        league_id for league_id, competition in (("league_ucl", "UCL"), ("league_uel", "UEL"))
+        if competition == query["competition"]
+    ])
+    mock_db.matchday_calendars.find.return_value.to_list = AsyncMock(return_value=stored or [])
+    mock_db.matchday_calendars.insert_one = AsyncMock()
+    mock_db.matchday_calendars.update_one = AsyncMock(return_value=MagicMock(modified_count=1))
+
+class TestMatchdayCalendarIndex:
+    """Test building calendars once per competition and season"""
+
+    @pytest.mark.asyncio
+    async def test_load_builds_each_season_once(self):
+        index = MatchdayCalendarIndex()
+        with patch('matchday_calendar.db') as mock_db:
+            calendar_db(mock_db)
+            mock_db.competition_profiles.find_one = AsyncMock(return_value={"calendar": {"matchday_gap_days": 0}})
+            mock_db.fixtures.aggregate = MagicMock(side_effect=lambda pipeline: MagicMock(to_list=AsyncMock(
+                return_value=[{"_id": utc(2025, 9, 16)}, {"_id": utc(2025, 9, 17)}]
+                if pipeline[0]["$match"]["season"] == "2025-26" else []
+            )))
+
+            await index.load([("UCL", "2025-26"), ("UCL", "2024-25")])
+            await index.load([("UCL", "2025-26")])
+
+            assert mock_db.fixtures.aggregate.call_count == 2
+            mock_db.competition_profiles.find_one.assert_awaited_once()
+            # First builds are recorded, not treated as changes
+            assert mock_db.matchday_calendars.insert_one.await_count == 2
+            mock_db.matchday_calendars.update_one.assert_not_called()
+
+        assert index.get("UCL", "2025-26").source == "fixtures"
+        assert index.get("UCL", "2025-26").matchday(utc(2025, 9, 17, 12)) == 2  # Any gap splits
+        assert index.get("UCL", "2024-25").source == "profile"
+        assert index.get(None, None, utc(2025, 9, 17)).season == "2025-26"
+
+    @pytest.mark.asyncio
+    async def test_competitions_build_from_their_own_leagues_fixtures(self):
+        index = MatchdayCalendarIndex()
+        with patch('matchday_calendar.db') as mock_db:
+            calendar_db(mock_db)
+            mock_db.competition_profiles.find_one = AsyncMock(return_value=None)
+            mock_db.fixtures.aggregate = MagicMock(side_effect=lambda pipeline: MagicMock(to_list=AsyncMock(
+                return_value=[{"_id": utc(2025, 9, 18)}] if pipeline[0]["$match"]["league_id"]["$in"] == ["league_uel"] else []
+            )))
+
+            competitions = await index.league_competitions(["league_ucl", "league_uel", "league_gone"])
+            assert competitions == {"league_ucl": "UCL", "league_uel": "UEL", "league_gone": "UCL"}
+            await index.load({("UCL", "2025-26"), ("UEL", "2025-26")})
+
+            profiles = {c.args[0]["_id"] for c in mock_db.competition_profiles.find_one.call_args_list}
+            assert profiles == {"ucl", "uel"}
+
+        assert index.get("UCL", "2025-26").source == "profile"
+        assert index.get("UEL", "2025-26").source == "fixtures"
+
+    @pytest.mark.asyncio
+    async def test_fallback_calendar_is_rebuilt_once_fixtures_exist(self):
+        index = MatchdayCalendarIndex(ttl_seconds=0)
+        with patch('matchday_calendar.db') as mock_db, \
+             patch('cache_generations.db') as generations_db, \
+             patch('rescoring_service.RescoringService.start_rescore_job') as start_rescore_job:
+            calendar_db(mock_db)
+            generations_db.cache_generations.bulk_write = AsyncMock()
+            mock_db.competition_profiles.find_one = AsyncMock(return_value=None)
+            mock_db.fixtures.aggregate.return_value.to_list = AsyncMock(return_value=[])
+            await index.load([("UCL", "2025-26")])
+            assert index.get("UCL", "2025-26").source == "profile"
+            profile_signature = index.get("UCL", "2025-26").signature
+            mock_db.matchday_calendars.find.return_value.to_list = AsyncMock(return_value=[
+                {"competition": "UCL", "season": "2025-26", "signature": profile_signature}
+            ])
+
+            # Fixtures written by another process appear once the calendar expires
+            mock_db.fixtures.aggregate.return_value.to_list = AsyncMock(return_value=[{"_id": utc(2025, 9, 16)}])
+            await index.load([("UCL", "2025-26")])
+            assert index.get("UCL", "2025-26").source == "fixtures"
+
+            # The buckets moved: swap the stored signature, re-score the competition's
+            # leagues and rebuild their fixtures pages, which embed matchdays and stages
+            query, update = mock_db.matchday_calendars.update_one.call_args.args
+            assert query == {"_id": "UCL:2025-26", "signature": profile_signature}
+            assert update["$set"]["signature"] == index.get("UCL", "2025-26").signature
+            start_rescore_job.assert_called_once_with("league_ucl")
+            bumps = generations_db.cache_generations.bulk_write.call_args.args[0]
+            assert [(op._filter["_id"], op._doc["$inc"]) for op in bumps] == [("league_ucl", {"fixtures": 1})]
+
+    @pytest.mark.asyncio
+    async def test_calendar_changed_elsewhere_is_rebuilt_without_rescoring(self):
+        index = MatchdayCalendarIndex()
+        with patch('matchday_calendar.db') as mock_db, \
+             patch('rescoring_service.RescoringService.start_rescore_job') as start_rescore_job:
+            calendar_db(mock_db)
+            mock_db.competition_profiles.find_one = AsyncMock(return_value=None)
+            mock_db.fixtures.aggregate.return_value.to_list = AsyncMock(return_value=[])
+            await index.load([("UCL", "2025-26")])
+
+            # Another process saw new fixtures and won the swap; this copy is still fresh
+            mock_db.fixtures.aggregate.return_value.to_list = AsyncMock(return_value=[{"_id": utc(2025, 9, 16)}])
+            fixtures_signature = MatchdayCalendar.from_fixtures("2025-26", [utc(2025, 9, 16)], DEFAULT_CALENDAR).signature
+            mock_db.matchday_calendars.find.return_value.to_list = AsyncMock(return_value=[
+                {"competition": "UCL", "season": "2025-26", "signature": fixtures_signature}
+            ])
+            await index.load([("UCL", "2025-26")])
+
+            assert index.get("UCL", "2025-26").signature == fixtures_signature
+            mock_db.matchday_calendars.update_one.assert_not_called()
+            start_rescore_job.assert_not_called()
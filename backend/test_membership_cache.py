@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""
+Unit Tests for the Membership Cache
+Tests bulk league loads behind league access and commissioner checks
+"""
+
+import pytest
+from unittest.mock import AsyncMock, MagicMock, patch
+import sys
+from pathlib import Path
+
+# Add backend to path
+backend_path = Path(__file__).parent
+sys.path.append(str(backend_path))
+
+import membership_cache
+from membership_cache import MembershipCache
+
+def mock_membership_reads(mock_db, league_memberships, memberships):
+    mock_db.league_memberships.find.return_value.to_list = AsyncMock(return_value=league_memberships)
+    mock_db.memberships.find = MagicMock(side_effect=lambda query, projection: MagicMock(to_list=AsyncMock(
+        return_value=[m for m in memberships if m["role"] == query["role"]]
+    )))
+
+@pytest.fixture(autouse=True)
+def reset_membership_cache():
+    membership_cache.membership_cache = None
+    yield
+    membership_cache.membership_cache = None
+
+@pytest.fixture
+def generations():
+    """Membership generations shared by every process, as in cache_generations"""
+    counters = {}
+    with patch('cache_generations.db') as generations_db:
+        generations_db.cache_generations.find_one = AsyncMock(
+            side_effect=lambda query, projection: {"memberships": counters.get(query["_id"], 0)}
+        )
+        async def bulk_write(operations, ordered=False):
+            for op in operations:
+                counters[op._filter["_id"]] = counters.get(op._filter["_id"], 0) + 1
+        generations_db.cache_generations.bulk_write = AsyncMock(side_effect=bulk_write)
+        yield counters
+
+class TestMembershipCache:
+    """Test (league_id, user_id) -> role lookups"""
+
+    @pytest.mark.asyncio
+    async def test_league_loads_once_and_each_check_keeps_its_collection(self, generations):
+        cache = MembershipCache()
+
+        with patch('membership_cache.db') as mock_db:
+            mock_membership_reads(
+                mock_db,
+                league_memberships=[{"user_id": "owner", "role": "commissioner", "status": "active"}],
+                memberships=[
+                    {"user_id": "owner", "role": "commissioner", "status": "accepted"},
+                    {"user_id": "joiner", "role": "manager", "status": "accepted"}
+                ]
+            )
+
+            assert await cache.get_role("league_1", "owner") == "commissioner"
+            # Only league_memberships grants league access, as before the cache
+            assert await cache.get_role("league_1", "joiner") is None
+            assert await cache.is_commissioner("league_1", "owner") == True
+            assert await cache.is_commissioner("league_1", "joiner") == False
+            mock_db.league_memberships.find.assert_called_once()
+            mock_db.memberships.find.assert_called_once()
+
+            await cache.invalidate_league("league_1")
+            await cache.get_role("league_1", "owner")
+            assert mock_db.memberships.find.call_count == 2
+
+    @pytest.mark.asyncio
+    async def test_invalidation_in_another_process_reloads_the_league(self, generations):
+        cache = MembershipCache()
+        other_process = MembershipCache()
+
+        with patch('membership_cache.db') as mock_db:
+            mock_membership_reads(
+                mock_db,
+                league_memberships=[{"user_id": "kicked", "role": "manager", "status": "active"}],
+                memberships=[]
+            )
+            assert await cache.get_role("league_1", "kicked") == "manager"
+
+            mock_db.league_memberships.find.return_value.to_list = AsyncMock(return_value=[])
+            await other_process.invalidate_league("league_1")
+
+            assert await cache.get_role("league_1", "kicked") is None
+
+    @pytest.mark.asyncio
+    async def test_load_racing_an_invalidation_is_not_kept(self, generations):
+        cache = MembershipCache()
+
+        with patch('membership_cache.db') as mock_db:
+            mock_membership_reads(mock_db, league_memberships=[], memberships=[])
+            async def read_then_invalidated(length=None):
+                # The member is removed while this load is in flight
+                await cache.invalidate_league("league_1")
+                return [{"user_id": "kicked", "role": "manager", "status": "active"}]
+            mock_db.league_memberships.find.return_value.to_list = AsyncMock(side_effect=read_then_invalidated)
+
+            assert await cache.get_role("league_1", "kicked") == "manager"  # Read before the invalidation
+
+            mock_db.league_memberships.find.return_value.to_list = AsyncMock(return_value=[])
+            assert await cache.get_role("league_1", "kicked") is None
+            assert mock_db.league_memberships.find.call_count == 2
+
+    @pytest.mark.asyncio
+    async def test_access_checks_share_the_cache(self, generations):
+        from auth import check_league_access
+        from admin_service import AdminService
+
+        with patch('membership_cache.db') as mock_db:
+            mock_membership_reads(
+                mock_db,
+                league_memberships=[
+                    {"user_id": "owner", "role": "commissioner", "status": "active"},
+                    {"user_id": "manager", "role": "manager", "status": "active"}
+                ],
+                memberships=[{"user_id": "owner", "role": "commissioner", "status": "accepted"}]
+            )
+
+            assert await check_league_access("owner", "league_1") == "commissioner"
+            assert await check_league_access("manager", "league_1") == "manager"
+            assert await AdminService.validate_commissioner_access("owner", "league_1") == True
+            assert await AdminService.validate_commissioner_access("manager", "league_1") == False
+            mock_db.memberships.find.assert_called_once()
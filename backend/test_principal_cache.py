@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+Unit Tests for Cached Token Resolution
+Tests that access tokens resolve to users without a lookup per request
+"""
+
+import pytest
+from datetime import datetime, timezone, timedelta
+from unittest.mock import AsyncMock, patch
+import sys
+from pathlib import Path
+
+# Add backend to path
+backend_path = Path(__file__).parent
+sys.path.append(str(backend_path))
+
+import auth
+from auth import PrincipalCache, create_access_token, invalidate_principal, resolve_principal
+from models import UserResponse
+
+def user_doc(user_id, display_name="Alice", verified=True):
+    return {
+        "_id": user_id,
+        "email": f"{user_id}@example.com",
+        "display_name": display_name,
+        "verified": verified,
+        "created_at": datetime.now(timezone.utc)
+    }
+
+@pytest.fixture(autouse=True)
+def reset_principal_cache():
+    auth.principal_cache.clear()
+    yield
+    auth.principal_cache.clear()
+
+class TestPrincipalCache:
+    """Test token -> user resolution caching"""
+
+    @pytest.mark.asyncio
+    async def test_token_resolves_once_until_invalidated(self):
+        token = create_access_token({"sub": "user_a"})
+
+        with patch('auth.db') as mock_db:
+            mock_db.users.find_one = AsyncMock(return_value=user_doc("user_a", verified=False))
+
+            first = await resolve_principal(token)
+            second = await resolve_principal(token)
+            assert first is second
+            mock_db.users.find_one.assert_called_once()
+
+            # Verification changed: the next request sees the new state
+            mock_db.users.find_one = AsyncMock(return_value=user_doc("user_a", verified=True))
+            invalidate_principal("user_a")
+            assert (await resolve_principal(token)).verified == True
+
+    @pytest.mark.asyncio
+    async def test_invalid_tokens_are_rejected_and_not_cached(self):
+        expired = create_access_token({"sub": "user_a"}, expires_delta=timedelta(seconds=-1))
+
+        with patch('auth.db') as mock_db:
+            mock_db.users.find_one = AsyncMock(return_value=None)
+
+            assert await resolve_principal("not-a-token") is None
+            assert await resolve_principal(expired) is None
+            assert await resolve_principal(create_access_token({"sub": "ghost"})) is None
+            assert auth.principal_cache._entries == {}
+
+    def test_cache_is_bounded_lru(self):
+        cache = PrincipalCache(max_size=2, ttl_seconds=60)
+        users = {i: UserResponse(**{**user_doc(f"user_{i}"), "id": f"user_{i}"}) for i in range(3)}
+
+        cache.put("token_0", users[0])
+        cache.put("token_1", users[1])
+        cache.get("token_0")  # token_1 is now least recently used
+        cache.put("token_2", users[2])
+
+        assert cache.get("token_1") is None
+        assert cache.get("token_0") is users[0]
+        assert "user_1" not in cache._tokens_by_user
+
+        # Entries never outlive the token's own expiry
+        cache.put("token_3", users[1], token_exp=0)
+        assert cache.get("token_3") is None
@@ -0,0 +1,165 @@
+#!/usr/bin/env python3
+"""
+Unit Tests for the Scoring Worker
+Tests ingest-driven wakeups, burst draining and league leases
+"""
+
+import pytest
+import asyncio
+from unittest.mock import AsyncMock, MagicMock, patch
+import sys
+from pathlib import Path
+
+# Add backend to path
+backend_path = Path(__file__).parent
+sys.path.append(str(backend_path))
+
+from scoring_service import ScoringWorker
+
+def summary(processed, found):
+    return {"success": True, "processed_count": processed, "total_found": found, "errors": []}
+
+def make_leases(pending, lease_seconds=30):
+    leases = MagicMock()
+    leases.lease_seconds = lease_seconds
+    leases.pending_leagues = AsyncMock(return_value=pending)
+    leases.claim = AsyncMock(return_value=True)
+    leases.release = AsyncMock()
+    return leases
+
+class TestScoringWorker:
+    """Test the event-driven scoring loop"""
+
+    @pytest.mark.asyncio
+    async def test_notify_wakes_worker_before_poll_interval(self):
+        worker = ScoringWorker(interval_seconds=60, leases=make_leases(["league_1"]))
+        process = AsyncMock(return_value=summary(0, 0))
+
+        with patch('scoring_service.ScoringService.process_pending_results', process), \
+             patch('scoring_service.db') as mock_db:
+            mock_db.result_ingest.watch = MagicMock(side_effect=Exception("not a replica set"))
+
+            task = asyncio.create_task(worker.start_continuous_processing())
+            await asyncio.sleep(0.05)
+            assert process.call_count == 1
+
+            worker.notify()
+            worker.notify()  # Coalesced with the first
+            await asyncio.sleep(0.05)
+            assert process.call_count == 2
+
+            worker.stop()
+            await asyncio.wait_for(task, timeout=1)
+
+    @pytest.mark.asyncio
+    async def test_burst_drains_full_windows_without_waiting(self):
+        worker = ScoringWorker(interval_seconds=60, batch_size=10, leases=make_leases(["league_1"]))
+        process = AsyncMock(side_effect=[summary(10, 10), summary(10, 10), summary(3, 3)] + [summary(0, 0)] * 5)
+
+        with patch('scoring_service.ScoringService.process_pending_results', process), \
+             patch('scoring_service.db') as mock_db:
+            mock_db.result_ingest.watch = MagicMock(side_effect=Exception("not a replica set"))
+
+            task = asyncio.create_task(worker.start_continuous_processing())
+            await asyncio.sleep(0.05)
+
+            assert process.call_count == 3
+            assert all(c.kwargs["limit"] == 10 for c in process.call_args_list)
+
+            worker.stop()
+            await asyncio.wait_for(task, timeout=1)
+
+class TestScoringLeases:
+    """Test league-partitioned settlement across workers"""
+
+    @pytest.mark.asyncio
+    async def test_lease_is_renewed_while_a_slow_window_settles(self):
+        leases = make_leases(["league_1"], lease_seconds=0.03)
+        worker = ScoringWorker(batch_size=10, leases=leases)
+
+        async def slow_window(**kwargs):
+            await asyncio.sleep(0.05)
+            return summary(10, 10)
+
+        with patch('scoring_service.ScoringService.process_pending_results', AsyncMock(side_effect=slow_window)):
+            await worker._process_pass()
+
+            # The initial claim plus at least one renewal before the window finished
+            assert leases.claim.await_count >= 2
+            leases.release.assert_awaited_once_with("league_1")
+            renewals = leases.claim.await_count
+            await asyncio.sleep(0.03)
+            assert leases.claim.await_count == renewals  # Renewal stops with the window
+
+    @pytest.mark.asyncio
+    async def test_rescore_job_holds_the_lease_and_records_failure(self):
+        from rescoring_service import RescoringService
+
+        with patch('scoring_leases.db') as lease_db, \
+             patch('rescoring_service.db') as rescore_db, \
+             patch('rescoring_service.RescoringService.rescore', AsyncMock(side_effect=Exception("boom"))):
+            lease_db.scoring_leases.find_one_and_update = AsyncMock(
+                side_effect=lambda q, u, **kw: {"owner": u["$set"]["owner"]}
+            )
+            lease_db.scoring_leases.update_one = AsyncMock()
+            rescore_db.scoring_rules.update_one = AsyncMock()
+
+            assert await RescoringService.rescore_league_job("league_1") is None
+
+            statuses = [c.args[1]["$set"]["rescore"]["status"] for c in rescore_db.scoring_rules.update_one.call_args_list]
+            assert statuses == ["waiting", "running", "failed"]
+            lease_db.scoring_leases.update_one.assert_awaited_once()  # Lease released
+
+    @pytest.mark.asyncio
+    async def test_bulk_rescore_writes_while_holding_every_lease(self):
+        from rescoring_service import RescoringService
+
+        claimed = []
+        async def rescore(league_ids, dry_run=False):
+            # Every league is leased before the run loads or writes anything
+            assert claimed == league_ids
+            return {"leagues": len(league_ids)}
+
+        with patch('scoring_leases.db') as lease_db, \
+             patch('rescoring_service.db') as rescore_db, \
+             patch('rescoring_service.RescoringService.rescore', AsyncMock(side_effect=rescore)):
+            rescore_db.result_ingest.distinct = AsyncMock(return_value=["league_2", "league_1"])
+            lease_db.scoring_leases.find_one_and_update = AsyncMock(
+                side_effect=lambda q, u, **kw: claimed.append(q["_id"]) or {"owner": u["$set"]["owner"]}
+            )
+            lease_db.scoring_leases.update_one = AsyncMock()
+
+            assert await RescoringService.rescore_leased() == {"leagues": 2}
+
+            released = [c.args[0]["_id"] for c in lease_db.scoring_leases.update_one.call_args_list]
+            assert released == ["league_1", "league_2"]
+
+    @pytest.mark.asyncio
+    async def test_claim_fails_while_another_worker_holds_the_lease(self):
+        from pymongo.errors import DuplicateKeyError
+        from scoring_leases import ScoringLeases
+
+        leases = ScoringLeases(worker_id="worker_a")
+
+        with patch('scoring_leases.db') as mock_db:
+            mock_db.scoring_leases.find_one_and_update = AsyncMock(return_value={"_id": "league_1", "owner": "worker_a"})
+            assert await leases.claim("league_1") == True
+            query = mock_db.scoring_leases.find_one_and_update.call_args.args[0]
+            assert {"owner": "worker_a"} in query["$or"]
+
+            mock_db.scoring_leases.find_one_and_update = AsyncMock(side_effect=DuplicateKeyError("E11000"))
+            assert await leases.claim("league_1") == False
+
+    @pytest.mark.asyncio
+    async def test_worker_only_settles_claimed_leagues(self):
+        leases = make_leases(["league_1", "league_2"])
+        leases.claim = AsyncMock(side_effect=lambda league_id: league_id == "league_2")
+        worker = ScoringWorker(batch_size=10, leases=leases)
+        process = AsyncMock(return_value=summary(4, 4))
+
+        with patch('scoring_service.ScoringService.process_pending_results', process):
+            result = await worker._process_pass()
+
+            assert result["processed_count"] == 4
+            process.assert_called_once_with(limit=10, league_id="league_2")
+            leases.release.assert_called_once_with("league_2")
@@ -16,6 +16,24 @@ backend_path = Path(__file__).parent
 sys.path.append(str(backend_path))
 
 from admin_service import AdminService
+import budget_ledger
+
+def mock_ledger_db(mock_db, league, clubs_owned, user_id="user123", budget_remaining=100):
+    """Mock the reads the budget ledger makes when loading a league"""
+    mock_db.leagues.find_one = AsyncMock(return_value=league)
+    mock_db.rosters.find.return_value.to_list = AsyncMock(return_value=[
+        {"user_id": user_id, "budget_remaining": budget_remaining}
+    ])
+    mock_db.roster_clubs.aggregate.return_value.to_list = AsyncMock(return_value=[
+        {"_id": user_id, "clubs_owned": clubs_owned}
+    ] if clubs_owned else [])
+
+@pytest.fixture(autouse=True)
+def fresh_budget_ledger():
+    """Each test loads the ledger from its own mocked database"""
+    budget_ledger.budget_ledger = None
+    yield
+    budget_ledger.budget_ledger = None
 
 class TestLeagueSizeEnforcement:
     """Test league size validation for auction starting"""
@@ -117,20 +135,19 @@ class TestRosterCapacityEnforcement:
             }
         }
         
-        with patch('admin_service.db') as mock_db:
-            mock_db.leagues.find_one = AsyncMock(return_value=mock_league)
+        with patch('budget_ledger.db') as mock_db:
             # Mock user currently owns 3 clubs (2 slots available)
-            mock_db.roster_clubs.count_documents = AsyncMock(return_value=3)
+            mock_ledger_db(mock_db, mock_league, clubs_owned=3)
             
             # Test roster capacity validation
             valid, error = await AdminService.validate_roster_capacity("user123", "test_league")
             
             assert valid == True
             assert error == ""
-            mock_db.roster_clubs.count_documents.assert_called_once_with({
-                "user_id": "user123",
-                "league_id": "test_league"
-            })
+            mock_db.roster_clubs.aggregate.assert_called_once_with([
+                {"$match": {"league_id": "test_league"}},
+                {"$group": {"_id": "$user_id", "clubs_owned": {"$sum": 1}}}
+            ])
     
     @pytest.mark.asyncio 
     async def test_bid_fails_roster_full(self):
@@ -144,10 +161,9 @@ class TestRosterCapacityEnforcement:
             }
         }
         
-        with patch('admin_service.db') as mock_db:
-            mock_db.leagues.find_one = AsyncMock(return_value=mock_league)
+        with patch('budget_ledger.db') as mock_db:
             # Mock user already owns 3 clubs (full roster)
-            mock_db.roster_clubs.count_documents = AsyncMock(return_value=3)
+            mock_ledger_db(mock_db, mock_league, clubs_owned=3)
             
             # Test roster capacity validation
             valid, error = await AdminService.validate_roster_capacity("user123", "test_league")
@@ -167,10 +183,9 @@ class TestRosterCapacityEnforcement:
             }
         }
         
-        with patch('admin_service.db') as mock_db:
-            mock_db.leagues.find_one = AsyncMock(return_value=mock_league)
+        with patch('budget_ledger.db') as mock_db:
             # Mock user owns exactly 5 clubs (at capacity)
-            mock_db.roster_clubs.count_documents = AsyncMock(return_value=5)
+            mock_ledger_db(mock_db, mock_league, clubs_owned=5)
             
             # Test roster capacity validation
             valid, error = await AdminService.validate_roster_capacity("user123", "test_league")
@@ -190,10 +205,9 @@ class TestRosterCapacityEnforcement:
             }
         }
         
-        with patch('admin_service.db') as mock_db:
-            mock_db.leagues.find_one = AsyncMock(return_value=mock_league)
+        with patch('budget_ledger.db') as mock_db:
             # Mock user owns 0 clubs
-            mock_db.roster_clubs.count_documents = AsyncMock(return_value=0)
+            mock_ledger_db(mock_db, mock_league, clubs_owned=0)
             
             # Test roster capacity validation
             valid, error = await AdminService.validate_roster_capacity("user123", "test_league")
@@ -205,7 +219,7 @@ class TestRosterCapacityEnforcement:
     async def test_bid_league_not_found(self):
         """Test bidding fails when league doesn't exist"""
         
-        with patch('admin_service.db') as mock_db:
+        with patch('budget_ledger.db') as mock_db:
             mock_db.leagues.find_one = AsyncMock(return_value=None)
             
             # Test roster capacity validation
@@ -253,9 +267,8 @@ class TestStructuredErrorMessages:
             }
         }
         
-        with patch('admin_service.db') as mock_db:
-            mock_db.leagues.find_one = AsyncMock(return_value=mock_league)
-            mock_db.roster_clubs.count_documents = AsyncMock(return_value=3)
+        with patch('budget_ledger.db') as mock_db:
+            mock_ledger_db(mock_db, mock_league, clubs_owned=3)
             
             valid, error = await AdminService.validate_roster_capacity("user123", "test_league")
             
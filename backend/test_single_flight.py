@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+Unit Tests for Single-Flight Request Coalescing
+Tests sharing of in-flight reads and that nothing outlives the call
+"""
+
+import pytest
+import asyncio
+from unittest.mock import AsyncMock, patch
+import sys
+from pathlib import Path
+
+# Add backend to path
+backend_path = Path(__file__).parent
+sys.path.append(str(backend_path))
+
+from utils.single_flight import single_flight
+from league_service import LeagueService
+
+class TestSingleFlight:
+    """Test coalescing of identical concurrent calls"""
+
+    @pytest.mark.asyncio
+    async def test_identical_calls_share_one_execution(self):
+        gate = asyncio.Event()
+        calls = []
+
+        @single_flight
+        async def read(league_id, season="2025-26"):
+            calls.append((league_id, season))
+            await gate.wait()
+            return {"league_id": league_id, "season": season}
+
+        waiters = [asyncio.create_task(read("league_1")) for _ in range(8)]
+        other = asyncio.create_task(read("league_2"))
+        await asyncio.sleep(0)
+        gate.set()
+
+        results = await asyncio.gather(*waiters)
+        assert calls == [("league_1", "2025-26"), ("league_2", "2025-26")]
+        assert all(r is results[0] for r in results)
+        assert (await other)["league_id"] == "league_2"
+
+        # Finished calls are not cached
+        await read("league_1")
+        assert len(calls) == 3
+        assert read.flights.calls == {}
+
+    @pytest.mark.asyncio
+    async def test_errors_reach_every_waiter_and_cancellation_does_not_spread(self):
+        gate = asyncio.Event()
+
+        @single_flight
+        async def failing():
+            await gate.wait()
+            raise ValueError("boom")
+
+        cancelled = asyncio.create_task(failing())
+        waiter = asyncio.create_task(failing())
+        await asyncio.sleep(0)
+        cancelled.cancel()
+        gate.set()
+
+        with pytest.raises(ValueError):
+            await waiter
+
+    @pytest.mark.asyncio
+    async def test_league_status_reads_league_once(self):
+        league = {
+            "_id": "league_1", "status": "setup", "member_count": 4,
+            "settings": {"league_size": {"min": 4, "max": 8}}
+        }
+        with patch('league_service.db') as mock_db:
+            mock_db.leagues.find_one = AsyncMock(return_value=league)
+            mock_db.leagues.update_one = AsyncMock()
+
+            statuses = await asyncio.gather(*(LeagueService.get_league_status("league_1") for _ in range(5)))
+
+            assert statuses[0]["status"] == "ready" and statuses[0]["can_start_auction"]
+            mock_db.leagues.find_one.assert_awaited_once()
@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+Unit Tests for the Auction Snapshot Cache
+Tests that reconnect snapshots are built once and served with a per-user overlay
+"""
+
+import pytest
+import asyncio
+from unittest.mock import AsyncMock, MagicMock, patch
+import sys
+from pathlib import Path
+
+# Add backend to path
+backend_path = Path(__file__).parent
+sys.path.append(str(backend_path))
+
+from snapshot_service import SnapshotCache
+
+AUCTION = {
+    "_id": "auction_1",
+    "league_id": "league_1",
+    "status": "live",
+    "min_increment": 1,
+    "bid_timer_seconds": 60,
+    "anti_snipe_seconds": 30,
+    "budget_per_manager": 100
+}
+
+def mock_snapshot_reads(mock_db, user_count):
+    mock_db.auctions.find_one = AsyncMock(return_value=AUCTION)
+    mock_db.rosters.find.return_value.to_list = AsyncMock(return_value=[
+        {"user_id": f"user_{i}", "budget_remaining": 100 - i, "clubs": ["club"] * (i % 2), "club_slots": 3}
+        for i in range(user_count)
+    ])
+    mock_db.users.find.return_value.to_list = AsyncMock(return_value=[
+        {"_id": f"user_{i}", "display_name": f"User {i}"} for i in range(user_count)
+    ])
+
+class TestSnapshotCache:
+    """Test the versioned per-auction snapshot"""
+
+    @pytest.mark.asyncio
+    async def test_reconnect_storm_builds_once(self):
+        cache = SnapshotCache()
+
+        with patch('snapshot_service.db') as mock_db:
+            mock_snapshot_reads(mock_db, user_count=8)
+
+            snapshots = await asyncio.gather(*[cache.get("auction_1") for _ in range(20)])
+
+            assert all(s is snapshots[0] for s in snapshots)
+            assert len(snapshots[0].participants) == 8
+            assert snapshots[0].rosters["user_1"] == {"budget_remaining": 99, "slots_used": 1, "max_slots": 3}
+
+            # Participants are read with one $in query, not one query per manager
+            mock_db.auctions.find_one.assert_called_once()
+            mock_db.users.find.assert_called_once()
+            assert mock_db.users.find.call_args.args[0]["_id"]["$in"] == [f"user_{i}" for i in range(8)]
+
+    @pytest.mark.asyncio
+    async def test_invalidate_bumps_version(self):
+        cache = SnapshotCache()
+
+        with patch('snapshot_service.db') as mock_db:
+            mock_snapshot_reads(mock_db, user_count=2)
+
+            first = await cache.get("auction_1")
+            cache.invalidate_league("league_1")
+            second = await cache.get("auction_1")
+
+            assert (first.version, second.version) == (1, 2)
+            assert mock_db.auctions.find_one.call_count == 2
+
+    @pytest.mark.asyncio
+    async def test_socket_snapshot_overlays_user_and_live_lot(self):
+        import snapshot_service
+        from socket_handler import StateSnapshot
+        from lot_state import LiveLotState
+
+        snapshot_service.snapshot_cache = None
+        engine = MagicMock()
+        engine.lot_states = {"auction_1": LiveLotState(
+            lot_id="lot_1", auction_id="auction_1", club_id="club_1",
+            order_index=0, timer_ends_at=None, current_bid=12, leading_bidder_id="user_0"
+        )}
+        try:
+            with patch('snapshot_service.db') as mock_db, \
+                 patch('socket_handler.get_auction_engine', return_value=engine):
+                mock_snapshot_reads(mock_db, user_count=3)
+
+                snapshot = await StateSnapshot.get_auction_snapshot("auction_1", "user_2")
+                again = await StateSnapshot.get_auction_snapshot("auction_1", "user_1")
+
+                assert snapshot["user_state"]["budget_remaining"] == 98
+                assert again["user_state"]["budget_remaining"] == 99
+                assert snapshot["current_lot"]["current_bid"] == 12
+                assert snapshot["state_version"] == again["state_version"] == 1
+                assert await StateSnapshot.validate_snapshot_integrity(snapshot)
+                mock_db.auctions.find_one.assert_called_once()
+        finally:
+            snapshot_service.snapshot_cache = None
@@ -0,0 +1,289 @@
+#!/usr/bin/env python3
+"""
+Unit Tests for Materialized League Standings
+Tests incremental standings updates, batch settlement, single-fetch reads
+and vectorized re-scoring
+"""
+
+import pytest
+import pandas as pd
+from datetime import datetime, timezone
+from unittest.mock import AsyncMock, MagicMock, patch
+import sys
+from pathlib import Path
+
+# Add backend to path
+backend_path = Path(__file__).parent
+sys.path.append(str(backend_path))
+
+from scoring_service import ScoringService
+from aggregation_service import AggregationService, get_leaderboard_cache
+from rescoring_service import RescoringService
+from matchday_calendar import get_matchday_calendars
+
+@pytest.fixture(autouse=True)
+def empty_fixture_calendar():
+    """Matchday calendars fall back to the competition profile windows; generations start at 0"""
+    with patch('matchday_calendar.db') as calendar_db, patch('cache_generations.db') as generations_db:
+        calendar_db.competition_profiles.find_one = AsyncMock(return_value=None)
+        calendar_db.fixtures.aggregate.return_value.to_list = AsyncMock(return_value=[])
+        calendar_db.leagues.find.return_value.to_list = AsyncMock(return_value=[])
+        calendar_db.leagues.distinct = AsyncMock(return_value=[])
+        calendar_db.matchday_calendars.find.return_value.to_list = AsyncMock(return_value=[])
+        calendar_db.matchday_calendars.insert_one = AsyncMock()
+        generations_db.cache_generations.find_one = AsyncMock(return_value=None)
+        generations_db.cache_generations.bulk_write = AsyncMock()
+        yield
+    get_matchday_calendars().invalidate()
+    get_leaderboard_cache().invalidate()
+
+RESULT = {
+    "_id": "result_1",
+    "league_id": "league_1",
+    "match_id": "match_1",
+    "home_ext": "home",
+    "away_ext": "away",
+    "home_goals": 2,
+    "away_goals": 1,
+    "kicked_off_at": datetime(2024, 9, 20, tzinfo=timezone.utc)
+}
+
+class TestStandingsMaintenance:
+    """Test standings increments written during settlement"""
+
+    @pytest.mark.asyncio
+    async def test_settlement_increments_owner_standings(self):
+        with patch('scoring_service.db') as mock_db:
+            mock_db.materialized_leagues.find.return_value.to_list = AsyncMock(return_value=[{"_id": "league_1"}])
+            mock_db.clubs.find_one = AsyncMock(side_effect=lambda q: {"_id": f"club_{q['ext_ref']}"})
+            mock_db.roster_clubs.find = MagicMock(side_effect=lambda q: MagicMock(
+                to_list=AsyncMock(return_value=[{"user_id": "user_home" if q["club_id"] == "club_home" else "user_away"}])
+            ))
+            mock_db.scoring_rules.find.return_value.to_list = AsyncMock(return_value=[])
+            mock_db.weekly_points.update_one = AsyncMock()
+            mock_db.league_standings.bulk_write = AsyncMock()
+            mock_db.league_matchday_summaries.bulk_write = AsyncMock()
+            mock_db.manager_series.bulk_write = AsyncMock()
+            mock_db.result_ingest.update_one = AsyncMock()
+
+            assert await ScoringService._complete_processing(RESULT) == True
+
+            operations = mock_db.league_standings.bulk_write.call_args.args[0]
+            updates = {op._filter["user_id"]: op._doc for op in operations}
+            assert updates["user_home"]["$inc"] == {"total_points": 5, "matches_played": 1}
+            assert updates["user_away"]["$inc"] == {"total_points": 1, "matches_played": 1}
+            assert "$push" not in updates["user_home"]
+
+            matchday = ScoringService.calculate_matchday_bucket(RESULT["kicked_off_at"], None)["value"]
+            summary_ops = mock_db.league_matchday_summaries.bulk_write.call_args.args[0]
+            assert {op._filter["_id"] for op in summary_ops} == {f"league_1:{matchday}"}
+            assert summary_ops[0]._doc["$inc"]["managers.user_home.points"] == 5
+
+            series_ops = mock_db.manager_series.bulk_write.call_args.args[0]
+            series = {op._filter["_id"]: op._doc["$inc"] for op in series_ops}
+            assert series["league_1:user_away"] == {f"matchdays.{matchday}.points": 1, f"matchdays.{matchday}.matches": 1}
+
+    @pytest.mark.asyncio
+    async def test_unmaterialized_league_only_records_weekly_points(self):
+        with patch('scoring_service.db') as mock_db:
+            mock_db.materialized_leagues.find.return_value.to_list = AsyncMock(return_value=[])
+            mock_db.clubs.find_one = AsyncMock(side_effect=lambda q: {"_id": f"club_{q['ext_ref']}"})
+            mock_db.roster_clubs.find = MagicMock(side_effect=lambda q: MagicMock(
+                to_list=AsyncMock(return_value=[{"user_id": "user_home" if q["club_id"] == "club_home" else "user_away"}])
+            ))
+            mock_db.scoring_rules.find.return_value.to_list = AsyncMock(return_value=[])
+            mock_db.weekly_points.update_one = AsyncMock()
+            mock_db.league_standings.bulk_write = AsyncMock()
+            mock_db.result_ingest.update_one = AsyncMock()
+
+            assert await ScoringService._complete_processing(RESULT) == True
+
+            # Left to the rebuild on first read, which includes these points
+            assert mock_db.weekly_points.update_one.await_count == 2
+            mock_db.league_standings.bulk_write.assert_not_called()
+
+class TestStandingsReads:
+    """Test leaderboard reads from the materialized standings"""
+
+    @pytest.mark.asyncio
+    async def test_leaderboard_reads_standings_without_scanning_points(self):
+        rows = [
+            {"league_id": "league_1", "user_id": "user_a", "total_points": 9, "matches_played": 2},
+            {"league_id": "league_1", "user_id": "user_b", "total_points": 1, "matches_played": 1}
+        ]
+        summaries = [
+            {"league_id": "league_1", "matchday": 2, "total_points": 4, "total_matches": 1,
+             "managers": {"user_a": {"points": 4, "matches": 1}}},
+            {"league_id": "league_1", "matchday": 1, "total_points": 6, "total_matches": 2,
+             "managers": {"user_a": {"points": 5, "matches": 1}, "user_b": {"points": 1, "matches": 1}}}
+        ]
+
+        with patch('scoring_service.db') as mock_db:
+            mock_db.materialized_leagues.find.return_value.to_list = AsyncMock(return_value=[{"_id": "league_1"}])
+            mock_db.league_standings.find.return_value.sort.return_value.to_list = AsyncMock(return_value=rows)
+            mock_db.users.find.return_value.to_list = AsyncMock(return_value=[
+                {"_id": "user_a", "display_name": "A", "email": "a@example.com"},
+                {"_id": "user_b", "display_name": "B", "email": "b@example.com"}
+            ])
+            mock_db.rosters.find.return_value.to_list = AsyncMock(return_value=[
+                {"user_id": "user_a", "budget_remaining": 10, "budget_start": 100},
+                {"user_id": "user_b", "budget_remaining": 40, "budget_start": 100}
+            ])
+            mock_db.league_matchday_summaries.find.return_value.sort.return_value.limit.return_value.to_list = AsyncMock(
+                return_value=summaries
+            )
+
+            leaderboard = await AggregationService.get_league_leaderboard("league_1")
+
+            assert [(r["user_id"], r["position"], r["total_points"]) for r in leaderboard["leaderboard"]] == [
+                ("user_a", 1, 9), ("user_b", 2, 1)
+            ]
+            assert leaderboard["weekly_breakdown"]["matchday_1"]["total_points"] == 6
+            assert leaderboard["weekly_breakdown"]["matchday_1"]["top_performers"][0]["user_id"] == "user_a"
+            assert leaderboard["weekly_breakdown"]["matchday_2"]["total_matches"] == 1
+            assert (leaderboard["matchdays_total"], leaderboard["matchdays_cursor"]) == (2, None)
+            mock_db.weekly_points.aggregate.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_matchday_history_pages_with_a_cursor(self):
+        older = [
+            {"league_id": "league_1", "matchday": md, "total_points": md, "total_matches": 1, "managers": {}}
+            for md in (7, 6, 5)
+        ]
+
+        with patch('scoring_service.db') as mock_db:
+            mock_db.materialized_leagues.find.return_value.to_list = AsyncMock(return_value=[{"_id": "league_1"}])
+            find = mock_db.league_matchday_summaries.find
+            find.return_value.sort.return_value.limit.return_value.to_list = AsyncMock(return_value=older)
+
+            page = await AggregationService.get_league_matchday_history("league_1", 8, 2)
+
+            assert find.call_args.args[0] == {"league_id": "league_1", "matchday": {"$lt": 8}}
+            find.return_value.sort.return_value.limit.assert_called_once_with(3)
+            assert list(page["weekly_breakdown"]) == ["matchday_6", "matchday_7"]
+            assert page["next_cursor"] == 6
+
+    @pytest.mark.asyncio
+    async def test_unmaterialized_league_is_rebuilt_under_its_lease(self):
+        # Rows $inc'd before the league was ever rebuilt are replaced, not trusted
+        rebuilt = [{"league_id": "league_1", "user_id": "user_a", "total_points": 9, "matches_played": 2}]
+
+        with patch('scoring_service.db') as mock_db, patch('scoring_leases.db') as lease_db:
+            mock_db.materialized_leagues.find.return_value.to_list = AsyncMock(return_value=[])
+            mock_db.materialized_leagues.bulk_write = AsyncMock()
+            lease_db.scoring_leases.find_one_and_update = AsyncMock(
+                side_effect=lambda query, update, **kwargs: {"owner": update["$set"]["owner"]}
+            )
+            lease_db.scoring_leases.update_one = AsyncMock()
+            # Standings totals, then the (empty) matchday and series groupings
+            mock_db.weekly_points.aggregate.return_value.to_list = AsyncMock(side_effect=[
+                [{"_id": "user_a", "total_points": 9, "matches_played": 2}], [], []
+            ])
+            mock_db.league_standings.delete_many = AsyncMock()
+            mock_db.league_standings.insert_many = AsyncMock()
+            mock_db.league_matchday_summaries.delete_many = AsyncMock()
+            mock_db.league_matchday_summaries.insert_many = AsyncMock()
+            mock_db.manager_series.delete_many = AsyncMock()
+            mock_db.manager_series.insert_many = AsyncMock()
+            mock_db.league_standings.find.return_value.sort.return_value.to_list = AsyncMock(return_value=rebuilt)
+            mock_db.users.find.return_value.to_list = AsyncMock(return_value=[
+                {"_id": "user_a", "display_name": "A", "email": "a@example.com"}
+            ])
+            mock_db.rosters.find.return_value.to_list = AsyncMock(return_value=[
+                {"user_id": "user_a", "budget_remaining": 10, "budget_start": 100}
+            ])
+
+            rows = await ScoringService.load_league_standings("league_1")
+
+            assert rows[0]["total_points"] == 9
+            mock_db.league_standings.delete_many.assert_awaited_once_with({"league_id": "league_1"})
+            marked = mock_db.materialized_leagues.bulk_write.call_args.args[0]
+            assert [op._filter["_id"] for op in marked] == ["league_1"]
+            lease_db.scoring_leases.update_one.assert_awaited_once()  # Lease released
+
+    @pytest.mark.asyncio
+    async def test_rebuild_waits_while_a_worker_holds_the_lease(self):
+        with patch('scoring_service.db') as mock_db, patch('scoring_leases.db') as lease_db:
+            mock_db.materialized_leagues.find.return_value.to_list = AsyncMock(return_value=[])
+            lease_db.scoring_leases.find_one_and_update = AsyncMock(return_value={"owner": "worker_1"})
+            mock_db.league_standings.delete_many = AsyncMock()
+
+            assert await ScoringService.ensure_materialized("league_1") == False
+            mock_db.league_standings.delete_many.assert_not_called()
+
+class TestBatchSettlement:
+    """Test settling a window of results in bulk"""
+
+    @pytest.mark.asyncio
+    async def test_window_settles_in_bulk_and_skips_settled_matches(self):
+        results = [
+            {**RESULT, "_id": f"result_{i}", "match_id": f"match_{i}"} for i in range(3)
+        ]
+
+        with patch('scoring_service.db') as mock_db:
+            mock_db.materialized_leagues.find.return_value.to_list = AsyncMock(return_value=[{"_id": "league_1"}])
+            mock_db.client.start_session = AsyncMock(side_effect=Exception("Transaction numbers are only allowed on a replica set member"))
+            mock_db.settlements.find.return_value.to_list = AsyncMock(return_value=[
+                {"league_id": "league_1", "match_id": "match_0"}
+            ])
+            mock_db.settlements.insert_many = AsyncMock()
+            mock_db.clubs.find.return_value.to_list = AsyncMock(return_value=[
+                {"_id": "club_home", "ext_ref": "home"}, {"_id": "club_away", "ext_ref": "away"}
+            ])
+            mock_db.roster_clubs.find.return_value.to_list = AsyncMock(return_value=[
+                {"league_id": "league_1", "club_id": "club_home", "user_id": "user_home"},
+                {"league_id": "league_1", "club_id": "club_away", "user_id": "user_away"}
+            ])
+            mock_db.scoring_rules.find.return_value.to_list = AsyncMock(return_value=[])
+            mock_db.weekly_points.bulk_write = AsyncMock()
+            mock_db.league_standings.bulk_write = AsyncMock()
+            mock_db.league_matchday_summaries.bulk_write = AsyncMock()
+            mock_db.manager_series.bulk_write = AsyncMock()
+            mock_db.result_ingest.update_many = AsyncMock()
+
+            summary = await ScoringService._process_batch(results)
+
+            assert summary["processed_count"] == 3
+            assert len(mock_db.settlements.insert_many.call_args.args[0]) == 2
+            mock_db.clubs.find.assert_called_once()
+            mock_db.roster_clubs.find.assert_called_once()
+
+            points_ops = mock_db.weekly_points.bulk_write.call_args.args[0]
+            assert len(points_ops) == 4  # two matches x two owners
+            assert {op._filter["match_id"] for op in points_ops} == {"match_1", "match_2"}
+            standings_ops = mock_db.league_standings.bulk_write.call_args.args[0]
+            assert sum(op._doc["$inc"]["total_points"] for op in standings_ops) == 2 * (5 + 1)
+            summary_ops = mock_db.league_matchday_summaries.bulk_write.call_args.args[0]
+            assert sum(op._doc["$inc"]["total_matches"] for op in summary_ops) == 4
+            series_ops = mock_db.manager_series.bulk_write.call_args.args[0]
+            assert len(series_ops) == 4
+
+            marked = mock_db.result_ingest.update_many.call_args.args[0]["_id"]["$in"]
+            assert marked == ["result_0", "result_1", "result_2"]
+
+class TestRescoring:
+    """Test vectorized re-scoring under per-league rules"""
+
+    def test_score_frames_applies_each_leagues_rules(self):
+        results = pd.DataFrame([
+            {**RESULT, "league_id": "league_1"},
+            {**RESULT, "_id": "result_2", "league_id": "league_2", "home_goals": 1, "away_goals": 1}
+        ])
+        rules = pd.DataFrame([
+            {"league_id": "league_1", "club_goal": 1, "club_win": 3, "club_draw": 1},
+            {"league_id": "league_2", "club_goal": 2, "club_win": 3, "club_draw": 5}
+        ])
+        owners = pd.DataFrame([
+            {"league_id": "league_1", "club_id": "club_home", "user_id": "user_a"},
+            {"league_id": "league_1", "club_id": "club_away", "user_id": "user_b"},
+            {"league_id": "league_2", "club_id": "club_home", "user_id": "user_c"}
+        ])
+
+        scored = RescoringService.score_frames(
+            results, rules, {"home": "club_home", "away": "club_away"}, owners
+        )
+        points = {(row.league_id, row.user_id): row.points for row in scored.itertuples()}
+
+        # league_1: 2-1 win is 2+3, loss is 1; league_2: 1-1 draw is 2+5, unowned away side dropped
+        assert points == {("league_1", "user_a"): 5, ("league_1", "user_b"): 1, ("league_2", "user_c"): 7}
+        assert set(scored["matchday"]) == {ScoringService.calculate_matchday_bucket(RESULT["kicked_off_at"], "2024-25")["value"]}
@@ -0,0 +1,81 @@
+"""
+Incremental JSON parsing for request bodies
+Yields items from NDJSON or a top-level JSON array as chunks arrive
+"""
+
+import codecs
+import json
+from typing import Any, AsyncIterator, Optional, Tuple
+
+_WHITESPACE = " \t\r\n"
+
+def _parse_line(line: str) -> Tuple[Any, Optional[str]]:
+    try:
+        return json.loads(line), None
+    except json.JSONDecodeError as e:
+        return None, f"Invalid JSON: {e.msg}"
+
+async def iter_json_items(chunks: AsyncIterator[bytes]) -> AsyncIterator[Tuple[Any, Optional[str]]]:
+    """
+    Yield (item, error) for each item in the body, without buffering the whole body
+
+    The format is detected from the first non-whitespace character: `[` means
+    a JSON array, anything else is NDJSON (one value per line). A bad NDJSON
+    line yields an error and parsing continues; a malformed array yields one
+    error and stops, since the remaining items cannot be located.
+    """
+    decoder = json.JSONDecoder()
+    utf8 = codecs.getincrementaldecoder("utf-8")()
+    buffer = ""
+    mode = None
+    closed = False
+
+    async for chunk in chunks:
+        buffer += utf8.decode(chunk)
+        if mode is None:
+            buffer = buffer.lstrip(_WHITESPACE)
+            if not buffer:
+                continue
+            mode = "array" if buffer[0] == "[" else "ndjson"
+            if mode == "array":
+                buffer = buffer[1:]
+
+        if mode == "ndjson":
+            *lines, buffer = buffer.split("\n")
+            for line in lines:
+                if line.strip():
+                    yield _parse_line(line)
+            continue
+
+        # Array: decode every complete item in the buffer, keep the partial tail
+        pos = 0
+        while not closed:
+            while pos < len(buffer) and buffer[pos] in _WHITESPACE + ",":
+                pos += 1
+            if pos == len(buffer):
+                break
+            if buffer[pos] == "]":
+                closed = True
+                break
+            try:
+                item, end = decoder.raw_decode(buffer, pos)
+            except json.JSONDecodeError:
+                break  # Incomplete item, wait for more data
+            if end == len(buffer) and not isinstance(item, (dict, list)):
+                break  # A scalar at the end of a chunk may be truncated
+            yield item, None
+            pos = end
+        buffer = buffer[pos:]
+
+    buffer += utf8.decode(b"", final=True)
+    if mode == "ndjson" and buffer.strip():
+        yield _parse_line(buffer)
+    elif mode == "array" and not closed:
+        tail = buffer.strip(_WHITESPACE + ",")
+        if tail:
+            try:
+                yield json.loads(tail), None
+            except json.JSONDecodeError as e:
+                yield None, f"Invalid JSON array: {e.msg}"
+        else:
+            yield None, "Invalid JSON array: missing closing bracket"
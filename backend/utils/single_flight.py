@@ -0,0 +1,48 @@
+"""
+Single-flight request coalescing
+Concurrent identical async reads share one in-flight call and its result
+"""
+
+import asyncio
+import functools
+from typing import Any, Awaitable, Callable, Dict, Hashable
+
+class SingleFlight:
+    """
+    In-flight calls keyed by the caller's key
+
+    The first caller for a key starts the call; callers arriving while it
+    runs await the same task. Nothing is cached: once the call finishes the
+    key is free again, so the next caller gets fresh data. Waiters are
+    shielded, so one cancelled request does not cancel the call for the rest.
+    """
+
+    def __init__(self):
+        self.calls: Dict[Hashable, asyncio.Task] = {}
+
+    async def do(self, key: Hashable, fn: Callable[..., Awaitable[Any]], *args, **kwargs) -> Any:
+        task = self.calls.get(key)
+        if task is None:
+            task = asyncio.ensure_future(fn(*args, **kwargs))
+            self.calls[key] = task
+            task.add_done_callback(lambda _: self.calls.pop(key, None))
+        return await asyncio.shield(task)
+
+def single_flight(fn: Callable[..., Awaitable[Any]]) -> Callable[..., Awaitable[Any]]:
+    """
+    Coalesce concurrent calls of an async read with the same arguments
+    Callers share the returned object, so it must be treated as read-only
+    """
+    flights = SingleFlight()
+
+    @functools.wraps(fn)
+    async def wrapper(*args, **kwargs):
+        try:
+            key = (args, frozenset(kwargs.items()))
+            hash(key)
+        except TypeError:
+            return await fn(*args, **kwargs)  # Unhashable arguments: no coalescing
+        return await flights.do(key, fn, *args, **kwargs)
+
+    wrapper.flights = flights
+    return wrapper
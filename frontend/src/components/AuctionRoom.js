@@ -80,6 +80,7 @@ const AuctionRoom = ({ user, token }) => {
   const [managers, setManagers] = useState([]);
   const [timeRemaining, setTimeRemaining] = useState(0);
   const [auctionStatus, setAuctionStatus] = useState('waiting');
+  const lotSeqRef = useRef({ lotId: null, seq: 0 });
   
   // League settings for rules display  
   const { settings: leagueSettings, loading: settingsLoading } = useLeagueSettings(auctionState?.league_id);
@@ -88,6 +89,7 @@ const AuctionRoom = ({ user, token }) => {
   const [bidAmount, setBidAmount] = useState(0);
   const [bidding, setBidding] = useState(false);
   const [userBudget, setUserBudget] = useState(0);
+  const [maxBid, setMaxBid] = useState(null); // Reserve-aware ceiling published by the server
   const [userSlots, setUserSlots] = useState(0);
   
   // Chat state
@@ -137,6 +139,18 @@ const AuctionRoom = ({ user, token }) => {
       if (userManager) {
         setUserBudget(userManager.budget_remaining);
         setUserSlots(userManager.club_slots);
+        setMaxBid(userManager.max_bid ?? null);
+      }
+    });
+
+    // Budget and max bid after a sale
+    newSocket.on('manager_budget', (data) => {
+      setManagers((prev) => prev.map((m) => m.user_id === data.user_id
+        ? { ...m, budget_remaining: data.budget_remaining, max_bid: data.max_bid }
+        : m));
+      if (data.user_id === user.id) {
+        setUserBudget(data.budget_remaining);
+        setMaxBid(data.max_bid);
       }
     });
 
@@ -174,6 +188,7 @@ const AuctionRoom = ({ user, token }) => {
     newSocket.on('lot_update', (data) => {
       console.log('Lot update:', data);
       setCurrentLot(data.lot);
+      lotSeqRef.current = { lotId: data.lot.id, seq: data.lot.seq || 0 };
       
       // Update bid amount to minimum next bid
       if (data.lot.current_bid > 0) {
@@ -192,6 +207,35 @@ const AuctionRoom = ({ user, token }) => {
       }
     });
 
+    // Compact per-change updates for the live lot
+    newSocket.on('lot_delta', (delta) => {
+      const last = lotSeqRef.current;
+      if (delta.lot_id !== last.lotId || delta.seq <= last.seq) {
+        return; // Stale or for a lot we have no snapshot of yet
+      }
+      if (delta.seq > last.seq + 1) {
+        // Missed a delta; ask for a full snapshot
+        newSocket.emit('resync_lot', { auction_id: auctionId });
+      }
+      lotSeqRef.current = { lotId: delta.lot_id, seq: delta.seq };
+
+      setCurrentLot((lot) => lot && lot.id === delta.lot_id ? {
+        ...lot,
+        status: delta.status,
+        current_bid: delta.current_bid,
+        timer_ends_at: delta.timer_ends_at,
+        top_bidder: delta.leader_id ? { id: delta.leader_id, display_name: delta.leader_name } : null
+      } : lot);
+
+      setBidAmount(delta.current_bid + (auctionState?.settings?.min_increment || 1));
+
+      if (delta.timer_ends_at) {
+        const serverNow = Date.now() + serverTimeOffset;
+        const timerEndsAt = new Date(delta.timer_ends_at).getTime();
+        setTimeRemaining(Math.max(0, Math.floor((timerEndsAt - serverNow) / 1000)));
+      }
+    });
+
     newSocket.on('bid_result', (result) => {
       setBidding(false);
       if (result.success) {
@@ -272,6 +316,8 @@ const AuctionRoom = ({ user, token }) => {
     }
   }, [auctionState, user]);
 
+  const bidCeiling = maxBid ?? userBudget;
+
   const handlePlaceBid = async () => {
     if (!socket || !currentLot || bidding) return;
     
@@ -285,6 +331,11 @@ const AuctionRoom = ({ user, token }) => {
       return;
     }
 
+    if (bidAmount > bidCeiling) {
+      toast.error(`Maximum bid is ${bidCeiling} (reserve kept for your empty slots)`);
+      return;
+    }
+
     setBidding(true);
     
     socket.emit('place_bid', {
@@ -526,6 +577,32 @@ const AuctionRoom = ({ user, token }) => {
         }
       });
 
+      // Batched presence changes: one event per room per server tick
+      newSocket.on('presence_delta', (data) => {
+        const changes = data.changes || [];
+        setUserPresence(prev => {
+          const next = { ...prev };
+          changes.forEach(change => {
+            next[change.user_id] = change.status;
+          });
+          return next;
+        });
+        setPresentUsers(prev => {
+          const byId = {};
+          prev.forEach(user => {
+            byId[user.user_id] = user;
+          });
+          changes.forEach(change => {
+            if (change.status === 'offline') {
+              delete byId[change.user_id];
+            } else {
+              byId[change.user_id] = change;
+            }
+          });
+          return Object.values(byId);
+        });
+      });
+
       // Heartbeat system
       const heartbeatInterval = setInterval(() => {
         if (newSocket.connected) {
@@ -924,14 +1001,14 @@ const AuctionRoom = ({ user, token }) => {
                           value={bidAmount}
                           onChange={(e) => setBidAmount(parseInt(e.target.value) || 0)}
                           min={(currentLot.current_bid || 0) + (auctionState?.settings?.min_increment || 1)}
-                          max={userBudget}
+                          max={bidCeiling}
                           className="bg-gray-700 border-gray-600 text-white text-lg"
                           placeholder="Enter bid amount"
                           data-testid={TESTIDS.bidInput}
                         />
                         <Button
                           onClick={handlePlaceBid}
-                          disabled={bidding || bidAmount <= currentLot.current_bid || bidAmount > userBudget}
+                          disabled={bidding || bidAmount <= currentLot.current_bid || bidAmount > bidCeiling}
                           className="bg-green-600 hover:bg-green-700 touch-target min-w-[120px]"
                           size="lg"
                           data-primary="true"
@@ -974,10 +1051,14 @@ const AuctionRoom = ({ user, token }) => {
                       </div>
 
                       {/* Budget Warning */}
-                      {bidAmount > userBudget && (
+                      {bidAmount > userBudget ? (
                         <div className="text-red-400 text-sm">
                           ⚠️ Insufficient budget (You have {userBudget} credits)
                         </div>
+                      ) : bidAmount > bidCeiling && (
+                        <div className="text-red-400 text-sm">
+                          ⚠️ Maximum bid is {bidCeiling} credits (reserve kept for your empty slots)
+                        </div>
                       )}
                     </div>
                   )}
@@ -41,6 +41,7 @@ const Leaderboard = ({ user, token }) => {
   const [loading, setLoading] = useState(true);
   const [leaderboardData, setLeaderboardData] = useState(null);
   const [selectedView, setSelectedView] = useState('overall');
+  const [loadingOlder, setLoadingOlder] = useState(false);
 
   useEffect(() => {
     if (token && leagueId) {
@@ -62,6 +63,28 @@ const Leaderboard = ({ user, token }) => {
     }
   };
 
+  // Older matchdays are paged in behind the leaderboard's latest window
+  const loadOlderMatchdays = async () => {
+    if (!leaderboardData?.matchdays_cursor) return;
+    setLoadingOlder(true);
+    try {
+      const response = await axios.get(`${API}/leaderboard/${leagueId}/matchdays`, {
+        params: { before: leaderboardData.matchdays_cursor },
+        headers: { Authorization: `Bearer ${token}` }
+      });
+      setLeaderboardData(prev => ({
+        ...prev,
+        weekly_breakdown: { ...response.data.weekly_breakdown, ...prev.weekly_breakdown },
+        matchdays_cursor: response.data.next_cursor
+      }));
+    } catch (error) {
+      console.error('Failed to fetch older matchdays:', error);
+      toast.error('Failed to load older matchdays');
+    } finally {
+      setLoadingOlder(false);
+    }
+  };
+
   const getPositionIcon = (position) => {
     switch (position) {
       case 1:
@@ -169,6 +192,13 @@ const Leaderboard = ({ user, token }) => {
               </CardContent>
             </Card>
           ))}
+        {leaderboardData?.matchdays_cursor && (
+          <div className="text-center">
+            <Button variant="outline" onClick={loadOlderMatchdays} disabled={loadingOlder}>
+              {loadingOlder ? 'Loading...' : 'Load earlier matchdays'}
+            </Button>
+          </div>
+        )}
       </div>
     );
   };
@@ -450,7 +480,7 @@ const Leaderboard = ({ user, token }) => {
               </div>
               <div className="text-center p-3 bg-orange-50 rounded-lg">
                 <div className="text-xl font-bold text-orange-600">
-                  {Object.keys(weekly_breakdown).length}
+                  {leaderboardData.matchdays_total ?? Object.keys(weekly_breakdown).length}
                 </div>
                 <div className="text-sm text-gray-600">Matchdays</div>
               </div>
@@ -25,6 +25,8 @@ from models import LotStatus
 from league_service import LeagueService
 from auction_engine import AuctionEngine
 from scoring_service import ScoringService
+from matchday_calendar import get_matchday_calendars
+from cache_generations import get_cache_generations, FIXTURES
 
 # Configure logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
@@ -300,9 +302,15 @@ class UCLAuctionSeeder:
                 date=parsed_date,
                 home_ext=fixture_data["home_ext"],
                 away_ext=fixture_data["away_ext"],
-                status=fixture_data["status"]
+                status=fixture_data["status"],
+                stage=fixture_data.get("stage")
             )
             await db.fixtures.insert_one(fixture.model_dump(by_alias=True))
+        
+        # Matchday calendars and the fixtures page are built from fixtures
+        for season in {fixture_data["season"] for fixture_data in fixtures_data}:
+            get_matchday_calendars().invalidate(season)
+        await get_cache_generations().bump([self.demo_league_id], FIXTURES)
             
         logger.info(f"✅ Seeded {len(fixtures_data)} fixtures")
 